@@ -14,8 +14,15 @@ from routes.parking_location_routes import parking_location_bp
 from routes.parking_slot_routes import parking_slot_bp
 from routes.reservation_routes import reservation_bp
 from routes.reports_routes import reports_bp
+from routes.job_routes import jobs_bp
 from apscheduler.schedulers.background import BackgroundScheduler
 from tasks.status_scheduler import update_reservation_statuses
+from tasks.partition_maintenance import maintain_reservation_partitions
+from tasks.reservation_archival import archive_old_reservations
+from services.reservation_series_service import ReservationSeriesService
+from services.idempotency_service import IdempotencyService
+from utils.admission import init_admission
+from tasks.job_worker import jobs_cli
 
 def create_app() -> Flask:
     app = Flask(__name__)
@@ -37,7 +44,15 @@ def create_app() -> Flask:
     app.register_blueprint(parking_slot_bp,     url_prefix="/api/parking_slot")
     app.register_blueprint(reservation_bp,      url_prefix="/api/reservation")
     app.register_blueprint(reports_bp,          url_prefix="/api/reports")
+    app.register_blueprint(jobs_bp,             url_prefix="/api/jobs")
+
+    # `flask jobs work` runs queued background jobs
+    app.cli.add_command(jobs_cli)
     
+    # ---------- ADMISSION CONTROL ----------
+    # Sheds requests with 503 once a worker's endpoint class or total capacity is full
+    init_admission(app)
+
     # Health check
     @app.get("/api/health")
     def health():
@@ -61,6 +76,63 @@ def create_app() -> Flask:
         replace_existing=True,
     )
 
+    # Rolls recurring series forward so occurrences stay booked up to the horizon
+    def extend_series_job() -> None:
+        with app.app_context():
+            ReservationSeriesService.extend_all()
+
+    scheduler.add_job(
+        extend_series_job,
+        trigger="interval",
+        hours=1,
+        id="reservation_series_extender",
+        max_instances=1,
+        replace_existing=True,
+    )
+
+    # Keeps monthly reservation partitions ahead of time (Postgres only)
+    def partition_job() -> None:
+        with app.app_context():
+            maintain_reservation_partitions()
+
+    scheduler.add_job(
+        partition_job,
+        trigger="interval",
+        hours=6,
+        id="reservation_partition_maintenance",
+        max_instances=1,
+        replace_existing=True,
+        next_run_time=datetime.now(timezone.utc),
+    )
+
+    # Moves old finished / cancelled reservations into the archive table
+    def archive_job() -> None:
+        with app.app_context():
+            archive_old_reservations()
+
+    scheduler.add_job(
+        archive_job,
+        trigger="interval",
+        hours=1,
+        id="reservation_archiver",
+        max_instances=1,
+        replace_existing=True,
+    )
+
+    # Drops expired Idempotency-Key responses
+    def purge_idempotency_keys_job() -> None:
+        with app.app_context():
+            IdempotencyService.purge_expired()
+
+    scheduler.add_job(
+        purge_idempotency_keys_job,
+        trigger="interval",
+        hours=1,
+        id="idempotency_key_purger",
+        max_instances=1,
+        replace_existing=True,
+    )
+
     # Start the scheduler once (works with Gunicorn preload & Flask reload)
     if not app.debug:
         scheduler.start()
@@ -9,4 +9,46 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY     = os.getenv("SECRET_KEY")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-    FRONTEND_URL = os.getenv("FRONTEND_URL")
\ No newline at end of file
+    FRONTEND_URL = os.getenv("FRONTEND_URL")
+
+    # Seconds clients may reuse catalog responses before revalidating with If-None-Match
+    CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "0"))
+
+    # Slot picking policy for POST /reservations/auto: lowest_label, least_used or best_fit
+    AUTO_ASSIGN_POLICY = os.getenv("AUTO_ASSIGN_POLICY", "lowest_label")
+
+    # Postgres reservation partitions: months created ahead, and months kept attached (0 = keep everything)
+    RESERVATION_PARTITION_MONTHS_AHEAD = int(os.getenv("RESERVATION_PARTITION_MONTHS_AHEAD", "6"))
+    RESERVATION_PARTITION_RETENTION_MONTHS = int(os.getenv("RESERVATION_PARTITION_RETENTION_MONTHS", "24"))
+
+    # Finished / cancelled reservations older than this many days move to reservations_archive (0 = never),
+    # in batches of RESERVATION_ARCHIVE_BATCH_SIZE rows with a pause between batches
+    RESERVATION_ARCHIVE_AFTER_DAYS = int(os.getenv("RESERVATION_ARCHIVE_AFTER_DAYS", "180"))
+    RESERVATION_ARCHIVE_BATCH_SIZE = int(os.getenv("RESERVATION_ARCHIVE_BATCH_SIZE", "500"))
+    RESERVATION_ARCHIVE_PAUSE_MS   = int(os.getenv("RESERVATION_ARCHIVE_PAUSE_MS", "200"))
+
+    # Hours a stored Idempotency-Key response is replayed for retries
+    IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+    # Seconds a claimed key blocks duplicates before a crashed request's claim is given up (keep above request timeout)
+    IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS = int(os.getenv("IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS", "60"))
+
+    # Admission control: requests allowed in flight per worker process (keep near the DB pool size, 0 = off),
+    # per-class limits (0 = bounded by the capacity only) and the slots kept free for booking writes / before reports
+    # are shed. Refused requests get 503 with Retry-After seconds
+    ADMISSION_CAPACITY        = int(os.getenv("ADMISSION_CAPACITY", "15"))
+    ADMISSION_LIMIT_AUTH      = int(os.getenv("ADMISSION_LIMIT_AUTH", "4"))
+    ADMISSION_LIMIT_BOOKING   = int(os.getenv("ADMISSION_LIMIT_BOOKING", "0"))
+    ADMISSION_LIMIT_REPORTS   = int(os.getenv("ADMISSION_LIMIT_REPORTS", "5"))
+    ADMISSION_LIMIT_CATALOG   = int(os.getenv("ADMISSION_LIMIT_CATALOG", "10"))
+    ADMISSION_LIMIT_OTHER     = int(os.getenv("ADMISSION_LIMIT_OTHER", "10"))
+    ADMISSION_BOOKING_RESERVE = int(os.getenv("ADMISSION_BOOKING_RESERVE", "3"))
+    ADMISSION_REPORTS_RESERVE = int(os.getenv("ADMISSION_REPORTS_RESERVE", "6"))
+    ADMISSION_RETRY_AFTER     = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+    # Background job workers (`flask jobs work`): idle poll interval, seconds without progress before a running job
+    # counts as abandoned and is re-queued, and the base delay of the exponential retry backoff
+    JOB_POLL_SECONDS          = float(os.getenv("JOB_POLL_SECONDS", "2"))
+    JOB_STALE_AFTER_SECONDS   = int(os.getenv("JOB_STALE_AFTER_SECONDS", "300"))
+    JOB_RETRY_BACKOFF_SECONDS = int(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "30"))
+    # Where export jobs write their CSV files (must be shared by the workers and the web processes)
+    JOB_EXPORT_DIR = os.getenv("JOB_EXPORT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports"))
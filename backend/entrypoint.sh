@@ -11,6 +11,7 @@ python seed.py
 
 echo "Launching Gunicorn..."
 exec gunicorn app:app \
+    --config gunicorn.conf.py \
     --bind 0.0.0.0:8000 \
     --log-level info \
     --access-logfile - \
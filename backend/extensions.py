@@ -1,10 +1,21 @@
 # This file defines the extensions used in the Flask application, such as SQLAlchemy for database interactions and JWTManager for handling JSON Web Tokens.
 # It initializes these extensions so they can be used throughout the application.
 
+import sqlite3
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 db   = SQLAlchemy()
 jwt  = JWTManager()
 cors = CORS()
+
+# SQLite ignores foreign keys (and so ON DELETE CASCADE) unless each connection turns them on
+@event.listens_for(Engine, "connect")
+def _sqlite_foreign_keys(dbapi_conn, _record) -> None:
+    if isinstance(dbapi_conn, sqlite3.Connection):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
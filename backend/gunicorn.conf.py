@@ -0,0 +1,14 @@
+# Gunicorn settings for the backend container.
+# The gevent worker lets long-lived SSE streams (/locations/<id>/events) idle as greenlets
+# instead of pinning a sync worker per connection.
+
+import os
+
+worker_class       = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+
+# Make psycopg2 yield to other greenlets while waiting on Postgres
+def post_fork(server, worker):
+    if worker_class == "gevent":
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
@@ -0,0 +1,37 @@
+"""collection versions
+
+Revision ID: 3b1f0c2a9d41
+Revises: 666ccbf89654
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b1f0c2a9d41'
+down_revision: Union[str, Sequence[str], None] = '666ccbf89654'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    versions = op.create_table('collection_versions',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # Seed the catalog counters so writes only ever UPDATE
+    op.bulk_insert(versions, [
+        {'name': 'parking_locations', 'version': 0},
+        {'name': 'parking_slots', 'version': 0},
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('collection_versions')
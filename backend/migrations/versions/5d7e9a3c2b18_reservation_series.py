@@ -0,0 +1,55 @@
+"""reservation series
+
+Revision ID: 5d7e9a3c2b18
+Revises: 8c4e2d7a1f03
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7e9a3c2b18'
+down_revision: Union[str, Sequence[str], None] = '8c4e2d7a1f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('reservation_series',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('slot_id', sa.Integer(), nullable=False),
+    sa.Column('weekdays', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=False),
+    sa.Column('timezone', sa.String(length=64), server_default='UTC', nullable=False),
+    sa.Column('starts_on', sa.Date(), nullable=False),
+    sa.Column('until', sa.Date(), nullable=True),
+    sa.Column('materialized_until', sa.Date(), nullable=True),
+    sa.Column('active', sa.Boolean(), server_default=sa.text('true'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['slot_id'], ['parking_slots.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reservation_series_slot_id'), 'reservation_series', ['slot_id'], unique=False)
+    op.create_index(op.f('ix_reservation_series_user_id'), 'reservation_series', ['user_id'], unique=False)
+    op.add_column('reservations', sa.Column('series_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_reservations_series_id'), 'reservations', ['series_id'], unique=False)
+    op.create_foreign_key('reservations_series_id_fkey', 'reservations', 'reservation_series', ['series_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('reservations_series_id_fkey', 'reservations', type_='foreignkey')
+    op.drop_index(op.f('ix_reservations_series_id'), table_name='reservations')
+    op.drop_column('reservations', 'series_id')
+    op.drop_index(op.f('ix_reservation_series_user_id'), table_name='reservation_series')
+    op.drop_index(op.f('ix_reservation_series_slot_id'), table_name='reservation_series')
+    op.drop_table('reservation_series')
@@ -0,0 +1,45 @@
+"""reservation changes
+
+Revision ID: 8c4e2d7a1f03
+Revises: 3b1f0c2a9d41
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e2d7a1f03'
+down_revision: Union[str, Sequence[str], None] = '3b1f0c2a9d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('reservation_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('reservation_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('reservation_id'),
+    sqlite_autoincrement=True
+    )
+    op.create_index('ix_reservation_changes_user_id_id', 'reservation_changes', ['user_id', 'id'], unique=False)
+
+    # Every existing reservation starts out as one change so a cursor of 0 is a full sync
+    op.execute(
+        "INSERT INTO reservation_changes (reservation_id, user_id, deleted) "
+        "SELECT id, user_id, false FROM reservations ORDER BY id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reservation_changes_user_id_id', table_name='reservation_changes')
+    op.drop_table('reservation_changes')
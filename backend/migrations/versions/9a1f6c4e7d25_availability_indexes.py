@@ -0,0 +1,30 @@
+"""availability indexes
+
+Revision ID: 9a1f6c4e7d25
+Revises: 5d7e9a3c2b18
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a1f6c4e7d25'
+down_revision: Union[str, Sequence[str], None] = '5d7e9a3c2b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_parking_slots_location_id'), 'parking_slots', ['location_id'], unique=False)
+    op.create_index('ix_reservations_active_slot_window', 'reservations', ['slot_id', 'start_ts', 'end_ts'], unique=False, postgresql_where=sa.text("status IN ('booked', 'ongoing')"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reservations_active_slot_window', table_name='reservations', postgresql_where=sa.text("status IN ('booked', 'ongoing')"))
+    op.drop_index(op.f('ix_parking_slots_location_id'), table_name='parking_slots')
@@ -0,0 +1,55 @@
+"""reservation location_id
+
+Revision ID: b3c8d1e5f742
+Revises: 9a1f6c4e7d25
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c8d1e5f742'
+down_revision: Union[str, Sequence[str], None] = '9a1f6c4e7d25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK = 10000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reservations', sa.Column('location_id', sa.Integer(), nullable=True))
+
+    # Backfill in id ranges so no single statement locks the whole table
+    conn = op.get_bind()
+    lo, hi = conn.execute(sa.text("SELECT MIN(id), MAX(id) FROM reservations")).one()
+    if lo is not None:
+        for start in range(lo, hi + 1, BACKFILL_CHUNK):
+            conn.execute(
+                sa.text(
+                    "UPDATE reservations SET location_id = parking_slots.location_id "
+                    "FROM parking_slots "
+                    "WHERE parking_slots.id = reservations.slot_id "
+                    "AND reservations.id >= :lo AND reservations.id < :hi"
+                ),
+                {"lo": start, "hi": start + BACKFILL_CHUNK},
+            )
+
+    op.alter_column('reservations', 'location_id', existing_type=sa.Integer(), nullable=False)
+    op.create_index(op.f('ix_reservations_location_id'), 'reservations', ['location_id'], unique=False)
+    op.create_foreign_key('reservations_location_id_fkey', 'reservations', 'parking_locations', ['location_id'], ['id'])
+    op.create_unique_constraint('uq_parking_slots_id_location_id', 'parking_slots', ['id', 'location_id'])
+    op.create_foreign_key('fk_reservations_slot_location', 'reservations', 'parking_slots', ['slot_id', 'location_id'], ['id', 'location_id'], onupdate='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_reservations_slot_location', 'reservations', type_='foreignkey')
+    op.drop_constraint('uq_parking_slots_id_location_id', 'parking_slots', type_='unique')
+    op.drop_constraint('reservations_location_id_fkey', 'reservations', type_='foreignkey')
+    op.drop_index(op.f('ix_reservations_location_id'), table_name='reservations')
+    op.drop_column('reservations', 'location_id')
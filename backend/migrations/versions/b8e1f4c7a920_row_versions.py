@@ -0,0 +1,33 @@
+"""row versions
+
+Revision ID: b8e1f4c7a920
+Revises: a4d2e8f6b391
+Create Date: 2026-10-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e1f4c7a920'
+down_revision: Union[str, Sequence[str], None] = 'a4d2e8f6b391'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('users', 'parking_locations', 'parking_slots', 'reservations', 'reservations_archive')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default is a metadata-only change on Postgres 11+, no table rewrite
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_column(table, 'version')
@@ -0,0 +1,109 @@
+"""partition reservations by month
+
+Revision ID: c5e2a7b9d014
+Revises: b3c8d1e5f742
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a7b9d014'
+down_revision: Union[str, Sequence[str], None] = 'b3c8d1e5f742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 6
+
+COLUMNS = "id, user_id, slot_id, location_id, start_ts, end_ts, status, series_id, created_at, updated_at"
+
+TABLE_BODY = """
+    id integer NOT NULL DEFAULT nextval('reservations_id_seq'),
+    user_id integer NOT NULL,
+    slot_id integer NOT NULL,
+    location_id integer NOT NULL,
+    start_ts timestamp with time zone NOT NULL,
+    end_ts timestamp with time zone NOT NULL,
+    status reservation_status NOT NULL DEFAULT 'booked',
+    series_id integer,
+    created_at timestamp without time zone NOT NULL DEFAULT now(),
+    updated_at timestamp without time zone NOT NULL DEFAULT now()
+"""
+
+
+def _add_months(d: date, months: int) -> date:
+    y, m = divmod(d.month - 1 + months, 12)
+    return date(d.year + y, m + 1, 1)
+
+
+def _create_indexes_and_keys() -> None:
+    op.create_index(op.f('ix_reservations_user_id'), 'reservations', ['user_id'], unique=False)
+    op.create_index(op.f('ix_reservations_slot_id'), 'reservations', ['slot_id'], unique=False)
+    op.create_index(op.f('ix_reservations_location_id'), 'reservations', ['location_id'], unique=False)
+    op.create_index(op.f('ix_reservations_series_id'), 'reservations', ['series_id'], unique=False)
+    op.create_index('ix_reservations_active_slot_window', 'reservations', ['slot_id', 'start_ts', 'end_ts'], unique=False, postgresql_where=sa.text("status IN ('booked', 'ongoing')"))
+    op.create_foreign_key('reservations_user_id_fkey', 'reservations', 'users', ['user_id'], ['id'])
+    op.create_foreign_key('reservations_slot_id_fkey', 'reservations', 'parking_slots', ['slot_id'], ['id'])
+    op.create_foreign_key('reservations_location_id_fkey', 'reservations', 'parking_locations', ['location_id'], ['id'])
+    op.create_foreign_key('reservations_series_id_fkey', 'reservations', 'reservation_series', ['series_id'], ['id'])
+    op.create_foreign_key('fk_reservations_slot_location', 'reservations', 'parking_slots', ['slot_id', 'location_id'], ['id', 'location_id'], onupdate='CASCADE')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Declarative partitioning is Postgres-only; other databases keep the plain table
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+
+    # Keep the id sequence alive when the old table is dropped
+    op.execute("ALTER SEQUENCE reservations_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE reservations RENAME TO reservations_legacy")
+    op.execute("ALTER TABLE reservations_legacy RENAME CONSTRAINT reservations_pkey TO reservations_legacy_pkey")
+
+    # The partition key has to be part of the primary key
+    op.execute(
+        f"CREATE TABLE reservations ({TABLE_BODY}, CONSTRAINT reservations_pkey PRIMARY KEY (id, start_ts)) "
+        "PARTITION BY RANGE (start_ts)"
+    )
+    op.execute("ALTER SEQUENCE reservations_id_seq OWNED BY reservations.id")
+
+    # One partition per month from the oldest booking through MONTHS_AHEAD, plus a catch-all default
+    oldest = conn.execute(sa.text("SELECT MIN(start_ts) FROM reservations_legacy")).scalar()
+    today  = date.today().replace(day=1)
+    month  = min(oldest.date().replace(day=1), today) if oldest else today
+    last   = _add_months(today, MONTHS_AHEAD)
+    while month <= last:
+        nxt = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE reservations_y{month.year:04d}m{month.month:02d} PARTITION OF reservations "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{nxt.isoformat()} 00:00:00+00')"
+        )
+        month = nxt
+    op.execute("CREATE TABLE reservations_default PARTITION OF reservations DEFAULT")
+
+    op.execute(f"INSERT INTO reservations ({COLUMNS}) SELECT {COLUMNS} FROM reservations_legacy")
+    op.execute("DROP TABLE reservations_legacy")
+
+    _create_indexes_and_keys()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER SEQUENCE reservations_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE reservations RENAME TO reservations_partitioned")
+    op.execute(f"CREATE TABLE reservations ({TABLE_BODY}, CONSTRAINT reservations_pkey_plain PRIMARY KEY (id))")
+    op.execute("ALTER SEQUENCE reservations_id_seq OWNED BY reservations.id")
+    op.execute(f"INSERT INTO reservations ({COLUMNS}) SELECT {COLUMNS} FROM reservations_partitioned")
+    op.execute("DROP TABLE reservations_partitioned CASCADE")
+    op.execute("ALTER TABLE reservations RENAME CONSTRAINT reservations_pkey_plain TO reservations_pkey")
+
+    _create_indexes_and_keys()
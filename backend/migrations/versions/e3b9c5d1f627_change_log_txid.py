@@ -0,0 +1,34 @@
+"""change log txid cursor
+
+Revision ID: e3b9c5d1f627
+Revises: d2f7a3c9e184
+Create Date: 2026-10-20 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9c5d1f627'
+down_revision: Union[str, Sequence[str], None] = 'd2f7a3c9e184'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reservation_changes', sa.Column('txid', sa.BigInteger(), nullable=True))
+    # Existing rows are all committed; their inserting transaction keeps them in commit order with new ones
+    op.execute("UPDATE reservation_changes SET txid = xmin::text::bigint")
+    op.create_index('ix_reservation_changes_txid_id', 'reservation_changes', ['txid', 'id'], unique=False)
+    op.create_index('ix_reservation_changes_user_id_txid_id', 'reservation_changes', ['user_id', 'txid', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reservation_changes_user_id_txid_id', table_name='reservation_changes')
+    op.drop_index('ix_reservation_changes_txid_id', table_name='reservation_changes')
+    op.drop_column('reservation_changes', 'txid')
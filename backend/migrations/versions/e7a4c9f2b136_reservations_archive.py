@@ -0,0 +1,49 @@
+"""reservations archive
+
+Revision ID: e7a4c9f2b136
+Revises: c5e2a7b9d014
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a4c9f2b136'
+down_revision: Union[str, Sequence[str], None] = 'c5e2a7b9d014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('reservations_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('slot_id', sa.Integer(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('start_ts', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_ts', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('status', postgresql.ENUM('booked', 'ongoing', 'finished', 'cancelled', name='reservation_status', create_type=False), nullable=False),
+    sa.Column('series_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reservations_archive_end_ts'), 'reservations_archive', ['end_ts'], unique=False)
+    op.create_index('ix_reservations_archive_start_ts', 'reservations_archive', ['start_ts'], unique=False)
+    op.create_index('ix_reservations_archive_user_id_start_ts', 'reservations_archive', ['user_id', 'start_ts'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reservations_archive_user_id_start_ts', table_name='reservations_archive')
+    op.drop_index('ix_reservations_archive_start_ts', table_name='reservations_archive')
+    op.drop_index(op.f('ix_reservations_archive_end_ts'), table_name='reservations_archive')
+    op.drop_table('reservations_archive')
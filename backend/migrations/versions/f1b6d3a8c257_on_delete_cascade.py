@@ -0,0 +1,50 @@
+"""on delete cascade
+
+Revision ID: f1b6d3a8c257
+Revises: e7a4c9f2b136
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6d3a8c257'
+down_revision: Union[str, Sequence[str], None] = 'e7a4c9f2b136'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, referred table, local columns, remote columns, ondelete, onupdate)
+FOREIGN_KEYS = [
+    ('parking_slots_location_id_fkey', 'parking_slots', 'parking_locations', ['location_id'], ['id'], 'CASCADE', None),
+    ('reservation_series_user_id_fkey', 'reservation_series', 'users', ['user_id'], ['id'], 'CASCADE', None),
+    ('reservation_series_slot_id_fkey', 'reservation_series', 'parking_slots', ['slot_id'], ['id'], 'CASCADE', None),
+    ('reservations_user_id_fkey', 'reservations', 'users', ['user_id'], ['id'], 'CASCADE', None),
+    ('reservations_slot_id_fkey', 'reservations', 'parking_slots', ['slot_id'], ['id'], 'CASCADE', None),
+    ('reservations_location_id_fkey', 'reservations', 'parking_locations', ['location_id'], ['id'], 'CASCADE', None),
+    ('reservations_series_id_fkey', 'reservations', 'reservation_series', ['series_id'], ['id'], 'SET NULL', None),
+    ('fk_reservations_slot_location', 'reservations', 'parking_slots', ['slot_id', 'location_id'], ['id', 'location_id'], 'CASCADE', 'CASCADE'),
+]
+
+
+def _recreate(cascade: bool) -> None:
+    for name, table, referred, local, remote, ondelete, onupdate in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(
+            name, table, referred, local, remote,
+            ondelete=ondelete if cascade else None,
+            onupdate=onupdate,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate(cascade=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate(cascade=False)
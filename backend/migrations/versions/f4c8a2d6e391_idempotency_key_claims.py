@@ -0,0 +1,32 @@
+"""idempotency key claims
+
+Revision ID: f4c8a2d6e391
+Revises: e3b9c5d1f627
+Create Date: 2026-10-20 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c8a2d6e391'
+down_revision: Union[str, Sequence[str], None] = 'e3b9c5d1f627'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A claimed key has no response until its request succeeds
+    op.alter_column('idempotency_keys', 'status_code', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('idempotency_keys', 'response', existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM idempotency_keys WHERE status_code IS NULL")
+    op.alter_column('idempotency_keys', 'response', existing_type=sa.Text(), nullable=False)
+    op.alter_column('idempotency_keys', 'status_code', existing_type=sa.Integer(), nullable=False)
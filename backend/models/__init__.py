@@ -2,15 +2,27 @@
 # # This is typically used to simplify imports.
 
 from .mixins          import TimestampMixin
+from .collection_version import CollectionVersion
+from .idempotency_key  import IdempotencyKey
+from .job              import Job, JobStatus
 from .parking_location import ParkingLocation
 from .parking_slot     import ParkingSlot
 from .reservation      import Reservation, ReservationStatus
+from .reservation_change import ReservationChange
+from .reservation_archive import ReservationArchive
+from .reservation_series import ReservationSeries
 from .user             import User, UserRole
 
 __all__ = [
     "TimestampMixin",
+    "CollectionVersion",
+    "IdempotencyKey",
+    "Job", "JobStatus",
     "ParkingLocation",
     "ParkingSlot",
     "Reservation", "ReservationStatus",
+    "ReservationChange",
+    "ReservationArchive",
+    "ReservationSeries",
     "User", "UserRole"
 ]
\ No newline at end of file
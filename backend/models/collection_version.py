@@ -0,0 +1,14 @@
+# This file defines the Collection Version model for the application.
+# Each row is a write-driven counter for one resource collection; catalog GETs derive their ETag from it.
+
+from sqlalchemy import Column, Integer, String, text
+from extensions import db
+
+class CollectionVersion(db.Model):
+    __tablename__ = "collection_versions"
+
+    name    = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, server_default=text("0"))
+
+    def __repr__(self):
+        return f"<CollectionVersion {self.name} v{self.version}>"
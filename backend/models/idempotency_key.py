@@ -0,0 +1,23 @@
+# This file defines the Idempotency Key model for the application.
+# One row per (caller, Idempotency-Key) of a successful mutating request: a hash of the request and the response
+# that was sent, so a retried request is answered from here instead of running again. Rows expire after a TTL.
+# The row is inserted without a response when the request starts (a claim) and filled in when it succeeds.
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint, func, text
+from extensions import db
+
+class IdempotencyKey(db.Model):
+    __tablename__  = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_id_key"),)
+
+    id           = Column(Integer, primary_key=True)
+    user_id      = Column(Integer, nullable=False, server_default=text("0"))   # 0 = anonymous (registration)
+    key          = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status_code  = Column(Integer)                                          # NULL while the request runs
+    response     = Column(Text)
+    created_at   = Column(DateTime, server_default=func.now(), nullable=False)
+    expires_at   = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey {self.key} user={self.user_id}>"
@@ -0,0 +1,40 @@
+# This file defines the Job model for the application.
+# A job is a unit of heavy admin work (export, bulk cancellation, archival …) queued by an HTTP request and run
+# later by a worker process (`flask jobs work`). Workers claim queued rows whose `run_after` has passed, report
+# progress through `heartbeat_at`, and either finish the job, schedule a retry, or stop when cancellation is asked.
+
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, JSON, Enum as PgEnum, func, text
+from extensions import db
+from enum import Enum
+from .mixins import TimestampMixin
+
+class JobStatus(str, Enum):
+    queued    = "queued"
+    running   = "running"
+    succeeded = "succeeded"
+    failed    = "failed"
+    cancelled = "cancelled"
+
+class Job(db.Model, TimestampMixin):
+    __tablename__  = "jobs"
+    __table_args__ = (Index("ix_jobs_status_run_after", "status", "run_after"),)
+
+    id               = Column(Integer, primary_key=True)
+    kind             = Column(String(64), nullable=False)
+    payload          = Column(JSON, nullable=False, default=dict)
+    status           = Column(PgEnum(JobStatus, name="job_status"), nullable=False, server_default=text("'queued'"))
+    progress         = Column(Integer, nullable=False, server_default=text("0"))        # percent done
+    result           = Column(JSON)
+    error            = Column(Text)
+    attempts         = Column(Integer, nullable=False, server_default=text("0"))
+    max_attempts     = Column(Integer, nullable=False, server_default=text("3"))
+    cancel_requested = Column(Boolean, nullable=False, server_default=text("false"))
+    run_after        = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_by        = Column(String(128))                                              # worker running it
+    heartbeat_at     = Column(DateTime(timezone=True))
+    started_at       = Column(DateTime(timezone=True))
+    finished_at      = Column(DateTime(timezone=True))
+    created_by       = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.kind} [{self.status}]>"
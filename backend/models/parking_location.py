@@ -1,6 +1,6 @@
 # This file defines the Parking Location model for the application.
 
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Integer, String, Float, text
 from sqlalchemy.orm import relationship
 from extensions import db
 from .mixins import TimestampMixin
@@ -13,7 +13,10 @@ class ParkingLocation(db.Model, TimestampMixin):
     address = Column(String(255), server_default="Unknown Address")
     lat     = Column(Float, nullable=False)
     lng     = Column(Float, nullable=False)
-    slots   = relationship("ParkingSlot", back_populates="location", cascade="all, delete-orphan")
+    version = Column(Integer, nullable=False, server_default=text("1"))
+    slots   = relationship("ParkingSlot", back_populates="location", cascade="all, delete-orphan", passive_deletes=True)
+
+    __mapper_args__ = {"version_id_col": version}
 
     def __repr__(self):
         return f"<ParkingLocation {self.name} at {self.address}>"
@@ -1,6 +1,6 @@
 # This file defines the Parking Location model for the application.
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, text
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from extensions import db
 from .mixins import TimestampMixin
@@ -10,9 +10,15 @@ class ParkingSlot(db.Model, TimestampMixin):
 
     id              = Column(Integer, primary_key=True)
     slot_label      = Column(String(20), server_default="Slot")
-    location_id     = Column(Integer, ForeignKey("parking_locations.id"), nullable=False)
+    location_id     = Column(Integer, ForeignKey("parking_locations.id", ondelete="CASCADE"), nullable=False, index=True)
+    version         = Column(Integer, nullable=False, server_default=text("1"))
     location        = relationship("ParkingLocation", back_populates="slots")
-    reservations    = relationship("Reservation", back_populates="slot", cascade="all, delete-orphan")
+    reservations    = relationship("Reservation", back_populates="slot", cascade="all, delete-orphan", passive_deletes=True, foreign_keys="Reservation.slot_id")
+    reservation_series = relationship("ReservationSeries", back_populates="slot", cascade="all, delete-orphan", passive_deletes=True)
+
+    # Target of the reservations (slot_id, location_id) foreign key
+    __table_args__ = (UniqueConstraint("id", "location_id", name="uq_parking_slots_id_location_id"),)
+    __mapper_args__ = {"version_id_col": version}
 
     def __repr__(self):
         return f"<Slot {self.slot_label} @ location {self.location_id}>"
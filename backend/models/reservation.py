@@ -1,6 +1,6 @@
 # This file defines the Parking Location model for the application.
 
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Enum as PgEnum, text
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, ForeignKeyConstraint, Index, Enum as PgEnum, text
 from sqlalchemy.orm import relationship
 from extensions import db
 from .mixins import TimestampMixin
@@ -12,17 +12,45 @@ class ReservationStatus(str, Enum):
     finished  = "finished"
     cancelled = "cancelled"
 
+# On Postgres the table is range-partitioned by month on start_ts (primary key (id, start_ts), see migration
+# c5e2a7b9d014); ids still come from one sequence, so the ORM keeps identifying rows by id alone.
+# Deleting a user, slot or location removes its reservations in the database (ON DELETE CASCADE); the ORM
+# relationships are passive, so those rows are never loaded just to be deleted.
 class Reservation(db.Model, TimestampMixin):
     __tablename__ = "reservations"
 
     id        = Column(Integer, primary_key=True)
-    user_id   = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    slot_id   = Column(Integer, ForeignKey("parking_slots.id"), nullable=False, index=True)
+    user_id   = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    slot_id   = Column(Integer, ForeignKey("parking_slots.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Denormalized from the slot so location-scoped queries skip the parking_slots join
+    location_id = Column(Integer, ForeignKey("parking_locations.id", ondelete="CASCADE"), nullable=False, index=True)
     start_ts  = Column(DateTime(timezone=True), nullable=False)
     end_ts    = Column(DateTime(timezone=True), nullable=False)
     status    = Column(PgEnum(ReservationStatus, name="reservation_status"), nullable=False, server_default=text("'booked'"))
+    series_id = Column(Integer, ForeignKey("reservation_series.id", ondelete="SET NULL"), index=True)
+    # Bumped on every ORM update; the UPDATE's WHERE clause checks it (optimistic concurrency)
+    version   = Column(Integer, nullable=False, server_default=text("1"))
     user      = relationship("User", back_populates="reservations")
-    slot      = relationship("ParkingSlot", back_populates="reservations")
+    slot      = relationship("ParkingSlot", back_populates="reservations", foreign_keys=[slot_id])
+    series    = relationship("ReservationSeries", back_populates="reservations")
+
+    # Overlap probes (slot + time range) only ever look at booked / ongoing rows
+    __table_args__ = (
+        # location_id must always be the slot's location (follows slot moves via ON UPDATE CASCADE)
+        ForeignKeyConstraint(
+            ["slot_id", "location_id"],
+            ["parking_slots.id", "parking_slots.location_id"],
+            name="fk_reservations_slot_location",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        Index(
+            "ix_reservations_active_slot_window", "slot_id", "start_ts", "end_ts",
+            postgresql_where=text("status IN ('booked', 'ongoing')"),
+        ),
+    )
+
+    __mapper_args__ = {"version_id_col": version}
 
     def __repr__(self):
         return f"<Reservation {self.id} [{self.status}]>"
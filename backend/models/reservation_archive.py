@@ -0,0 +1,32 @@
+# This file defines the Reservation Archive model for the application.
+# Finished and cancelled reservations past the retention age are moved here by the archival job, keeping the hot
+# reservations table (and its indexes) small. Rows keep their original ids and timestamps. Only the user key is
+# enforced (deleting a user still removes their history); slots, locations and series may be gone by the time
+# history is read, so those are plain ids.
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, Enum as PgEnum, func, text
+from extensions import db
+from .reservation import ReservationStatus
+
+class ReservationArchive(db.Model):
+    __tablename__ = "reservations_archive"
+    __table_args__ = (
+        Index("ix_reservations_archive_user_id_start_ts", "user_id", "start_ts"),
+        Index("ix_reservations_archive_start_ts", "start_ts"),
+    )
+
+    id          = Column(Integer, primary_key=True, autoincrement=False)
+    user_id     = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    slot_id     = Column(Integer, nullable=False)
+    location_id = Column(Integer, nullable=False)
+    start_ts    = Column(DateTime(timezone=True), nullable=False)
+    end_ts      = Column(DateTime(timezone=True), nullable=False, index=True)
+    status      = Column(PgEnum(ReservationStatus, name="reservation_status", create_type=False), nullable=False)
+    series_id   = Column(Integer)
+    version     = Column(Integer, nullable=False, server_default=text("1"))
+    created_at  = Column(DateTime, nullable=False)
+    updated_at  = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ReservationArchive {self.id} [{self.status}]>"
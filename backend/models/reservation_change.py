@@ -0,0 +1,27 @@
+# This file defines the Reservation Change model for the application.
+# It is a compact change log behind the delta-sync endpoint: one row per reservation, re-inserted on every write
+# so the autoincrement id acts as a monotonic change cursor. Deleted and archived reservations keep a tombstone row.
+# On Postgres ids are handed out before commit, so a lower id can become visible after a higher one; there the
+# cursor is `txid` (the writing transaction) instead, read only below the oldest transaction still in flight.
+
+from sqlalchemy import Column, Integer, BigInteger, Boolean, DateTime, Index, func, text
+from extensions import db
+
+class ReservationChange(db.Model):
+    __tablename__  = "reservation_changes"
+    __table_args__ = (
+        Index("ix_reservation_changes_user_id_id", "user_id", "id"),
+        Index("ix_reservation_changes_txid_id", "txid", "id"),
+        Index("ix_reservation_changes_user_id_txid_id", "user_id", "txid", "id"),
+        {"sqlite_autoincrement": True},  # never reuse ids, cursors must stay monotonic
+    )
+
+    id             = Column(Integer, primary_key=True)
+    reservation_id = Column(Integer, nullable=False, unique=True)
+    user_id        = Column(Integer, nullable=False)
+    deleted        = Column(Boolean, nullable=False, server_default=text("false"))
+    changed_at     = Column(DateTime, server_default=func.now(), nullable=False)
+    txid           = Column(BigInteger)                                        # txid_current() of the writer (Postgres)
+
+    def __repr__(self):
+        return f"<ReservationChange #{self.id} reservation={self.reservation_id}>"
@@ -0,0 +1,29 @@
+# This file defines the Reservation Series model for the application.
+# A series is a weekly recurrence (weekday mask + wall-clock start time in the series' timezone) for one user
+# and slot. Its occurrences are stored as ordinary reservations, materialized up to `materialized_until`.
+
+from sqlalchemy import Column, Integer, String, Date, Time, Boolean, ForeignKey, text
+from sqlalchemy.orm import relationship
+from extensions import db
+from .mixins import TimestampMixin
+
+class ReservationSeries(db.Model, TimestampMixin):
+    __tablename__ = "reservation_series"
+
+    id                 = Column(Integer, primary_key=True)
+    user_id            = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    slot_id            = Column(Integer, ForeignKey("parking_slots.id", ondelete="CASCADE"), nullable=False, index=True)
+    weekdays           = Column(Integer, nullable=False)          # bit 0 = Monday … bit 6 = Sunday
+    start_time         = Column(Time, nullable=False)
+    duration_minutes   = Column(Integer, nullable=False)
+    timezone           = Column(String(64), nullable=False, server_default="UTC")
+    starts_on          = Column(Date, nullable=False)
+    until              = Column(Date)                             # inclusive; open-ended when NULL
+    materialized_until = Column(Date)                             # last date occurrences were generated for
+    active             = Column(Boolean, nullable=False, server_default=text("true"))
+    user               = relationship("User", back_populates="reservation_series")
+    slot               = relationship("ParkingSlot", back_populates="reservation_series")
+    reservations       = relationship("Reservation", back_populates="series", passive_deletes=True)
+
+    def __repr__(self):
+        return f"<ReservationSeries {self.id} slot {self.slot_id}>"
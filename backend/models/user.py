@@ -20,7 +20,11 @@ class User(db.Model, TimestampMixin):
     last_name     = Column(String(120), nullable=False)
     role          = Column(PgEnum(UserRole, name="user_role"), nullable=False, server_default=text("'user'"))
     active        = Column(Boolean, nullable=False, server_default=text("true"))
-    reservations  = relationship("Reservation", back_populates="user", cascade="all, delete-orphan")
+    version       = Column(Integer, nullable=False, server_default=text("1"))
+    reservations  = relationship("Reservation", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    reservation_series = relationship("ReservationSeries", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+
+    __mapper_args__ = {"version_id_col": version}
 
     def __repr__(self):
         return f"<User {self.email} ({self.role})>"
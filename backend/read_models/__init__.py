@@ -0,0 +1,14 @@
+# This file imports the read models used by the GET routes, allowing them to be accessed from a single module.
+# Read models return lightweight named tuples; writes keep going through the ORM services.
+
+from .parking_location import ParkingLocationRow, ParkingLocationReadModel
+from .parking_slot     import AvailabilityMatrix, FreeWindow, ParkingSlotRow, ParkingSlotReadModel, SlotCalendar
+from .reservation      import ReservationRow, ReservationReadModel
+from .user             import UserRow, UserReadModel
+
+__all__ = [
+    "ParkingLocationRow", "ParkingLocationReadModel",
+    "AvailabilityMatrix", "FreeWindow", "ParkingSlotRow", "ParkingSlotReadModel", "SlotCalendar",
+    "ReservationRow", "ReservationReadModel",
+    "UserRow", "UserReadModel",
+]
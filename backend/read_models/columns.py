@@ -0,0 +1,16 @@
+# This file contains the column-pruning helper shared by the read models.
+# A sparse field set (from `?fields=`) narrows the SELECT list so unrequested columns are never fetched.
+
+from typing import Any, Dict, Iterable, List, Optional
+
+def pick_columns(
+    columns: Dict[str, Any],
+    fields: Optional[Iterable[str]] = None,
+    always: Iterable[str] = (),
+) -> List[Any]:
+    if not fields:
+        return list(columns.values())
+
+    # `always` covers columns the route itself needs (e.g. owner id for ACL checks)
+    wanted = set(fields) | set(always)
+    return [col for name, col in columns.items() if name in wanted]
@@ -0,0 +1,94 @@
+# This file defines the read model for parking locations.
+# GET routes use these Core select() queries instead of the ORM, so rows come back as
+# plain named tuples without identity-map or change-tracking overhead.
+
+from __future__ import annotations
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Sequence
+from sqlalchemy import func, select
+from sqlalchemy.exc import NoResultFound
+from extensions import db
+from models.parking_location import ParkingLocation
+from models.parking_slot import ParkingSlot
+from .columns import pick_columns
+
+class ParkingLocationRow(NamedTuple):
+    id:              Optional[int]      = None
+    name:            Optional[str]      = None
+    address:         Optional[str]      = None
+    lat:             Optional[float]    = None
+    lng:             Optional[float]    = None
+    version:         Optional[int]      = None
+    created_at:      Optional[datetime] = None
+    updated_at:      Optional[datetime] = None
+    available_slots: Optional[int]      = None
+
+LOCATION_COLUMNS = {
+    "id":         ParkingLocation.id,
+    "name":       ParkingLocation.name,
+    "address":    ParkingLocation.address,
+    "lat":        ParkingLocation.lat,
+    "lng":        ParkingLocation.lng,
+    "version":    ParkingLocation.version,
+    "created_at": ParkingLocation.created_at,
+    "updated_at": ParkingLocation.updated_at,
+}
+
+# Slot count is computed, so it is only joined in when requested
+def _wants_slot_count(fields: Optional[Sequence[str]]) -> bool:
+    return not fields or "available_slots" in fields
+
+class ParkingLocationReadModel:
+    # ---------- READ ----------
+    @staticmethod
+    def list_locations(fields: Optional[Sequence[str]] = None) -> List[ParkingLocationRow]:
+        stmt = select(*pick_columns(LOCATION_COLUMNS, fields)).order_by(ParkingLocation.id)
+
+        if _wants_slot_count(fields):
+            # Slot counts for every location in one grouped pass (no N+1 count queries)
+            slot_counts = (
+                select(
+                    ParkingSlot.location_id.label("loc_id"),
+                    func.count(ParkingSlot.id).label("total"),
+                )
+                .group_by(ParkingSlot.location_id)
+                .subquery()
+            )
+            stmt = (
+                stmt.add_columns(func.coalesce(slot_counts.c.total, 0).label("available_slots"))
+                .select_from(ParkingLocation)
+                .outerjoin(slot_counts, slot_counts.c.loc_id == ParkingLocation.id)
+            )
+
+        return [ParkingLocationRow(**r._asdict()) for r in db.session.execute(stmt)]
+
+    @staticmethod
+    def get_location(
+        location_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[ParkingLocationRow]:
+        stmt = (
+            select(*pick_columns(LOCATION_COLUMNS, fields, always=("id", "version")))   # version is the ETag
+            .where(ParkingLocation.id == location_id)
+        )
+
+        if _wants_slot_count(fields):
+            slot_count = (
+                select(func.count(ParkingSlot.id))
+                .where(ParkingSlot.location_id == ParkingLocation.id)
+                .scalar_subquery()
+            )
+            stmt = stmt.add_columns(slot_count.label("available_slots"))
+
+        row = db.session.execute(stmt).first()
+        return ParkingLocationRow(**row._asdict()) if row else None
+
+    @staticmethod
+    def get_or_404(
+        location_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> ParkingLocationRow:
+        row = ParkingLocationReadModel.get_location(location_id, fields)
+        if not row:
+            raise NoResultFound(f"location {location_id} not found")
+        return row
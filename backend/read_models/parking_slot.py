@@ -0,0 +1,315 @@
+# This file defines the read model for parking slots.
+# It serves the public slot listings and availability lookups with Core select() queries
+# that return plain named tuples instead of ORM instances.
+
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import DateTime, Integer, and_, exists, func, literal, select, true, union_all
+from sqlalchemy.exc import NoResultFound
+from extensions import db
+from models.parking_location import ParkingLocation
+from models.parking_slot import ParkingSlot
+from models.reservation import Reservation, ReservationStatus
+from .columns import pick_columns
+
+class ParkingSlotRow(NamedTuple):
+    id:          Optional[int]      = None
+    slot_label:  Optional[str]      = None
+    location_id: Optional[int]      = None
+    version:     Optional[int]      = None
+    created_at:  Optional[datetime] = None
+    updated_at:  Optional[datetime] = None
+
+SLOT_COLUMNS = {
+    "id":          ParkingSlot.id,
+    "slot_label":  ParkingSlot.slot_label,
+    "location_id": ParkingSlot.location_id,
+    "version":     ParkingSlot.version,
+    "created_at":  ParkingSlot.created_at,
+    "updated_at":  ParkingSlot.updated_at,
+}
+
+class FreeWindow(NamedTuple):
+    slot_id:    int
+    slot_label: str
+    start_ts:   datetime
+    free_until: datetime   # end of the gap (the search bound if nothing follows)
+
+class AvailabilityMatrix(NamedTuple):
+    location_ids: List[int]
+    free:         List[List[int]]                    # [location][window] free slot count
+    slot_ids:     Optional[List[List[List[int]]]]   # [location][window] free slot ids, when requested
+
+class SlotCalendar(NamedTuple):
+    slot_id:  int
+    runs:     List[int]                    # [gap, busy, gap, busy, …] in seconds, the first gap from the range start
+    user_ids: Optional[List[List[int]]]    # per busy run, who holds it (admin view only)
+
+# conflicting reservations (booked OR ongoing only) on the outer query's slot
+def _conflicting(start_ts: datetime, end_ts: datetime):
+    return (
+        select(Reservation.id)
+        .where(
+            Reservation.slot_id == ParkingSlot.id,
+            Reservation.status.in_(
+                [ReservationStatus.booked, ReservationStatus.ongoing]
+            ),
+            Reservation.start_ts < end_ts,
+            Reservation.end_ts   > start_ts,
+        )
+    )
+
+class ParkingSlotReadModel:
+    # ---------- READ ----------
+    @staticmethod
+    def list_slots(fields: Optional[Sequence[str]] = None) -> List[ParkingSlotRow]:
+        stmt = select(*pick_columns(SLOT_COLUMNS, fields)).order_by(ParkingSlot.id)
+        return [ParkingSlotRow(**r._asdict()) for r in db.session.execute(stmt)]
+
+    @staticmethod
+    def get_or_404(slot_id: int, fields: Optional[Sequence[str]] = None) -> ParkingSlotRow:
+        row = db.session.execute(
+            select(*pick_columns(SLOT_COLUMNS, fields, always=("id", "version")))   # version is the ETag
+            .where(ParkingSlot.id == slot_id)
+        ).first()
+        if not row:
+            raise NoResultFound("Parking slot not found")
+        return ParkingSlotRow(**row._asdict())
+
+    @staticmethod
+    def get_by_location(
+        location_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[ParkingSlotRow]:
+        stmt = (
+            select(*pick_columns(SLOT_COLUMNS, fields))
+            .where(ParkingSlot.location_id == location_id)
+            .order_by(ParkingSlot.id)
+        )
+        return [ParkingSlotRow(**r._asdict()) for r in db.session.execute(stmt)]
+
+    @staticmethod
+    def get_available_slots(
+        location_id: int,
+        start_ts: datetime,
+        end_ts: datetime,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[ParkingSlotRow]:
+
+        # every slot of the location that has no conflict
+        stmt = (
+            select(*pick_columns(SLOT_COLUMNS, fields))
+            .where(
+                ParkingSlot.location_id == location_id,
+                ~exists(_conflicting(start_ts, end_ts)),
+            )
+            .order_by(ParkingSlot.id)
+        )
+        return [ParkingSlotRow(**r._asdict()) for r in db.session.execute(stmt)]
+
+    @staticmethod
+    def free_slot_counts(
+        location_ids: Optional[Sequence[int]],
+        start_ts: datetime,
+        end_ts: datetime,
+    ) -> Dict[int, int]:
+        # Free = total slots − distinct busy slots; the busy side is a single-table scan on reservations.location_id
+        busy = (
+            select(Reservation.location_id.label("loc_id"), func.count(func.distinct(Reservation.slot_id)).label("n"))
+            .where(
+                Reservation.status.in_(
+                    [ReservationStatus.booked, ReservationStatus.ongoing]
+                ),
+                Reservation.start_ts < end_ts,
+                Reservation.end_ts   > start_ts,
+            )
+            .group_by(Reservation.location_id)
+        )
+        totals = select(ParkingSlot.location_id.label("loc_id"), func.count(ParkingSlot.id).label("n"))
+        if location_ids is not None:
+            busy   = busy.where(Reservation.location_id.in_(location_ids))
+            totals = totals.where(ParkingSlot.location_id.in_(location_ids))
+        busy   = busy.subquery()
+        totals = totals.group_by(ParkingSlot.location_id).subquery()
+
+        stmt = (
+            select(totals.c.loc_id, totals.c.n - func.coalesce(busy.c.n, 0))
+            .outerjoin(busy, busy.c.loc_id == totals.c.loc_id)
+        )
+        return dict(db.session.execute(stmt).all())
+
+    @staticmethod
+    def earliest_windows(
+        location_id: int,
+        duration: timedelta,
+        after: datetime,
+        before: datetime,
+        limit: int = 5,
+    ) -> List[FreeWindow]:
+        # Every slot with its booked / ongoing intervals inside [after, before), sorted per slot, in one query
+        rows = db.session.execute(
+            select(ParkingSlot.id, ParkingSlot.slot_label, Reservation.start_ts, Reservation.end_ts)
+            .outerjoin(
+                Reservation,
+                and_(
+                    Reservation.slot_id == ParkingSlot.id,
+                    Reservation.status.in_(
+                        [ReservationStatus.booked, ReservationStatus.ongoing]
+                    ),
+                    Reservation.start_ts < before,
+                    Reservation.end_ts   > after,
+                ),
+            )
+            .where(ParkingSlot.location_id == location_id)
+            .order_by(ParkingSlot.id, Reservation.start_ts)
+        ).all()
+
+        # Sweep each slot's intervals for gaps that fit `duration`; no slot can contribute more than `limit`
+        windows: List[FreeWindow] = []
+        slot_id = label = cursor = None
+        found = 0
+        for sid, slot_label, start, end in rows + [(None, None, None, None)]:
+            if sid != slot_id:
+                if slot_id is not None and found < limit and before - cursor >= duration:
+                    windows.append(FreeWindow(slot_id, label, cursor, before))
+                slot_id, label, cursor, found = sid, slot_label, after, 0
+            if found >= limit or start is None:
+                continue
+
+            # SQLite hands back naive datetimes
+            start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+            end   = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+            if start - cursor >= duration:
+                windows.append(FreeWindow(slot_id, label, cursor, start))
+                found += 1
+            cursor = max(cursor, end)
+
+        windows.sort(key=lambda w: (w.start_ts, w.slot_id))
+        return windows[:limit]
+
+    @staticmethod
+    def availability_matrix(
+        location_ids: Optional[Sequence[int]],
+        windows: Sequence[Tuple[datetime, datetime]],
+        with_slot_ids: bool = False,
+    ) -> AvailabilityMatrix:
+        # Windows as an inline derived table, so every (location, window) pair is answered by one query
+        win = union_all(*[
+            select(
+                literal(i, Integer).label("idx"),
+                literal(start, DateTime(timezone=True)).label("start_ts"),
+                literal(end, DateTime(timezone=True)).label("end_ts"),
+            )
+            for i, (start, end) in enumerate(windows)
+        ]).subquery("windows")
+
+        # locations × windows, left-joined to the slots that have no conflict in that window
+        free_slot = and_(
+            ParkingSlot.location_id == ParkingLocation.id,
+            ~exists(_conflicting(win.c.start_ts, win.c.end_ts)),
+        )
+        if with_slot_ids:
+            stmt = (
+                select(ParkingLocation.id, win.c.idx, ParkingSlot.id)
+                .select_from(ParkingLocation)
+                .join(win, true())
+                .outerjoin(ParkingSlot, free_slot)
+                .order_by(ParkingLocation.id, win.c.idx, ParkingSlot.id)
+            )
+        else:
+            stmt = (
+                select(ParkingLocation.id, win.c.idx, func.count(ParkingSlot.id))
+                .select_from(ParkingLocation)
+                .join(win, true())
+                .outerjoin(ParkingSlot, free_slot)
+                .group_by(ParkingLocation.id, win.c.idx)
+                .order_by(ParkingLocation.id, win.c.idx)
+            )
+        if location_ids is not None:
+            stmt = stmt.where(ParkingLocation.id.in_(location_ids))
+
+        ids:   List[int]             = []
+        free:  Dict[int, List[int]]  = {}
+        slots: Dict[int, List[List[int]]] = {}
+        for loc_id, idx, value in db.session.execute(stmt):
+            if loc_id not in free:
+                ids.append(loc_id)
+                free[loc_id]  = [0] * len(windows)
+                slots[loc_id] = [[] for _ in windows]
+            if with_slot_ids:
+                if value is not None:
+                    free[loc_id][idx] += 1
+                    slots[loc_id][idx].append(value)
+            else:
+                free[loc_id][idx] = value
+
+        return AvailabilityMatrix(
+            location_ids=ids,
+            free=[free[i] for i in ids],
+            slot_ids=[slots[i] for i in ids] if with_slot_ids else None,
+        )
+
+    @staticmethod
+    def calendar(
+        location_id: int,
+        start_ts: datetime,
+        end_ts: datetime,
+        with_users: bool = False,
+    ) -> Iterator[SlotCalendar]:
+        # One range query ordered by (slot_id, start_ts), consumed in chunks and folded slot by slot
+        stmt = (
+            select(ParkingSlot.id, Reservation.start_ts, Reservation.end_ts, Reservation.user_id)
+            .outerjoin(
+                Reservation,
+                and_(
+                    Reservation.slot_id == ParkingSlot.id,
+                    Reservation.status.in_(
+                        [ReservationStatus.booked, ReservationStatus.ongoing]
+                    ),
+                    Reservation.start_ts < end_ts,
+                    Reservation.end_ts   > start_ts,
+                ),
+            )
+            .where(ParkingSlot.location_id == location_id)
+            .order_by(ParkingSlot.id, Reservation.start_ts)
+            .execution_options(yield_per=1000)
+        )
+
+        origin = int(start_ts.timestamp())
+        limit  = int(end_ts.timestamp()) - origin
+
+        def close(slot_id, spans, users):
+            # spans are merged [start, end) offsets; emit alternating gap / busy lengths
+            runs, cursor = [], 0
+            for a, b in spans:
+                runs += [a - cursor, b - a]
+                cursor = b
+            return SlotCalendar(slot_id, runs, users if with_users else None)
+
+        slot_id, spans, users = None, [], []
+        for sid, start, end, user_id in db.session.execute(stmt):
+            if sid != slot_id:
+                if slot_id is not None:
+                    yield close(slot_id, spans, users)
+                slot_id, spans, users = sid, [], []
+            if start is None:
+                continue
+
+            # SQLite hands back naive datetimes
+            start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+            end   = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+            a = max(int(start.timestamp()) - origin, 0)
+            b = min(int(end.timestamp()) - origin, limit)
+
+            # Touching or overlapping bookings merge into one busy run
+            if spans and a <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], b)
+                if user_id not in users[-1]:
+                    users[-1].append(user_id)
+            else:
+                spans.append([a, b])
+                users.append([user_id])
+
+        if slot_id is not None:
+            yield close(slot_id, spans, users)
@@ -0,0 +1,146 @@
+# This file defines the read model for reservations.
+# Reservation listings are the largest GET payloads, so they are served from Core select()
+# rows mapped into named tuples rather than hydrated ORM instances.
+# History listings can also read reservations_archive; the caller decides when a range needs it.
+
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import func, select, tuple_, union_all
+from sqlalchemy.exc import NoResultFound
+from extensions import db
+from models.reservation import Reservation, ReservationStatus
+from models.reservation_archive import ReservationArchive
+from .columns import pick_columns
+
+class ReservationRow(NamedTuple):
+    id:         Optional[int]               = None
+    user_id:    Optional[int]               = None
+    slot_id:    Optional[int]               = None
+    location_id: Optional[int]              = None
+    start_ts:   Optional[datetime]          = None
+    end_ts:     Optional[datetime]          = None
+    status:     Optional[ReservationStatus] = None
+    series_id:  Optional[int]               = None
+    version:    Optional[int]               = None
+    created_at: Optional[datetime]          = None
+    updated_at: Optional[datetime]          = None
+
+RESERVATION_COLUMNS = {
+    "id":         Reservation.id,
+    "user_id":    Reservation.user_id,
+    "slot_id":    Reservation.slot_id,
+    "location_id": Reservation.location_id,
+    "start_ts":   Reservation.start_ts,
+    "end_ts":     Reservation.end_ts,
+    "status":     Reservation.status,
+    "series_id":  Reservation.series_id,
+    "version":    Reservation.version,
+    "created_at": Reservation.created_at,
+    "updated_at": Reservation.updated_at,
+}
+
+ARCHIVE_COLUMNS = {name: getattr(ReservationArchive, name) for name in RESERVATION_COLUMNS}
+
+# Newest first, optionally limited to start_ts in [start, end) and unioned with the archive.
+# `where` builds the filter for either table, since both share column names. `after` (the (start_ts, id) of the
+# previous page's last row) and `limit` page through the same order.
+def _history(
+    fields: Optional[Sequence[str]],
+    where: Callable[[Any], list],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    include_archive: bool,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: Optional[int] = None,
+) -> List[ReservationRow]:
+    def query(model, columns):
+        conds = where(model)
+        if start is not None:
+            conds.append(model.start_ts >= start)
+        if end is not None:
+            conds.append(model.start_ts < end)
+        if after is not None:
+            conds.append(tuple_(model.start_ts, model.id) < after)
+        # start_ts and id are needed for ordering the union
+        always = ("start_ts", "id") if include_archive else ()
+        return select(*pick_columns(columns, fields, always=always)).where(*conds)
+
+    if include_archive:
+        both = union_all(
+            query(Reservation, RESERVATION_COLUMNS),
+            query(ReservationArchive, ARCHIVE_COLUMNS),
+        ).subquery()
+        stmt = select(both).order_by(both.c.start_ts.desc(), both.c.id.desc())
+    else:
+        stmt = query(Reservation, RESERVATION_COLUMNS).order_by(Reservation.start_ts.desc(), Reservation.id.desc())
+    return [ReservationRow(**r._asdict()) for r in db.session.execute(stmt.limit(limit))]
+
+class ReservationReadModel:
+    # ---------- READ ----------
+    @staticmethod
+    def list_all(
+        fields: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        include_archive: bool = False,
+    ) -> List[ReservationRow]:
+        return _history(fields, lambda m: [], start, end, include_archive)
+
+    # One page of list_all, after the (start_ts, id) of the previous page's last row; exports walk it in batches
+    @staticmethod
+    def page_all(
+        start: Optional[datetime],
+        end: Optional[datetime],
+        include_archive: bool,
+        after: Optional[Tuple[datetime, int]],
+        limit: int,
+    ) -> List[ReservationRow]:
+        return _history(None, lambda m: [], start, end, include_archive, after=after, limit=limit)
+
+    @staticmethod
+    def count_all(start: Optional[datetime], end: Optional[datetime], include_archive: bool) -> int:
+        def count(model) -> Any:
+            conds = []
+            if start is not None:
+                conds.append(model.start_ts >= start)
+            if end is not None:
+                conds.append(model.start_ts < end)
+            return select(func.count()).select_from(model).where(*conds).scalar_subquery()
+        total = count(Reservation)
+        if include_archive:
+            total = total + count(ReservationArchive)
+        return db.session.scalar(select(total))
+
+    @staticmethod
+    def get(reservation_id: int, fields: Optional[Sequence[str]] = None) -> ReservationRow:
+        # user_id and version are always selected: the route needs them for the owner check and the ETag
+        row = db.session.execute(
+            select(*pick_columns(RESERVATION_COLUMNS, fields, always=("id", "user_id", "version")))
+            .where(Reservation.id == reservation_id)
+        ).first()
+        if not row:
+            raise NoResultFound("Reservation not found")
+        return ReservationRow(**row._asdict())
+
+    @staticmethod
+    def list_by_ids(
+        reservation_ids: Sequence[int],
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[ReservationRow]:
+        stmt = (
+            select(*pick_columns(RESERVATION_COLUMNS, fields))
+            .where(Reservation.id.in_(reservation_ids))
+            .order_by(Reservation.id)
+        )
+        return [ReservationRow(**r._asdict()) for r in db.session.execute(stmt)]
+
+    @staticmethod
+    def list_by_user(
+        user_id: int,
+        fields: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        include_archive: bool = False,
+    ) -> List[ReservationRow]:
+        return _history(fields, lambda m: [m.user_id == user_id], start, end, include_archive)
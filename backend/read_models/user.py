@@ -0,0 +1,48 @@
+# This file defines the read model for users.
+# Only the public profile columns are selected; `password_hash` never leaves the database on reads.
+
+from __future__ import annotations
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Sequence
+from sqlalchemy import select
+from extensions import db
+from models.user import User, UserRole
+from .columns import pick_columns
+
+class UserRow(NamedTuple):
+    id:         Optional[int]      = None
+    email:      Optional[str]      = None
+    first_name: Optional[str]      = None
+    last_name:  Optional[str]      = None
+    role:       Optional[UserRole] = None
+    active:     Optional[bool]     = None
+    version:    Optional[int]      = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+USER_COLUMNS = {
+    "id":         User.id,
+    "email":      User.email,
+    "first_name": User.first_name,
+    "last_name":  User.last_name,
+    "role":       User.role,
+    "active":     User.active,
+    "version":    User.version,
+    "created_at": User.created_at,
+    "updated_at": User.updated_at,
+}
+
+class UserReadModel:
+    # ---------- READ ----------
+    @staticmethod
+    def list_users(fields: Optional[Sequence[str]] = None) -> List[UserRow]:
+        stmt = select(*pick_columns(USER_COLUMNS, fields)).order_by(User.id)
+        return [UserRow(**r._asdict()) for r in db.session.execute(stmt)]
+
+    @staticmethod
+    def get_user(user_id: int, fields: Optional[Sequence[str]] = None) -> Optional[UserRow]:
+        row = db.session.execute(
+            select(*pick_columns(USER_COLUMNS, fields, always=("id", "version")))
+            .where(User.id == user_id)
+        ).first()
+        return UserRow(**row._asdict()) if row else None
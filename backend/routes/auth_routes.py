@@ -4,11 +4,15 @@ from marshmallow import ValidationError
 from services.auth_service import AuthService
 from schemas.login_schema import login_schema
 from schemas.register_schema import register_schema
+from utils.idempotency import idempotent
+from utils.transaction import transactional
 
 auth_bp = Blueprint("auth_bp", __name__)
 
 # ---------- REGISTER ----------
 @auth_bp.post("/register")
+@idempotent
+@transactional
 def register_user():
     try:
         data = register_schema.load(request.get_json())
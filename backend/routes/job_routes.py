@@ -0,0 +1,72 @@
+import os
+from flask import Blueprint, request, jsonify, send_file, url_for
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from marshmallow import ValidationError
+from models.user import UserRole
+from schemas.job_schema import job_schema, job_create_schema
+from services.job_service import JobService
+from models.job import JobStatus
+from tasks.jobs import JOB_HANDLERS, export_path
+from utils.idempotency import idempotent
+from utils.security import role_required
+from utils.transaction import transactional
+
+jobs_bp = Blueprint("jobs_bp", __name__)
+
+# ---------- CREATE ----------
+# Queues heavy admin work for `flask jobs work`; poll the returned Location for progress and result
+@jobs_bp.post("")
+@jwt_required()
+@role_required(UserRole.admin)
+@idempotent
+@transactional
+def create_job():
+    try:
+        data = job_create_schema.load(request.get_json() or {})
+        if data["kind"] not in JOB_HANDLERS:
+            return jsonify({"error": f"kind must be one of {sorted(JOB_HANDLERS)}"}), 400
+
+        job  = JobService.enqueue(created_by=int(get_jwt_identity()), **data)
+        resp = jsonify({"job": job_schema.dump(job)})
+        resp.status_code = 202
+        resp.headers["Location"] = url_for("jobs_bp.get_job", job_id=job.id)
+        return resp
+    except ValidationError as err:
+        return jsonify({"errors": err.messages}), 400
+
+# ---------- READ ----------
+@jobs_bp.get("/<int:job_id>")
+@jwt_required()
+@role_required(UserRole.admin)
+def get_job(job_id: int):
+    job = JobService.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify({"job": job_schema.dump(job)}), 200
+
+# The file written by a finished export job
+@jobs_bp.get("/<int:job_id>/download")
+@jwt_required()
+@role_required(UserRole.admin)
+def download_job_file(job_id: int):
+    job = JobService.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    file_name = (job.result or {}).get("file") if job.status == JobStatus.succeeded else None
+    if not file_name or not os.path.exists(export_path(file_name)):
+        return jsonify({"error": "Job has no file to download"}), 404
+    return send_file(export_path(file_name), mimetype="text/csv", as_attachment=True, download_name=file_name)
+
+# ---------- CANCEL ----------
+@jobs_bp.post("/<int:job_id>/cancel")
+@jwt_required()
+@role_required(UserRole.admin)
+@transactional
+def cancel_job(job_id: int):
+    job = JobService.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    try:
+        return jsonify({"job": job_schema.dump(JobService.cancel(job))}), 200
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 409
@@ -1,14 +1,28 @@
-from flask import Blueprint, request, jsonify
+import json
+import queue
+from datetime import datetime, timedelta, timezone
+from flask import Blueprint, Response, request, jsonify
 from flask_jwt_extended import jwt_required
 from marshmallow import ValidationError
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm.exc import StaleDataError
 from models.user import UserRole
 from services.parking_location_service import ParkingLocationService
+from read_models.parking_location import ParkingLocationReadModel
 from schemas.parking_location_schema import (
     parking_location_schema,
     parking_locations_schema,
 )
 from utils.security import role_required
+from utils.http_cache import catalog_row, conditional_get, precondition_failed, stale_response, versioned
+from services.collection_version_service import CollectionVersionService
+from services.slot_event_service import SlotEventService
+from services.location_index_service import LocationIndexService
+from services.map_cluster_service import MapClusterService, MAX_ZOOM
+from services.occupancy_service import OccupancyService, BUCKET_MINUTES
+from read_models.parking_slot import ParkingSlotReadModel
+from utils.sparse_fields import requested_fields, sparse_schema
+from utils.transaction import transactional
 
 parking_location_bp = Blueprint("parking_location_bp", __name__)
 
@@ -16,6 +30,7 @@ parking_location_bp = Blueprint("parking_location_bp", __name__)
 @parking_location_bp.post("/locations")
 @jwt_required()
 @role_required(UserRole.admin)
+@transactional
 def create_location():
     try:
         data = parking_location_schema.load(request.get_json())
@@ -29,41 +44,210 @@ def create_location():
 
 # ---------- READ ----------
 @parking_location_bp.get("/locations")
+@conditional_get(CollectionVersionService.LOCATIONS)
 def list_locations():
-    locations = ParkingLocationService.list_locations()
-    enriched = [
+    try:
+        fields = requested_fields(parking_locations_schema)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    locations = ParkingLocationReadModel.list_locations(fields)
+    schema    = sparse_schema(parking_locations_schema, fields)
+    return jsonify({"locations": schema.dump(locations)}), 200
+
+# Closest locations with at least one free slot in the window (defaults to right now)
+@parking_location_bp.get("/locations/nearby")
+def nearby_locations():
+    try:
+        lat       = float(request.args["lat"])
+        lng       = float(request.args["lng"])
+        radius_km = float(request.args.get("radius_km", 5))
+        limit     = int(request.args.get("limit", 20))
+    except KeyError:
+        return jsonify({"error": "lat and lng are required"}), 400
+    except ValueError:
+        return jsonify({"error": "lat, lng, radius_km and limit must be numbers"}), 400
+
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return jsonify({"error": "lat/lng out of range"}), 400
+    if not (0 < radius_km <= 100):
+        return jsonify({"error": "radius_km must be between 0 and 100"}), 400
+    if limit < 1 or limit > 100:
+        return jsonify({"error": "limit must be between 1 and 100"}), 400
+
+    start_raw = request.args.get("start_ts")
+    end_raw   = request.args.get("end_ts")
+    if (start_raw or end_raw) and not (start_raw and end_raw):
+        return jsonify({"error": "start_ts and end_ts must be provided together"}), 400
+
+    if start_raw and end_raw:
+        try:
+            start_ts = datetime.fromisoformat(start_raw)
+            end_ts   = datetime.fromisoformat(end_raw)
+        except ValueError:
+            return jsonify({"error": "Invalid ISO‑8601 format for start_ts or end_ts"}), 400
+        if start_ts >= end_ts:
+            return jsonify({"error": "start_ts must be before end_ts"}), 400
+    else:
+        start_ts = end_ts = datetime.now(timezone.utc)
+
+    hits = LocationIndexService.nearby(lat, lng, radius_km)
+    free = (
+        ParkingSlotReadModel.free_slot_counts([h.location.id for h in hits], start_ts, end_ts)
+        if hits else {}
+    )
+
+    results = [
         {
-            **parking_location_schema.dump(loc),
-            "available_slots": ParkingLocationService.count_available_slots(loc),
+            **h.location._asdict(),
+            "distance_km": round(h.distance_km, 3),
+            "free_slots":  free[h.location.id],
         }
-        for loc in locations
-    ]
-    return jsonify({"locations": enriched}), 200
+        for h in hits
+        if free.get(h.location.id)
+    ][:limit]
+    return jsonify({"locations": results}), 200
+
+# Clustered map markers for a viewport (bounding box + zoom level)
+@parking_location_bp.get("/locations/clusters")
+def location_clusters():
+    try:
+        south = float(request.args["south"])
+        west  = float(request.args["west"])
+        north = float(request.args["north"])
+        east  = float(request.args["east"])
+        zoom  = int(request.args["zoom"])
+    except KeyError:
+        return jsonify({"error": "south, west, north, east and zoom are required"}), 400
+    except ValueError:
+        return jsonify({"error": "bounding box must be numbers and zoom an integer"}), 400
+
+    if not (-90 <= south <= north <= 90 and -180 <= west <= east <= 180):
+        return jsonify({"error": "Invalid bounding box"}), 400
+    if zoom < 0 or zoom > MAX_ZOOM:
+        return jsonify({"error": f"zoom must be between 0 and {MAX_ZOOM}"}), 400
+
+    clusters = MapClusterService.clusters(south, west, north, east, zoom)
+    return jsonify({"clusters": [c._asdict() for c in clusters]}), 200
 
 @parking_location_bp.get("/locations/<int:loc_id>")
 def get_location(loc_id: int):
     try:
-        loc = ParkingLocationService.get_or_404(loc_id)
-        payload = {
-            **parking_location_schema.dump(loc),
-            "available_slots": ParkingLocationService.count_available_slots(loc),
-        }
-        return jsonify({"location": payload}), 200
+        fields = requested_fields(parking_location_schema)
+        loc    = ParkingLocationReadModel.get_or_404(loc_id, fields)
+        schema = sparse_schema(parking_location_schema, fields)
+        # available_slots changes with slot writes, which don't bump the location's version
+        counts = not fields or "available_slots" in fields
+        return catalog_row({"location": schema.dump(loc)}, loc.version, revalidate=not counts)
+    except NoResultFound:
+        return jsonify({"error": "Location not found"}), 404
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+
+# ---------- LIVE EVENTS (SSE) ----------
+# Streams slot occupancy changes for one location. The generator runs outside the app context,
+# so no DB session is held while the connection idles (run under the gevent worker).
+@parking_location_bp.get("/locations/<int:loc_id>/events")
+def location_events(loc_id: int):
+    try:
+        ParkingLocationReadModel.get_or_404(loc_id, fields=("id",))
     except NoResultFound:
         return jsonify({"error": "Location not found"}), 404
 
+    SlotEventService.start_listener()
+
+    def stream():
+        subscription = SlotEventService.subscribe(loc_id)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    payload = subscription.get(timeout=15)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: slot\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            SlotEventService.unsubscribe(loc_id, subscription)
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ---------- OCCUPANCY GRID ----------
+# Window from ?start_ts/end_ts (default: the next 24 h), which must lie inside the occupancy horizon
+def _occupancy_window():
+    now = datetime.now(timezone.utc)
+    try:
+        start_ts = datetime.fromisoformat(request.args["start_ts"]) if "start_ts" in request.args else now
+        end_ts   = datetime.fromisoformat(request.args["end_ts"]) if "end_ts" in request.args else start_ts + timedelta(days=1)
+    except ValueError:
+        raise ValueError("Invalid ISO‑8601 format for start_ts or end_ts")
+
+    start_ts = start_ts if start_ts.tzinfo else start_ts.replace(tzinfo=timezone.utc)
+    end_ts   = end_ts if end_ts.tzinfo else end_ts.replace(tzinfo=timezone.utc)
+    origin, horizon_end = OccupancyService.horizon()
+
+    if start_ts >= end_ts:
+        raise ValueError("start_ts must be before end_ts")
+    if start_ts < origin or end_ts > horizon_end:
+        raise ValueError(f"Window must lie between {origin.isoformat()} and {horizon_end.isoformat()}")
+    return start_ts, end_ts
+
+# Slots × time buckets: one "0"/"1" character per bucket and slot, plus free slot counts per bucket
+@parking_location_bp.get("/locations/<int:loc_id>/occupancy")
+def location_occupancy(loc_id: int):
+    try:
+        ParkingLocationReadModel.get_or_404(loc_id, fields=("id",))
+        start_ts, end_ts = _occupancy_window()
+    except NoResultFound:
+        return jsonify({"error": "Location not found"}), 404
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    grid = OccupancyService.grid(loc_id, start_ts, end_ts)
+    return jsonify({
+        "start_ts":       grid.start_ts.isoformat(),
+        "bucket_minutes": BUCKET_MINUTES,
+        "buckets":        grid.buckets,
+        "slots":          [{"slot_id": sid, "busy": busy} for sid, busy in zip(grid.slot_ids, grid.busy)],
+        "free_counts":    grid.free_counts,
+    }), 200
+
+# Slots free for the whole window (bucket resolution: a booking anywhere in a touched bucket counts)
+@parking_location_bp.get("/locations/<int:loc_id>/occupancy/free")
+def location_occupancy_free(loc_id: int):
+    try:
+        ParkingLocationReadModel.get_or_404(loc_id, fields=("id",))
+        start_ts, end_ts = _occupancy_window()
+    except NoResultFound:
+        return jsonify({"error": "Location not found"}), 404
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    return jsonify({"slot_ids": OccupancyService.free_slots(loc_id, start_ts, end_ts)}), 200
+
 
 # ---------- UPDATE ----------
 @parking_location_bp.put("/locations/<int:loc_id>")
 @jwt_required()
 @role_required(UserRole.admin)
+@transactional
 def update_location(loc_id: int):
     try:
         loc = ParkingLocationService.get_or_404(loc_id)
+        if precondition_failed(loc.version):
+            return stale_response()
         patch = parking_location_schema.load(request.get_json(), partial=True)
         loc = ParkingLocationService.update_location(loc, **patch)
-        return jsonify({"location": parking_location_schema.dump(loc)}), 200
+        return versioned({"location": parking_location_schema.dump(loc)}, loc.version)
 
+    except StaleDataError:
+        return stale_response()
     except NoResultFound:
         return jsonify({"error": "Location not found"}), 404
     except ValidationError as err:
@@ -74,6 +258,7 @@ def update_location(loc_id: int):
 @parking_location_bp.delete("/locations/<int:loc_id>")
 @jwt_required()
 @role_required(UserRole.admin)
+@transactional
 def delete_location(loc_id: int):
     try:
         loc = ParkingLocationService.get_or_404(loc_id)
@@ -81,3 +266,5 @@ def delete_location(loc_id: int):
         return jsonify({}), 204
     except NoResultFound:
         return jsonify({"error": "Location not found"}), 404
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 409
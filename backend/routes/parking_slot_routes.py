@@ -1,13 +1,20 @@
 #
-from datetime import datetime
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
+from datetime import datetime, timedelta, timezone
+import json
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import get_jwt, jwt_required
 from marshmallow import ValidationError
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm.exc import StaleDataError
 from services.parking_slot_service import ParkingSlotService
+from read_models.parking_slot import ParkingSlotReadModel
 from schemas.parking_slot_schema import parking_slot_schema, parking_slots_schema
 from utils.security import role_required
+from utils.http_cache import catalog_row, conditional_get, precondition_failed, stale_response, versioned
+from services.collection_version_service import CollectionVersionService
+from utils.sparse_fields import requested_fields, sparse_schema
 from models.user import UserRole
+from utils.transaction import transactional
 
 parking_slot_bp = Blueprint("parking_slot_bp", __name__)
 
@@ -15,6 +22,7 @@ parking_slot_bp = Blueprint("parking_slot_bp", __name__)
 @parking_slot_bp.post("/slots")
 @jwt_required()
 @role_required(UserRole.admin)
+@transactional
 def create_slot():
     try:
         data = parking_slot_schema.load(request.get_json())
@@ -25,11 +33,18 @@ def create_slot():
 
 # ---------- READ ----------
 @parking_slot_bp.get("/slots")
+# Availability windows depend on reservations, which the slot version does not track
+@conditional_get(CollectionVersionService.SLOTS, unless_args=("start_ts", "end_ts"))
 def list_slots():
     location_id = request.args.get("location_id", type=int)
     start_raw   = request.args.get("start_ts")
     end_raw     = request.args.get("end_ts")
 
+    try:
+        fields = requested_fields(parking_slots_schema)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
     if (start_raw or end_raw) and not (start_raw and end_raw):
         return jsonify({"error": "start_ts and end_ts must be provided together"}), 400
 
@@ -46,33 +61,186 @@ def list_slots():
         if start_ts >= end_ts:
             return jsonify({"error": "start_ts must be before end_ts"}), 400
 
-        slots = ParkingSlotService.get_available_slots(location_id, start_ts, end_ts)
+        slots = ParkingSlotReadModel.get_available_slots(location_id, start_ts, end_ts, fields)
     else:
         if location_id:
-            slots = ParkingSlotService.get_by_location(location_id)
+            slots = ParkingSlotReadModel.get_by_location(location_id, fields)
         else:
-            slots = ParkingSlotService.list_slots()
+            slots = ParkingSlotReadModel.list_slots(fields)
+
+    schema = sparse_schema(parking_slots_schema, fields)
+    return jsonify({"slots": schema.dump(slots)}), 200
+
+# Earliest (slot, start) pairs at a location with `duration` minutes free, searched in [after, before)
+NEXT_AVAILABLE_MAX_RANGE = timedelta(days=31)
+
+@parking_slot_bp.get("/next-available")
+def next_available():
+    try:
+        location_id = int(request.args["location_id"])
+        duration    = int(request.args.get("duration", 60))
+        limit       = int(request.args.get("limit", 5))
+    except KeyError:
+        return jsonify({"error": "location_id is required"}), 400
+    except ValueError:
+        return jsonify({"error": "location_id, duration and limit must be integers"}), 400
+
+    if duration < 1 or duration > 24 * 60:
+        return jsonify({"error": "duration must be between 1 and 1440 minutes"}), 400
+    if limit < 1 or limit > 50:
+        return jsonify({"error": "limit must be between 1 and 50"}), 400
+
+    try:
+        after  = datetime.fromisoformat(request.args["after"]) if "after" in request.args else datetime.now(timezone.utc)
+        after  = after if after.tzinfo else after.replace(tzinfo=timezone.utc)
+        before = datetime.fromisoformat(request.args["before"]) if "before" in request.args else after + timedelta(days=7)
+        before = before if before.tzinfo else before.replace(tzinfo=timezone.utc)
+    except ValueError:
+        return jsonify({"error": "Invalid ISO‑8601 format for after or before"}), 400
+
+    if after >= before:
+        return jsonify({"error": "after must be before before"}), 400
+    if before - after > NEXT_AVAILABLE_MAX_RANGE:
+        return jsonify({"error": "Search range must not exceed 31 days"}), 400
+
+    windows = ParkingSlotReadModel.earliest_windows(
+        location_id, timedelta(minutes=duration), after, before, limit
+    )
+    return jsonify({
+        "windows": [
+            {
+                "slot_id":    w.slot_id,
+                "slot_label": w.slot_label,
+                "start_ts":   w.start_ts.isoformat(),
+                "end_ts":     (w.start_ts + timedelta(minutes=duration)).isoformat(),
+                "free_until": w.free_until.isoformat(),
+            }
+            for w in windows
+        ]
+    }), 200
+
+# Free slot counts (and optionally ids) for many locations × windows in one query
+AVAILABILITY_MAX_LOCATIONS = 500
+AVAILABILITY_MAX_WINDOWS   = 24
+
+@parking_slot_bp.post("/availability")
+def batch_availability():
+    body          = request.get_json() or {}
+    location_ids  = body.get("location_ids", "all")
+    raw_windows   = body.get("windows")
+    with_slot_ids = bool(body.get("include_slot_ids", False))
+
+    if location_ids == "all":
+        location_ids = None
+    elif (
+        not isinstance(location_ids, list)
+        or not location_ids
+        or not all(isinstance(i, int) and not isinstance(i, bool) for i in location_ids)
+    ):
+        return jsonify({"error": 'location_ids must be a non-empty list of integers or "all"'}), 400
+    elif len(location_ids) > AVAILABILITY_MAX_LOCATIONS:
+        return jsonify({"error": f"At most {AVAILABILITY_MAX_LOCATIONS} locations per request"}), 400
 
-    return jsonify({"slots": parking_slots_schema.dump(slots)}), 200
+    if not isinstance(raw_windows, list) or not raw_windows:
+        return jsonify({"error": "windows must be a non-empty list"}), 400
+    if len(raw_windows) > AVAILABILITY_MAX_WINDOWS:
+        return jsonify({"error": f"At most {AVAILABILITY_MAX_WINDOWS} windows per request"}), 400
+
+    windows = []
+    try:
+        for w in raw_windows:
+            start_ts = datetime.fromisoformat(w["start_ts"])
+            end_ts   = datetime.fromisoformat(w["end_ts"])
+            if start_ts >= end_ts:
+                return jsonify({"error": "start_ts must be before end_ts"}), 400
+            windows.append((start_ts, end_ts))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Each window needs ISO‑8601 start_ts and end_ts"}), 400
+
+    matrix = ParkingSlotReadModel.availability_matrix(
+        sorted(set(location_ids)) if location_ids is not None else None,
+        windows,
+        with_slot_ids,
+    )
+    result = {
+        "location_ids": matrix.location_ids,
+        "windows":      [{"start_ts": s.isoformat(), "end_ts": e.isoformat()} for s, e in windows],
+        "free":         matrix.free,
+    }
+    if with_slot_ids:
+        result["slot_ids"] = matrix.slot_ids
+    return jsonify(result), 200
+
+# Per-slot busy timeline for [from, to): merged runs as alternating gap / busy lengths in seconds.
+# Streamed slot by slot so large locations never build the whole payload in memory.
+CALENDAR_MAX_RANGE = timedelta(days=31)
+
+@parking_slot_bp.get("/calendar")
+@jwt_required(optional=True)
+def slot_calendar():
+    try:
+        location_id = int(request.args["location_id"])
+    except KeyError:
+        return jsonify({"error": "location_id is required"}), 400
+    except ValueError:
+        return jsonify({"error": "location_id must be an integer"}), 400
+
+    try:
+        start_ts = datetime.fromisoformat(request.args["from"]) if "from" in request.args else datetime.now(timezone.utc)
+        start_ts = start_ts if start_ts.tzinfo else start_ts.replace(tzinfo=timezone.utc)
+        end_ts   = datetime.fromisoformat(request.args["to"]) if "to" in request.args else start_ts + timedelta(days=1)
+        end_ts   = end_ts if end_ts.tzinfo else end_ts.replace(tzinfo=timezone.utc)
+    except ValueError:
+        return jsonify({"error": "Invalid ISO‑8601 format for from or to"}), 400
+
+    if start_ts >= end_ts:
+        return jsonify({"error": "from must be before to"}), 400
+    if end_ts - start_ts > CALENDAR_MAX_RANGE:
+        return jsonify({"error": "Calendar range must not exceed 31 days"}), 400
+
+    # Only admins see who holds a run
+    with_users = get_jwt().get("role") == UserRole.admin.value
+
+    def stream():
+        yield '{"from":%s,"to":%s,"unit":"s","slots":[' % (
+            json.dumps(start_ts.isoformat()), json.dumps(end_ts.isoformat()),
+        )
+        for i, cal in enumerate(ParkingSlotReadModel.calendar(location_id, start_ts, end_ts, with_users)):
+            entry = {"slot_id": cal.slot_id, "runs": cal.runs}
+            if with_users:
+                entry["user_ids"] = cal.user_ids
+            yield ("," if i else "") + json.dumps(entry, separators=(",", ":"))
+        yield "]}"
+
+    return Response(stream_with_context(stream()), mimetype="application/json")
 
 @parking_slot_bp.get("/slots/<int:slot_id>")
 def get_slot(slot_id):
     try:
-        slot = ParkingSlotService.get_or_404(slot_id)
-        return jsonify({"slot": parking_slot_schema.dump(slot)}), 200
+        fields = requested_fields(parking_slot_schema)
+        slot   = ParkingSlotReadModel.get_or_404(slot_id, fields)
+        schema = sparse_schema(parking_slot_schema, fields)
+        return catalog_row({"slot": schema.dump(slot)}, slot.version)
     except NoResultFound:
         return jsonify({"error": "Slot not found"}), 404
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
 
 # ---------- UPDATE ----------
 @parking_slot_bp.put("/slots/<int:slot_id>")
 @jwt_required()
 @role_required(UserRole.admin)
+@transactional
 def update_slot(slot_id):
     try:
         slot = ParkingSlotService.get_or_404(slot_id)
+        if precondition_failed(slot.version):
+            return stale_response()
         data = parking_slot_schema.load(request.get_json(), partial=True)
         slot = ParkingSlotService.update_slot(slot, **data)
-        return jsonify({"slot": parking_slot_schema.dump(slot)}), 200
+        return versioned({"slot": parking_slot_schema.dump(slot)}, slot.version)
+    except StaleDataError:
+        return stale_response()
     except NoResultFound:
         return jsonify({"error": "Slot not found"}), 404
     except ValidationError as err:
@@ -82,6 +250,7 @@ def update_slot(slot_id):
 @parking_slot_bp.delete("/slots/<int:slot_id>")
 @jwt_required()
 @role_required(UserRole.admin)
+@transactional
 def delete_slot(slot_id):
     try:
         slot = ParkingSlotService.get_or_404(slot_id)
@@ -89,3 +258,5 @@ def delete_slot(slot_id):
         return jsonify({}), 204
     except NoResultFound:
         return jsonify({"error": "Slot not found"}), 404
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 409
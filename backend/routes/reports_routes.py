@@ -4,14 +4,21 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from models.user import UserRole
 from services.analytics_service import AnalyticsService
+from services.slot_lock_service import SlotLockService
 from utils.security import role_required
+from utils.single_flight import single_flight, single_flight_stats
+from utils.admission import admission_stats
 
 reports_bp = Blueprint("reports_bp", __name__)
 
+# Seconds a computed report is shared with identical requests after it finishes
+REPORT_TTL = 2.0
+
 # Reservations created per day (last N days, default = 7)
 @reports_bp.get("/reservations-per-day")
 @jwt_required()
 @role_required(UserRole.admin)
+@single_flight(REPORT_TTL)
 def reservations_per_day():
     try:
         days = int(request.args.get("days", 7))
@@ -28,6 +35,7 @@ def reservations_per_day():
 @reports_bp.get("/slot-summary")
 @jwt_required()
 @role_required(UserRole.admin)
+@single_flight(REPORT_TTL)
 def slot_summary():
     data = AnalyticsService.slots_available_per_location()
     return jsonify({"data": data}), 200
@@ -36,6 +44,28 @@ def slot_summary():
 @reports_bp.get("/active-users")
 @jwt_required()
 @role_required(UserRole.admin)
+@single_flight(REPORT_TTL)
 def active_users():
     data = AnalyticsService.users_with_active_reservations()
     return jsonify({"data": data}), 200
+
+# Time this worker spent waiting on per-slot booking locks
+@reports_bp.get("/slot-lock-waits")
+@jwt_required()
+@role_required(UserRole.admin)
+def slot_lock_waits():
+    return jsonify({"data": SlotLockService.wait_stats()}), 200
+
+# Report computations this worker ran vs. shared with identical concurrent / recent requests
+@reports_bp.get("/single-flight")
+@jwt_required()
+@role_required(UserRole.admin)
+def single_flight_counters():
+    return jsonify({"data": single_flight_stats()}), 200
+
+# Requests this worker admitted / shed with 503 per endpoint class (not itself subject to admission)
+@reports_bp.get("/admission")
+@jwt_required()
+@role_required(UserRole.admin)
+def admission_counters():
+    return jsonify({"data": admission_stats()}), 200
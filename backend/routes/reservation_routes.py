@@ -1,18 +1,32 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from marshmallow import ValidationError
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm.exc import StaleDataError
 from models.reservation import ReservationStatus
 from models.user import UserRole
-from schemas.reservation_schema import reservation_schema, reservations_schema
-from services.reservation_service import ReservationService
+from schemas.reservation_schema import auto_reservation_schema, reservation_schema, reservations_schema
+from schemas.reservation_series_schema import (
+    reservation_series_schema, reservation_series_list_schema, reservation_series_update_schema,
+)
+from services.reservation_service import ReservationService, SlotUnavailableError
+from services.reservation_archive_service import ReservationArchiveService
+from services.reservation_change_service import ReservationChangeService
+from services.reservation_series_service import ReservationSeriesService
+from utils.sparse_fields import requested_fields, sparse_schema
+from read_models.reservation import ReservationReadModel
 from datetime import datetime, timezone
+from utils.http_cache import precondition_failed, stale_response, versioned
+from utils.idempotency import idempotent
+from utils.transaction import transactional
 
 reservation_bp = Blueprint("reservation_bp", __name__)
 
 # ---------- CREATE ----------
 @reservation_bp.post("/reservations")
 @jwt_required()
+@idempotent
+@transactional
 def create_reservation():
     try:
         data = reservation_schema.load(request.get_json())
@@ -23,9 +37,89 @@ def create_reservation():
         return jsonify({"errors": err.messages}), 400
     except ValueError as err:
         return jsonify({"error": str(err)}), 400
+    except StaleDataError:
+        # A row the booking touches changed under it; the client can simply retry
+        return jsonify({"error": "Slot was modified by another request; please retry"}), 409
     except Exception:
         return jsonify({"error": "Something went wrong"}), 500
 
+# Server picks a free slot at the location for the window
+@reservation_bp.post("/reservations/auto")
+@jwt_required()
+@idempotent
+@transactional
+def create_reservation_auto():
+    try:
+        data   = auto_reservation_schema.load(request.get_json() or {})
+        policy = data.pop("policy", None) or current_app.config.get("AUTO_ASSIGN_POLICY", "lowest_label")
+        reservation = ReservationService.create_auto(int(get_jwt_identity()), policy=policy, **data)
+        return jsonify({"reservation": reservation_schema.dump(reservation)}), 201
+    except ValidationError as err:
+        return jsonify({"errors": err.messages}), 400
+    except SlotUnavailableError as err:
+        return jsonify({"error": str(err)}), 409
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+# ---------- CREATE (BATCH) ----------
+BATCH_LIMIT = 100
+BATCH_MODES = ("all_or_nothing", "best_effort")
+
+@reservation_bp.post("/reservations/batch")
+@jwt_required()
+@idempotent
+@transactional
+def create_reservation_batch():
+    body      = request.get_json() or {}
+    raw_items = body.get("reservations")
+    mode      = body.get("mode", "all_or_nothing")
+
+    if mode not in BATCH_MODES:
+        return jsonify({"error": f"mode must be one of {', '.join(BATCH_MODES)}"}), 400
+    if not isinstance(raw_items, list) or not raw_items:
+        return jsonify({"error": "reservations must be a non-empty list"}), 400
+    if len(raw_items) > BATCH_LIMIT:
+        return jsonify({"error": f"At most {BATCH_LIMIT} reservations per batch"}), 400
+
+    # Validate every item up front
+    valid, invalid = {}, {}
+    for i, raw in enumerate(raw_items):
+        try:
+            valid[i] = reservation_schema.load(raw)
+        except ValidationError as err:
+            invalid[i] = err.messages
+
+    if invalid and mode == "all_or_nothing":
+        return jsonify({"errors": {str(i): msg for i, msg in invalid.items()}}), 400
+
+    indices = list(valid)
+    outcome = ReservationService.create_batch(
+        int(get_jwt_identity()),
+        [valid[i] for i in indices],
+        atomic=(mode == "all_or_nothing"),
+    ) if indices else []
+
+    results = [{"index": i, "status": "failed", "errors": msg} for i, msg in invalid.items()]
+    for item in outcome:
+        entry = {"index": indices[item.index]}
+        if item.reservation is not None:
+            entry |= {"status": "created", "reservation": reservation_schema.dump(item.reservation)}
+        elif item.error:
+            entry |= {"status": "failed", "error": item.error}
+        else:
+            entry |= {"status": "skipped"}    # valid, but the batch was rolled back
+        results.append(entry)
+    results.sort(key=lambda r: r["index"])
+
+    created = sum(r["status"] == "created" for r in results)
+    if created == len(raw_items):
+        code = 201
+    elif created:
+        code = 207
+    else:
+        code = 409
+    return jsonify({"mode": mode, "created": created, "results": results}), code
+
 # ---------- READ ----------
 @reservation_bp.get("/reservations")
 @jwt_required()
@@ -33,31 +127,82 @@ def list_reservations():
     claims  = get_jwt()
     user_id = int(get_jwt_identity())
 
+    try:
+        fields = requested_fields(reservations_schema)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    # Optional history range on start_ts; the archive is only read when the range reaches back into it
+    try:
+        start_ts = datetime.fromisoformat(request.args["from"]) if "from" in request.args else None
+        end_ts   = datetime.fromisoformat(request.args["to"]) if "to" in request.args else None
+    except ValueError:
+        return jsonify({"error": "Invalid ISO‑8601 format for from or to"}), 400
+    start_ts = start_ts if start_ts is None or start_ts.tzinfo else start_ts.replace(tzinfo=timezone.utc)
+    end_ts   = end_ts if end_ts is None or end_ts.tzinfo else end_ts.replace(tzinfo=timezone.utc)
+    if start_ts and end_ts and start_ts >= end_ts:
+        return jsonify({"error": "from must be before to"}), 400
+
+    archived = ReservationArchiveService.reaches(start_ts)
     if claims.get("role") == UserRole.admin.value:
-        reservations = ReservationService.list_all()
+        reservations = ReservationReadModel.list_all(fields, start_ts, end_ts, include_archive=archived)
     else:
-        reservations = ReservationService.list_by_user(user_id)
+        reservations = ReservationReadModel.list_by_user(user_id, fields, start_ts, end_ts, include_archive=archived)
+
+    schema = sparse_schema(reservations_schema, fields)
+    return jsonify({"reservations": schema.dump(reservations)}), 200
+
+# Delta sync: reservations created/updated/deleted after `since` (0 = full sync)
+@reservation_bp.get("/changes")
+@jwt_required()
+def reservation_changes():
+    claims  = get_jwt()
+    user_id = int(get_jwt_identity())
+
+    try:
+        since = int(request.args.get("since", 0))
+        limit = int(request.args.get("limit", 500))
+    except ValueError:
+        return jsonify({"error": "since and limit must be integers"}), 400
+
+    if since < 0:
+        return jsonify({"error": "since must be a non-negative cursor"}), 400
+    if limit < 1 or limit > 1000:
+        return jsonify({"error": "limit must be between 1 and 1000"}), 400
 
-    return jsonify({"reservations": reservations_schema.dump(reservations)}), 200
+    scope   = None if claims.get("role") == UserRole.admin.value else user_id
+    changes = ReservationChangeService.changes_since(since, user_id=scope, limit=limit)
+
+    return jsonify({
+        "reservations": reservations_schema.dump(changes.reservations),
+        "deleted":      changes.deleted,
+        "next_cursor":  changes.next_cursor,
+        "has_more":     changes.has_more,
+    }), 200
 
 @reservation_bp.get("/reservations/<int:reservation_id>")
 @jwt_required()
 def get_reservation(reservation_id):
     try:
-        reservation = ReservationService.get(reservation_id)
+        fields      = requested_fields(reservation_schema)
+        reservation = ReservationReadModel.get(reservation_id, fields)
         claims      = get_jwt()
         user_id     = int(get_jwt_identity())
 
         if claims.get("role") != UserRole.admin.value and reservation.user_id != user_id:
             return jsonify({"error": "Unauthorized"}), 403
 
-        return jsonify({"reservation": reservation_schema.dump(reservation)}), 200
+        schema = sparse_schema(reservation_schema, fields)
+        return versioned({"reservation": schema.dump(reservation)}, reservation.version)
     except NoResultFound:
         return jsonify({"error": "Reservation not found"}), 404
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
 
 # ---------- UPDATE ----------
 @reservation_bp.put("/reservations/<int:reservation_id>")
 @jwt_required()
+@transactional
 def update_reservation(reservation_id):
     try:
         reservation = ReservationService.get(reservation_id)
@@ -67,18 +212,26 @@ def update_reservation(reservation_id):
         if claims.get("role") != UserRole.admin.value and reservation.user_id != user_id:
             return jsonify({"error": "Unauthorized"}), 403
 
+        if precondition_failed(reservation.version):
+            return stale_response()
+
         data    = reservation_schema.load(request.get_json(), partial=True)
         updated = ReservationService.update(reservation, **data)
 
-        return jsonify({"reservation": reservation_schema.dump(updated)}), 200
+        return versioned({"reservation": reservation_schema.dump(updated)}, updated.version)
+    except StaleDataError:
+        return stale_response()
     except NoResultFound:
         return jsonify({"error": "Reservation not found"}), 404
     except ValidationError as err:
         return jsonify({"errors": err.messages}), 400
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
 
 # ---------- DELETE ----------
 @reservation_bp.delete("/reservations/<int:reservation_id>")
 @jwt_required()
+@transactional
 def delete_reservation(reservation_id):
     try:
         reservation = ReservationService.get(reservation_id)
@@ -96,6 +249,7 @@ def delete_reservation(reservation_id):
 # ---------- CANCEL ----------
 @reservation_bp.post("/reservations/<int:reservation_id>/cancel")
 @jwt_required()
+@transactional
 def cancel_reservation(reservation_id):
     try:
         reservation = ReservationService.get(reservation_id)
@@ -115,6 +269,7 @@ def cancel_reservation(reservation_id):
 # ---------- FINISH ----------
 @reservation_bp.post("/reservations/<int:reservation_id>/finish")
 @jwt_required()
+@transactional
 def finish_reservation(reservation_id):
     try:
         res     = ReservationService.get(reservation_id)
@@ -133,3 +288,86 @@ def finish_reservation(reservation_id):
         return jsonify({"error": str(ve)}), 400
     except NoResultFound:
         return jsonify({"error": "Reservation not found"}), 404
+
+# ---------- RECURRING SERIES ----------
+def _series_for_caller(series_id):
+    series = ReservationSeriesService.get(series_id)
+    if get_jwt().get("role") != UserRole.admin.value and series.user_id != int(get_jwt_identity()):
+        return None
+    return series
+
+@reservation_bp.post("/series")
+@jwt_required()
+@idempotent
+@transactional
+def create_series():
+    try:
+        data = reservation_series_schema.load(request.get_json() or {})
+        series, created = ReservationSeriesService.create(int(get_jwt_identity()), **data)
+        return jsonify({
+            "series":       reservation_series_schema.dump(series),
+            "reservations": reservations_schema.dump(created),
+        }), 201
+    except ValidationError as err:
+        return jsonify({"errors": err.messages}), 400
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+@reservation_bp.get("/series")
+@jwt_required()
+def list_series():
+    scope = None if get_jwt().get("role") == UserRole.admin.value else int(get_jwt_identity())
+    return jsonify({"series": reservation_series_list_schema.dump(ReservationSeriesService.list_all(scope))}), 200
+
+@reservation_bp.get("/series/<int:series_id>")
+@jwt_required()
+def get_series(series_id):
+    try:
+        series = _series_for_caller(series_id)
+        if series is None:
+            return jsonify({"error": "Unauthorized"}), 403
+        return jsonify({
+            "series":       reservation_series_schema.dump(series),
+            "reservations": reservations_schema.dump(ReservationSeriesService.upcoming(series)),
+        }), 200
+    except NoResultFound:
+        return jsonify({"error": "Reservation series not found"}), 404
+
+# Re-plans future occurrences only
+@reservation_bp.put("/series/<int:series_id>")
+@jwt_required()
+@transactional
+def update_series(series_id):
+    try:
+        series = _series_for_caller(series_id)
+        if series is None:
+            return jsonify({"error": "Unauthorized"}), 403
+
+        changes = reservation_series_update_schema.load(request.get_json() or {})
+        updated = ReservationSeriesService.update(series, **changes)
+        return jsonify({
+            "series":       reservation_series_schema.dump(updated),
+            "reservations": reservations_schema.dump(ReservationSeriesService.upcoming(updated)),
+        }), 200
+    except NoResultFound:
+        return jsonify({"error": "Reservation series not found"}), 404
+    except ValidationError as err:
+        return jsonify({"errors": err.messages}), 400
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+# Cancels future occurrences; past and running ones are kept
+@reservation_bp.post("/series/<int:series_id>/cancel")
+@jwt_required()
+@transactional
+def cancel_series(series_id):
+    try:
+        series = _series_for_caller(series_id)
+        if series is None:
+            return jsonify({"error": "Unauthorized"}), 403
+        cancelled = ReservationSeriesService.cancel(series)
+        return jsonify({"series": reservation_series_schema.dump(cancelled)}), 200
+    except NoResultFound:
+        return jsonify({"error": "Reservation series not found"}), 404
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
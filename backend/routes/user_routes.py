@@ -2,10 +2,15 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
 from marshmallow import ValidationError
+from sqlalchemy.orm.exc import StaleDataError
 from models.user import UserRole
 from schemas.user_schema import user_schema, users_schema
 from services.user_service import UserService
+from read_models.user import UserReadModel
+from utils.http_cache import precondition_failed, stale_response, versioned
 from utils.security import role_required
+from utils.sparse_fields import requested_fields, sparse_schema
+from utils.transaction import transactional
 
 user_bp = Blueprint("user_bp", __name__)
 
@@ -23,6 +28,7 @@ def _current_role() -> str:
 @user_bp.post("/")
 @jwt_required()
 @role_required(UserRole.admin)
+@transactional
 def create_user():
     try:
         data = user_schema.load(request.get_json())
@@ -38,17 +44,27 @@ def create_user():
 @jwt_required()
 @role_required(UserRole.admin)
 def list_users():
-    users = UserService.list_users()
-    return jsonify({"users": users_schema.dump(users)}), 200
+    try:
+        fields = requested_fields(users_schema)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    users = UserReadModel.list_users(fields)
+    return jsonify({"users": sparse_schema(users_schema, fields).dump(users)}), 200
 
 @user_bp.get("/me")
 @jwt_required()
 def get_me():
+    try:
+        fields = requested_fields(user_schema)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
     me_id = int(get_jwt_identity())
-    user = UserService.get_user(me_id)
+    user = UserReadModel.get_user(me_id, fields)
     if not user:
         return jsonify({"error": "User not found"}), 404
-    return jsonify({"user": user_schema.dump(user)}), 200
+    return versioned({"user": sparse_schema(user_schema, fields).dump(user)}, user.version)
 
 @user_bp.get("/<int:user_id>")
 @jwt_required()
@@ -56,14 +72,20 @@ def get_user(user_id: int):
     if not (_is_self(user_id) or _current_role() == UserRole.admin.value):
         return jsonify({"error": "Forbidden"}), 403
 
-    user = UserService.get_user(user_id)
+    try:
+        fields = requested_fields(user_schema)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    user = UserReadModel.get_user(user_id, fields)
     if not user:
         return jsonify({"error": "User not found"}), 404
-    return jsonify({"user": user_schema.dump(user)}), 200
+    return versioned({"user": sparse_schema(user_schema, fields).dump(user)}, user.version)
 
 # ---------- UPDATE ----------
 @user_bp.put("/<int:user_id>")
 @jwt_required()
+@transactional
 def update_user(user_id: int):
     caller_role = _current_role()
 
@@ -75,6 +97,9 @@ def update_user(user_id: int):
     if not user:
         return jsonify({"error": "User not found"}), 404
 
+    if precondition_failed(user.version):
+        return stale_response()
+
     data = request.get_json() or {}
 
     # block self‑promotion
@@ -84,7 +109,9 @@ def update_user(user_id: int):
     try:
         patch = user_schema.load(data, partial=True)
         user = UserService.update_user(user, **patch)
-        return jsonify({"user": user_schema.dump(user)}), 200
+        return versioned({"user": user_schema.dump(user)}, user.version)
+    except StaleDataError:
+        return stale_response()
     except ValidationError as err:
         return jsonify({"errors": err.messages}), 400
     except ValueError as dup:
@@ -93,6 +120,7 @@ def update_user(user_id: int):
 # Change password
 @user_bp.post("/<int:user_id>/change-password")
 @jwt_required()
+@transactional
 def change_password(user_id: int):
     if not _is_self(user_id):
         return jsonify({"error": "Forbidden"}), 403
@@ -119,16 +147,21 @@ def change_password(user_id: int):
 @user_bp.delete("/<int:user_id>")
 @jwt_required()
 @role_required(UserRole.admin)
+@transactional
 def delete_user(user_id: int):
     user = UserService.get_user(user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
-    UserService.delete_user(user)
+    try:
+        UserService.delete_user(user)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 409
     return jsonify({}), 204
 
 @user_bp.post("/<int:user_id>/deactivate")
 @jwt_required()
 @role_required(UserRole.admin)
+@transactional
 def deactivate_user(user_id: int):
     user = UserService.get_user(user_id)
     if not user:
@@ -0,0 +1,40 @@
+# schemas/job_schema.py
+# Marshmallow schemas for background jobs: the status view admins poll, and the body that enqueues one.
+
+from marshmallow import Schema, fields, validate, EXCLUDE
+
+
+class JobSchema(Schema):
+    class Meta:
+        ordered = True
+
+    id               = fields.Int()
+    kind             = fields.Str()
+    status           = fields.Function(lambda obj: obj.status.value)
+    progress         = fields.Int()
+    attempts         = fields.Int()
+    max_attempts     = fields.Int()
+    cancel_requested = fields.Bool()
+    payload          = fields.Dict()
+    result           = fields.Raw(allow_none=True)
+    error            = fields.Str(allow_none=True)
+    created_by       = fields.Int(allow_none=True)
+    run_after        = fields.DateTime()
+    started_at       = fields.DateTime(allow_none=True)
+    finished_at      = fields.DateTime(allow_none=True)
+    created_at       = fields.DateTime()
+    updated_at       = fields.DateTime()
+
+
+# Body of POST /jobs; `kind` is checked against the registered handlers by the route
+class JobCreateSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+
+    kind         = fields.Str(required=True)
+    payload      = fields.Dict(load_default=dict)
+    max_attempts = fields.Int(load_default=3, validate=validate.Range(min=1, max=10))
+
+
+job_schema        = JobSchema()
+job_create_schema = JobCreateSchema()
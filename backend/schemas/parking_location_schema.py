@@ -15,6 +15,7 @@ class ParkingLocationSchema(SQLAlchemyAutoSchema):
 
     # ---------- READ ----------
     id = fields.Int(dump_only=True)
+    version = fields.Int(dump_only=True)
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
 
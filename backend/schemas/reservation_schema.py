@@ -2,7 +2,7 @@
 # It specifies how reservation data should be serialized and deserialized,
 # including validation rules for the fields.
 
-from marshmallow import fields, validate
+from marshmallow import Schema, fields, validate
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from models.reservation import Reservation, ReservationStatus
 
@@ -15,6 +15,7 @@ class ReservationSchema(SQLAlchemyAutoSchema):
 
     # ---------- READ ----------
     id         = fields.Integer(dump_only=True)
+    version    = fields.Integer(dump_only=True)
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
     status = fields.String(
@@ -28,6 +29,16 @@ class ReservationSchema(SQLAlchemyAutoSchema):
     slot_id  = fields.Integer(required=True)
     
     user_id  = fields.Integer(dump_only=True)
+    series_id = fields.Integer(dump_only=True, allow_none=True)
+    location_id = fields.Integer(dump_only=True)
+
+# Body of POST /reservations/auto: the server picks the slot
+class AutoReservationSchema(Schema):
+    location_id = fields.Integer(required=True)
+    start_ts    = fields.DateTime(required=True)
+    end_ts      = fields.DateTime(required=True)
+    policy      = fields.String(validate=validate.OneOf(["lowest_label", "least_used", "best_fit"]))
 
 reservation_schema  = ReservationSchema()
 reservations_schema = ReservationSchema(many=True)
+auto_reservation_schema = AutoReservationSchema()
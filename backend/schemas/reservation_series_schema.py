@@ -0,0 +1,71 @@
+# This file defines the schema for recurring reservation series using Marshmallow.
+# Weekdays travel as a list of ISO-style day numbers (0 = Monday … 6 = Sunday) and are stored as a bit mask.
+# Updates go through a narrower schema: slot and start date are fixed once the series exists.
+
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from marshmallow import ValidationError, fields, validate
+from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
+from models.reservation_series import ReservationSeries
+
+# Fields a series accepts after creation
+SERIES_EDITABLE = ("weekdays", "start_time", "duration_minutes", "timezone", "until")
+
+# How far ahead a series may start
+SERIES_MAX_LEAD_DAYS = 365
+
+def _weekday_mask(days) -> int:
+    if not isinstance(days, list) or not days:
+        raise ValidationError("Must be a non-empty list of weekdays (0 = Monday … 6 = Sunday)")
+    mask = 0
+    for d in days:
+        if not isinstance(d, int) or isinstance(d, bool) or not 0 <= d <= 6:
+            raise ValidationError("Weekdays must be integers between 0 and 6")
+        mask |= 1 << d
+    return mask
+
+def _validate_timezone(name: str) -> None:
+    try:
+        ZoneInfo(name)
+    except (KeyError, ValueError):
+        raise ValidationError("Unknown timezone")
+
+def _validate_starts_on(day: date) -> None:
+    if day > datetime.now(timezone.utc).date() + timedelta(days=SERIES_MAX_LEAD_DAYS):
+        raise ValidationError(f"Must be within {SERIES_MAX_LEAD_DAYS} days from today")
+
+class ReservationSeriesSchema(SQLAlchemyAutoSchema):
+    class Meta:
+        model = ReservationSeries
+        load_instance = False
+        include_fk = True
+        ordered = True
+
+    # ---------- READ ----------
+    id                 = fields.Integer(dump_only=True)
+    user_id            = fields.Integer(dump_only=True)
+    materialized_until = fields.Date(dump_only=True)
+    active             = fields.Boolean(dump_only=True)
+    created_at         = fields.DateTime(dump_only=True)
+    updated_at         = fields.DateTime(dump_only=True)
+
+    # ---------- WRITE ----------
+    slot_id          = fields.Integer(required=True)
+    weekdays         = fields.Function(
+        lambda s: [d for d in range(7) if s.weekdays >> d & 1],
+        deserialize=_weekday_mask,
+        required=True,
+    )
+    start_time       = fields.Time(required=True)
+    duration_minutes = fields.Integer(required=True, validate=validate.Range(min=1, max=24 * 60))
+    timezone         = fields.String(load_default="UTC", validate=_validate_timezone)
+    starts_on        = fields.Date(required=True, validate=_validate_starts_on)
+    until            = fields.Date(allow_none=True)
+
+# Anything outside SERIES_EDITABLE in an update body is rejected, not ignored
+class ReservationSeriesUpdateSchema(ReservationSeriesSchema):
+    error_messages = {"unknown": "Unknown field or cannot be changed after creation."}
+
+reservation_series_schema        = ReservationSeriesSchema()
+reservation_series_list_schema   = ReservationSeriesSchema(many=True)
+reservation_series_update_schema = ReservationSeriesUpdateSchema(only=SERIES_EDITABLE, partial=True)
@@ -12,6 +12,7 @@ class UserSchema(Schema):
 
     # ---------- READ ----------
     id         = fields.Int(dump_only=True)
+    version    = fields.Int(dump_only=True)
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
 
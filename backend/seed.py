@@ -11,6 +11,7 @@ from models.user import User, UserRole
 from models.parking_location import ParkingLocation
 from models.parking_slot import ParkingSlot
 from models.reservation import Reservation, ReservationStatus
+from utils.transaction import transaction
 
 # Config  (tweak for a bigger/smaller demo dataset)
 DRIVERS_PER_LOCATION = 4   # 4 × 13 locations = 52 drivers
@@ -138,12 +139,9 @@ def seed_reservations(drivers: list[User], slots: list[ParkingSlot]) -> None:
         )
 
 # ---------- MAIN ----------
-def seed() -> None:
-    app = create_app()
-    with app.app_context():
-        # Ensure schema exists
-        db.create_all()
-
+# Seeds the database of the current app context in one transaction
+def seed_all() -> None:
+    with transaction():
         # Seed core data
         ensure_admins()
         locations = ensure_locations()
@@ -153,6 +151,14 @@ def seed() -> None:
         # Seed reservations
         seed_reservations(drivers, slots)
 
+def seed() -> None:
+    app = create_app()
+    with app.app_context():
+        # Ensure schema exists
+        db.create_all()
+
+        seed_all()
+
         print("Database idempotently seeded")
 
 if __name__ == "__main__":
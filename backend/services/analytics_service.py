@@ -1,13 +1,15 @@
 # This file contains the AnalyticsService class which provides methods for generating various analytics reports related to parking reservations, slot availability, and active users.
 
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta, timezone
 from typing import List, Dict
-from sqlalchemy import func, cast, Date
+from sqlalchemy import func, select, union_all, Date
 from extensions import db
 from models.reservation import Reservation, ReservationStatus
+from models.reservation_archive import ReservationArchive
 from models.parking_location import ParkingLocation
 from models.parking_slot import ParkingSlot
 from models.user import User
+from services.reservation_archive_service import ReservationArchiveService
 
 
 class AnalyticsService:
@@ -17,12 +19,20 @@ class AnalyticsService:
         today = date.today()
         start = today - timedelta(days=days - 1)
 
+        # Older days may already have been moved to the archive table
+        starts = select(Reservation.start_ts).where(Reservation.start_ts >= start)
+        if ReservationArchiveService.reaches(datetime.combine(start, time.min, tzinfo=timezone.utc)):
+            starts = union_all(
+                starts,
+                select(ReservationArchive.start_ts).where(ReservationArchive.start_ts >= start),
+            )
+        starts = starts.subquery()
+
         rows = (
             db.session.query(
-                cast(Reservation.start_ts, Date).label("day"),
+                func.date(starts.c.start_ts, type_=Date).label("day"),
                 func.count().label("count"),
             )
-            .filter(Reservation.start_ts >= start)
             .group_by("day")
             .order_by("day")
             .all()
@@ -53,13 +63,12 @@ class AnalyticsService:
             .subquery()
         )
 
-        # Reserved slots per location (distinct slot IDs)
+        # Reserved slots per location (distinct slot IDs), straight from reservations.location_id
         sub_reserved = (
             db.session.query(
-                ParkingSlot.location_id.label("loc_id"),
+                Reservation.location_id.label("loc_id"),
                 func.count(func.distinct(Reservation.slot_id)).label("reserved"),
             )
-            .join(Reservation, Reservation.slot_id == ParkingSlot.id)
             .filter(
                 Reservation.status.in_(
                     [ReservationStatus.booked, ReservationStatus.ongoing]
@@ -67,7 +76,7 @@ class AnalyticsService:
                 Reservation.start_ts <= now,
                 Reservation.end_ts >= now,
             )
-            .group_by(ParkingSlot.location_id)
+            .group_by(Reservation.location_id)
             .subquery()
         )
 
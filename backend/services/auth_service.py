@@ -37,10 +37,9 @@ class AuthService:
         # Save to database
         db.session.add(user)
         try:
-            db.session.commit()
+            db.session.flush()
             return user
         except IntegrityError:
-            db.session.rollback()
             raise ValueError("Email already in use")
 
     @staticmethod
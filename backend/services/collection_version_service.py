@@ -0,0 +1,32 @@
+# This file defines the CollectionVersionService class, which tracks write-driven version counters per resource collection.
+# Writes bump the counter inside their own transaction; catalog GETs read it to build a strong ETag without running the main query.
+
+from typing import Optional
+from sqlalchemy import select, update
+from extensions import db
+from models.collection_version import CollectionVersion
+
+class CollectionVersionService:
+    LOCATIONS = "parking_locations"
+    SLOTS     = "parking_slots"
+
+    # ---------- READ ----------
+    @staticmethod
+    def get_version(name: str) -> int:
+        version: Optional[int] = db.session.execute(
+            select(CollectionVersion.version).where(CollectionVersion.name == name)
+        ).scalar()
+        return version or 0
+
+    # ---------- UPDATE ----------
+    # Does not commit: the caller's commit (or rollback) decides whether the bump sticks
+    @staticmethod
+    def bump(*names: str) -> None:
+        for name in names:
+            result = db.session.execute(
+                update(CollectionVersion)
+                .where(CollectionVersion.name == name)
+                .values(version=CollectionVersion.version + 1)
+            )
+            if result.rowcount == 0:
+                db.session.add(CollectionVersion(name=name, version=1))
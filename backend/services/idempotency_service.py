@@ -0,0 +1,164 @@
+# This file defines the IdempotencyService class, which stores the responses of mutating requests sent with an
+# Idempotency-Key header so retries are answered without running the request again.
+# The database table is the source of truth (shared by every worker, rows expire after a TTL); a small in-process
+# LRU with a short TTL in front of it absorbs the burst of retries a flaky client sends right after a timeout.
+# A key is claimed with a pending row (no response yet) before the request runs, so a duplicate that arrives
+# meanwhile sees the claim instead of running the request a second time.
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional, Tuple
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models.idempotency_key import IdempotencyKey
+from utils.transaction import transaction
+
+LRU_SIZE = 1024
+LRU_TTL  = 60     # seconds a response stays in the in-process cache
+PURGE_BATCH = 1000
+
+class StoredResponse(NamedTuple):
+    request_hash: str
+    status_code:  Optional[int]    # None while the request holding the key is still running
+    body:         Optional[str]
+
+    @property
+    def pending(self) -> bool:
+        return self.status_code is None
+
+class _LRU:
+    def __init__(self, size: int, ttl: float) -> None:
+        self._lock    = threading.Lock()
+        self._size    = size
+        self._ttl     = ttl
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[float, StoredResponse]]" = OrderedDict()
+
+    def get(self, k: Tuple[int, str]) -> Optional[StoredResponse]:
+        with self._lock:
+            entry = self._entries.get(k)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[k]
+                return None
+            self._entries.move_to_end(k)
+            return entry[1]
+
+    def put(self, k: Tuple[int, str], stored: StoredResponse) -> None:
+        with self._lock:
+            self._entries[k] = (time.monotonic() + self._ttl, stored)
+            self._entries.move_to_end(k)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+_cache = _LRU(LRU_SIZE, LRU_TTL)
+
+class IdempotencyService:
+    # ---------- READ ----------
+    @staticmethod
+    def lookup(user_id: int, key: str) -> Optional[StoredResponse]:
+        stored = _cache.get((user_id, key))
+        if stored:
+            return stored
+
+        row = db.session.execute(
+            select(IdempotencyKey.request_hash, IdempotencyKey.status_code, IdempotencyKey.response)
+            .where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.expires_at > datetime.now(timezone.utc),
+            )
+        ).first()
+        if not row:
+            return None
+        stored = StoredResponse(*row)
+        if not stored.pending:
+            _cache.put((user_id, key), stored)
+        return stored
+
+    # ---------- WRITE ----------
+    # Commits a pending row for the key before the request runs. Returns None once the key is ours, or the row
+    # of the request that holds it (pending or answered). A claim left by a crashed worker expires after `timeout`.
+    @staticmethod
+    def claim(user_id: int, key: str, request_hash: str, timeout: timedelta) -> Optional[StoredResponse]:
+        now = datetime.now(timezone.utc)
+        try:
+            with transaction():
+                db.session.execute(
+                    delete(IdempotencyKey).where(
+                        IdempotencyKey.user_id == user_id,
+                        IdempotencyKey.key == key,
+                        IdempotencyKey.expires_at <= now,
+                    )
+                )
+                db.session.add(IdempotencyKey(
+                    user_id=user_id,
+                    key=key,
+                    request_hash=request_hash,
+                    expires_at=now + timeout,
+                ))
+                db.session.flush()
+        except IntegrityError:
+            # A concurrent request claimed it first; if its row is already gone, ask for a retry
+            return IdempotencyService.lookup(user_id, key) or StoredResponse(request_hash, None, None)
+        return None
+
+    # Stores the response on our pending row. Does not commit: the response must land in the same transaction
+    # as the write it answers for. False when the claim expired meanwhile and the key is no longer ours.
+    @staticmethod
+    def complete(user_id: int, key: str, stored: StoredResponse, ttl: timedelta) -> bool:
+        return db.session.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.request_hash == stored.request_hash,
+                IdempotencyKey.status_code.is_(None),
+            )
+            .values(
+                status_code=stored.status_code,
+                response=stored.body,
+                expires_at=datetime.now(timezone.utc) + ttl,
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount == 1
+
+    # Drops our pending row after a failed attempt, so the client can retry with the same key
+    @staticmethod
+    def release(user_id: int, key: str, request_hash: str) -> None:
+        with transaction():
+            db.session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.request_hash == request_hash,
+                    IdempotencyKey.status_code.is_(None),
+                )
+            )
+
+    # Call once the transaction holding the key has committed
+    @staticmethod
+    def remember(user_id: int, key: str, stored: StoredResponse) -> None:
+        _cache.put((user_id, key), stored)
+
+    # ---------- PURGE ----------
+    # Deletes expired keys in small batches (scheduler job)
+    @staticmethod
+    def purge_expired() -> int:
+        purged = 0
+        while True:
+            with transaction():
+                expired = (
+                    select(IdempotencyKey.id)
+                    .where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+                    .limit(PURGE_BATCH)
+                )
+                count = db.session.execute(
+                    delete(IdempotencyKey).where(IdempotencyKey.id.in_(expired))
+                ).rowcount
+            purged += count
+            if count < PURGE_BATCH:
+                return purged
@@ -0,0 +1,239 @@
+# This file defines the JobService class, which runs the database-backed job queue for heavy admin work.
+# Routes enqueue jobs; worker processes claim them one at a time (FOR UPDATE SKIP LOCKED on Postgres, plus a
+# conditional status update so two workers can never both start the same job). Handlers report progress through
+# a JobContext, which also stops them at the next checkpoint once cancellation was requested. A failed job is
+# retried with exponential backoff until max_attempts; a job whose worker stopped heart-beating is re-queued.
+# Every write a worker makes to a job row is conditional on still holding it (locked_by + running), so a worker
+# that was presumed dead cannot overwrite the state of the retry that replaced it.
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import select, update
+from extensions import db
+from models.job import Job, JobStatus
+from utils.transaction import transaction
+
+log = logging.getLogger(__name__)
+
+Handler = Callable[["JobContext", Dict[str, Any]], Optional[Dict[str, Any]]]
+
+class JobCancelled(Exception):
+    pass
+
+# The job was re-queued (missed heartbeats) and no longer belongs to this worker
+class JobLost(Exception):
+    pass
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _owned(job_id: int, worker: str):
+    return (Job.id == job_id, Job.locked_by == worker, Job.status == JobStatus.running)
+
+class JobContext:
+    def __init__(self, job_id: int, worker: str) -> None:
+        self.job_id = job_id
+        self.worker = worker
+
+    # Records progress (done of total) and refreshes the heartbeat. Raises JobCancelled when an admin cancelled the
+    # job and JobLost when it was handed to another worker. Handlers call it between batches, well within
+    # JOB_STALE_AFTER_SECONDS; each call commits unless a transaction is already open.
+    def progress(self, done: int, total: int) -> None:
+        percent = min(100, int(done * 100 / total)) if total else 100
+        with transaction():
+            owned = db.session.execute(
+                update(Job)
+                .where(*_owned(self.job_id, self.worker))
+                .values(progress=percent, heartbeat_at=_now())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            cancelled = db.session.scalar(select(Job.cancel_requested).where(Job.id == self.job_id))
+        if not owned:
+            raise JobLost()
+        if cancelled:
+            raise JobCancelled()
+
+class JobService:
+    # ---------- CREATE ----------
+    @staticmethod
+    def enqueue(kind: str, payload: Optional[Dict] = None, created_by: Optional[int] = None,
+                max_attempts: int = 3) -> Job:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        job = Job(
+            kind=kind,
+            payload=payload or {},
+            status=JobStatus.queued,
+            max_attempts=max_attempts,
+            run_after=_now(),
+            created_by=created_by,
+        )
+        db.session.add(job)
+        db.session.flush()
+        return job
+
+    # ---------- READ ----------
+    @staticmethod
+    def get(job_id: int) -> Optional[Job]:
+        return db.session.get(Job, job_id)
+
+    # ---------- CANCEL ----------
+    # Queued jobs stop at once; running jobs stop at their next progress checkpoint. Both are conditional
+    # updates on the current status, so a worker claiming the job meanwhile turns the cancel into a stop request
+    # instead of having its running job overwritten.
+    @staticmethod
+    def cancel(job: Job) -> Job:
+        def set_if(current: JobStatus, **values) -> bool:
+            return db.session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == current)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            ).rowcount == 1
+
+        if not (
+            set_if(JobStatus.queued, status=JobStatus.cancelled, finished_at=_now())
+            or set_if(JobStatus.running, cancel_requested=True)
+        ):
+            raise ValueError("Only queued or running jobs can be cancelled")
+        db.session.refresh(job)
+        return job
+
+    # ---------- CLAIM ----------
+    # Marks the oldest due queued job as running for `worker` and returns its id (None when nothing is due)
+    @staticmethod
+    def claim(worker: str) -> Optional[int]:
+        now  = _now()
+        stmt = (
+            select(Job.id)
+            .where(Job.status == JobStatus.queued, Job.run_after <= now)
+            .order_by(Job.run_after, Job.id)
+            .limit(1)
+        )
+        if db.engine.dialect.name == "postgresql":
+            stmt = stmt.with_for_update(skip_locked=True)
+
+        with transaction():
+            job_id = db.session.scalar(stmt)
+            if job_id is None:
+                return None
+            claimed = db.session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JobStatus.queued)
+                .values(
+                    status=JobStatus.running,
+                    attempts=Job.attempts + 1,
+                    progress=0,
+                    locked_by=worker,
+                    started_at=now,
+                    heartbeat_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        return job_id if claimed else None
+
+    # ---------- FINISH ----------
+    # No-op when `worker` no longer holds the job
+    @staticmethod
+    def _finish(job_id: int, worker: str, **values) -> None:
+        with transaction():
+            db.session.execute(
+                update(Job)
+                .where(*_owned(job_id, worker))
+                .values(locked_by=None, finished_at=_now(), **values)
+                .execution_options(synchronize_session=False)
+            )
+
+    # Failed attempts are retried after backoff * 2^(attempt - 1) seconds until max_attempts is reached
+    @staticmethod
+    def _fail(job_id: int, worker: str, error: str, backoff_s: float) -> None:
+        with transaction():
+            job = db.session.scalar(select(Job).where(*_owned(job_id, worker)).with_for_update())
+            if job is None:
+                return
+            if job.cancel_requested:
+                job.status = JobStatus.cancelled
+            elif job.attempts < job.max_attempts:
+                job.status    = JobStatus.queued
+                job.run_after = _now() + timedelta(seconds=backoff_s * 2 ** (job.attempts - 1))
+            else:
+                job.status = JobStatus.failed
+            job.error     = error
+            job.locked_by = None
+            if job.status != JobStatus.queued:
+                job.finished_at = _now()
+
+    # ---------- RUN ----------
+    # Claims and runs one job; returns False when the queue had nothing due
+    @staticmethod
+    def run_next(worker: str, handlers: Dict[str, Handler], backoff_s: float = 30.0) -> bool:
+        job_id = JobService.claim(worker)
+        if job_id is None:
+            return False
+
+        job     = db.session.get(Job, job_id)
+        kind    = job.kind
+        payload = dict(job.payload or {})
+        handler = handlers.get(kind)
+        if handler is None:
+            JobService._finish(job_id, worker, status=JobStatus.failed, error=f"Unknown job kind '{kind}'")
+            return True
+
+        try:
+            result = handler(JobContext(job_id, worker), payload)
+        except JobCancelled:
+            JobService._finish(job_id, worker, status=JobStatus.cancelled)
+        except JobLost:
+            db.session.rollback()
+            log.warning("job %s (%s) was re-queued while %s ran it; dropping this run", job_id, kind, worker)
+        except ValueError as exc:
+            # Bad payloads fail the same way on every attempt, so they are not retried
+            db.session.rollback()
+            JobService._finish(job_id, worker, status=JobStatus.failed, error=str(exc))
+        except Exception as exc:
+            db.session.rollback()
+            log.exception("job %s (%s) failed", job_id, kind)
+            JobService._fail(job_id, worker, f"{type(exc).__name__}: {exc}", backoff_s)
+        else:
+            JobService._finish(job_id, worker, status=JobStatus.succeeded, progress=100, result=result, error=None)
+        return True
+
+    # ---------- RECOVERY ----------
+    # Running jobs without a heartbeat for `timeout_s` lost their worker; they go back to the queue
+    # (or fail once their attempts are used up)
+    @staticmethod
+    def requeue_stale(timeout_s: float) -> int:
+        cutoff = _now() - timedelta(seconds=timeout_s)
+        base   = update(Job).where(Job.status == JobStatus.running, Job.heartbeat_at < cutoff)
+        with transaction():
+            requeued = db.session.execute(
+                base.where(Job.attempts < Job.max_attempts)
+                .values(status=JobStatus.queued, run_after=_now(), locked_by=None)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            failed = db.session.execute(
+                base.values(status=JobStatus.failed, error="Worker stopped responding",
+                            locked_by=None, finished_at=_now())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        if requeued or failed:
+            log.warning("stale jobs: %d re-queued, %d failed", requeued, failed)
+        return requeued + failed
+
+    # ---------- WORKER ----------
+    # Runs jobs until the queue is empty (once=True) or forever, polling every `poll_s` seconds when idle
+    @staticmethod
+    def work(worker: str, handlers: Dict[str, Handler], poll_s: float, stale_after_s: float,
+             backoff_s: float, once: bool = False) -> int:
+        processed = 0
+        while True:
+            if JobService.run_next(worker, handlers, backoff_s):
+                processed += 1
+                continue
+            if once:
+                return processed
+            JobService.requeue_stale(stale_after_s)
+            db.session.remove()   # don't hold a pooled connection while idle
+            time.sleep(poll_s)
@@ -0,0 +1,98 @@
+# This file defines the LocationIndexService class, an in-memory spatial index over parking location coordinates.
+# Locations are bucketed into a fixed lat/lng grid; a radius query only scans the cells the radius can touch.
+# Each worker keeps its own copy and rebuilds it when the DB-backed location collection version changes.
+
+from __future__ import annotations
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import select
+from extensions import db
+from models.parking_location import ParkingLocation
+from services.collection_version_service import CollectionVersionService
+
+EARTH_RADIUS_KM = 6371.0088
+CELL_DEG        = 0.05   # ~5.5 km of latitude per cell
+
+class IndexedLocation(NamedTuple):
+    id:      int
+    name:    str
+    address: str
+    lat:     float
+    lng:     float
+
+class NearbyLocation(NamedTuple):
+    location:    IndexedLocation
+    distance_km: float
+
+# Great-circle distance between two coordinates
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp     = p2 - p1
+    dl     = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return math.floor(lat / CELL_DEG), math.floor(lng / CELL_DEG)
+
+class _GeoGrid:
+    def __init__(self, locations: List[IndexedLocation]) -> None:
+        self.cells: Dict[Tuple[int, int], List[IndexedLocation]] = defaultdict(list)
+        for loc in locations:
+            self.cells[_cell(loc.lat, loc.lng)].append(loc)
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[NearbyLocation]:
+        # Degrees spanned by the radius; longitude degrees shrink with latitude
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        dlng = min(math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)), 180.0)
+
+        lat_lo, lng_lo = _cell(lat - dlat, lng - dlng)
+        lat_hi, lng_hi = _cell(lat + dlat, lng + dlng)
+
+        hits: List[NearbyLocation] = []
+        for ci in range(lat_lo, lat_hi + 1):
+            for cj in range(lng_lo, lng_hi + 1):
+                for loc in self.cells.get((ci, cj), ()):
+                    dist = haversine_km(lat, lng, loc.lat, loc.lng)
+                    if dist <= radius_km:
+                        hits.append(NearbyLocation(loc, dist))
+
+        hits.sort(key=lambda h: h.distance_km)
+        return hits
+
+_lock    = threading.Lock()
+_grid:    Optional[_GeoGrid] = None
+_version: Optional[int]      = None
+
+class LocationIndexService:
+    # ---------- INDEX ----------
+    # Returns the current grid, rebuilding it if any location write happened since the last build
+    @staticmethod
+    def grid() -> _GeoGrid:
+        global _grid, _version
+        current = CollectionVersionService.get_version(CollectionVersionService.LOCATIONS)
+        if _grid is not None and _version == current:
+            return _grid
+
+        with _lock:
+            if _grid is None or _version != current:
+                rows = db.session.execute(
+                    select(
+                        ParkingLocation.id,
+                        ParkingLocation.name,
+                        ParkingLocation.address,
+                        ParkingLocation.lat,
+                        ParkingLocation.lng,
+                    )
+                ).all()
+                _grid    = _GeoGrid([IndexedLocation(*r) for r in rows])
+                _version = current
+            return _grid
+
+    # ---------- QUERY ----------
+    @staticmethod
+    def nearby(lat: float, lng: float, radius_km: float) -> List[NearbyLocation]:
+        return LocationIndexService.grid().within(lat, lng, radius_km)
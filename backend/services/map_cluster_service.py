@@ -0,0 +1,132 @@
+# This file defines the MapClusterService class, which serves clustered map markers for a bounding box and zoom level.
+# A multi-resolution grid (one level per zoom) is precomputed over location coordinates with per-cell totals, so a
+# viewport query only walks the cells it covers. The pyramid is rebuilt when the location collection version changes
+# (location and slot writes bump it) or when the free-slot availability snapshot expires.
+
+from __future__ import annotations
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import func, select
+from extensions import db
+from models.parking_location import ParkingLocation
+from models.parking_slot import ParkingSlot
+from read_models.parking_slot import ParkingSlotReadModel
+from services.collection_version_service import CollectionVersionService
+
+MAX_ZOOM         = 20
+CELLS_PER_TILE   = 4    # grid cells per web-map tile edge
+AVAILABILITY_TTL = 30   # seconds an availability snapshot stays valid
+
+class Cluster(NamedTuple):
+    lat:         float
+    lng:         float
+    count:       int
+    total_slots: int
+    free_slots:  int
+    location_id: Optional[int]   # set when the cluster is a single location
+
+class _Site(NamedTuple):
+    id:          int
+    lat:         float
+    lng:         float
+    total_slots: int
+
+# Cell edge in degrees for a zoom level (a tile spans 360 / 2^zoom degrees)
+def _cell_deg(zoom: int) -> float:
+    return 360.0 / (2 ** zoom) / CELLS_PER_TILE
+
+class _Pyramid:
+    def __init__(self, sites: List[_Site], free: Dict[int, int]) -> None:
+        # Per level: cell -> [count, sum_lat, sum_lng, total_slots, free_slots, location_id]
+        self.levels: List[Dict[Tuple[int, int], list]] = []
+        for zoom in range(MAX_ZOOM + 1):
+            size  = _cell_deg(zoom)
+            cells: Dict[Tuple[int, int], list] = {}
+            for s in sites:
+                key = (math.floor(s.lat / size), math.floor(s.lng / size))
+                agg = cells.get(key)
+                if agg is None:
+                    cells[key] = [1, s.lat, s.lng, s.total_slots, free.get(s.id, 0), s.id]
+                else:
+                    agg[0] += 1
+                    agg[1] += s.lat
+                    agg[2] += s.lng
+                    agg[3] += s.total_slots
+                    agg[4] += free.get(s.id, 0)
+                    agg[5] = None
+            self.levels.append(cells)
+
+    def query(self, south: float, west: float, north: float, east: float, zoom: int) -> List[Cluster]:
+        size  = _cell_deg(zoom)
+        cells = self.levels[zoom]
+        i0, j0 = math.floor(south / size), math.floor(west / size)
+        i1, j1 = math.floor(north / size), math.floor(east / size)
+
+        # Walk whichever is smaller: the viewport's cell range or the occupied cells
+        if (i1 - i0 + 1) * (j1 - j0 + 1) <= len(cells):
+            keys = (
+                (i, j)
+                for i in range(i0, i1 + 1)
+                for j in range(j0, j1 + 1)
+                if (i, j) in cells
+            )
+        else:
+            keys = (k for k in cells if i0 <= k[0] <= i1 and j0 <= k[1] <= j1)
+
+        clusters = []
+        for key in keys:
+            count, sum_lat, sum_lng, total, free, loc_id = cells[key]
+            clusters.append(Cluster(sum_lat / count, sum_lng / count, count, total, free, loc_id))
+        return clusters
+
+_lock          = threading.Lock()
+_pyramid:        Optional[_Pyramid] = None
+_version:        Optional[int]      = None
+_snapshot_time:  float              = 0.0
+
+def _build() -> _Pyramid:
+    slot_totals = (
+        select(ParkingSlot.location_id.label("loc_id"), func.count(ParkingSlot.id).label("total"))
+        .group_by(ParkingSlot.location_id)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(
+            ParkingLocation.id,
+            ParkingLocation.lat,
+            ParkingLocation.lng,
+            func.coalesce(slot_totals.c.total, 0),
+        )
+        .outerjoin(slot_totals, slot_totals.c.loc_id == ParkingLocation.id)
+    ).all()
+
+    # Availability snapshot: slots free right now, for every location in one query
+    now  = datetime.now(timezone.utc)
+    free = ParkingSlotReadModel.free_slot_counts(None, now, now)
+    return _Pyramid([_Site(*r) for r in rows], free)
+
+class MapClusterService:
+    # ---------- INDEX ----------
+    @staticmethod
+    def pyramid() -> _Pyramid:
+        global _pyramid, _version, _snapshot_time
+        current = CollectionVersionService.get_version(CollectionVersionService.LOCATIONS)
+        fresh   = time.monotonic() - _snapshot_time < AVAILABILITY_TTL
+        if _pyramid is not None and _version == current and fresh:
+            return _pyramid
+
+        with _lock:
+            fresh = time.monotonic() - _snapshot_time < AVAILABILITY_TTL
+            if _pyramid is None or _version != current or not fresh:
+                _pyramid       = _build()
+                _version       = current
+                _snapshot_time = time.monotonic()
+            return _pyramid
+
+    # ---------- QUERY ----------
+    @staticmethod
+    def clusters(south: float, west: float, north: float, east: float, zoom: int) -> List[Cluster]:
+        return MapClusterService.pyramid().query(south, west, north, east, zoom)
@@ -0,0 +1,156 @@
+# This file defines the OccupancyService class, which keeps a per-location occupancy bitmap:
+# one row per slot, one bit per fixed time bucket over a rolling horizon, packed into NumPy uint8 arrays.
+# Grid and "free for the whole window" queries become vectorized AND / any() over those rows.
+# Reservation writes mark the touched slot rows dirty through the slot event bus (LISTEN/NOTIFY on Postgres,
+# so every worker hears them); dirty rows are recomputed with one query on the next read.
+
+from __future__ import annotations
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+import numpy as np
+from sqlalchemy import select
+from extensions import db
+from models.parking_slot import ParkingSlot
+from models.reservation import Reservation, ReservationStatus
+from services.collection_version_service import CollectionVersionService
+from services.slot_event_service import SlotEventService
+
+BUCKET_MINUTES = 15
+HORIZON_DAYS   = 14
+REBUILD_AFTER  = 300   # seconds; full rebuild as a backstop for events missed while the listener reconnected
+
+BUCKET  = timedelta(minutes=BUCKET_MINUTES)
+BUCKETS = HORIZON_DAYS * 24 * 60 // BUCKET_MINUTES
+
+class OccupancyGrid(NamedTuple):
+    start_ts:    datetime
+    buckets:     int
+    slot_ids:    List[int]
+    busy:        List[str]    # per slot, one "0"/"1" character per bucket
+    free_counts: List[int]    # per bucket, number of free slots
+
+def _utc(ts: datetime) -> datetime:
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+class _Matrix:
+    def __init__(self, origin: datetime, slot_ids: List[int], version: int) -> None:
+        self.origin   = origin
+        self.version  = version
+        self.built_at = time.monotonic()
+        self.slot_ids = slot_ids
+        self.row_of   = {sid: i for i, sid in enumerate(slot_ids)}
+        self.bits     = np.zeros((len(slot_ids), (BUCKETS + 7) // 8), dtype=np.uint8)
+
+    # Bucket range [b0, b1) covering [start, end), clipped to the horizon (partially covered buckets count)
+    def span(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        b0 = int((_utc(start) - self.origin) // BUCKET)
+        b1 = -int(-(_utc(end) - self.origin) // BUCKET)
+        return max(b0, 0), min(b1, BUCKETS)
+
+    def mask(self, b0: int, b1: int) -> np.ndarray:
+        row = np.zeros(BUCKETS, dtype=bool)
+        row[b0:b1] = True
+        return np.packbits(row)
+
+    # Rewrites the rows of `slot_ids` from their (start, end) intervals
+    def fill(self, slot_ids: Iterable[int], intervals: Iterable[Tuple[int, datetime, datetime]]) -> None:
+        rows = {sid: np.zeros(BUCKETS, dtype=bool) for sid in slot_ids if sid in self.row_of}
+        for slot_id, start, end in intervals:
+            if slot_id in rows:
+                b0, b1 = self.span(start, end)
+                rows[slot_id][b0:b1] = True
+        for sid, row in rows.items():
+            self.bits[self.row_of[sid]] = np.packbits(row)
+
+_lock     = threading.Lock()
+_matrices: Dict[int, _Matrix] = {}
+_dirty:    Dict[int, Set[int]] = defaultdict(set)   # location_id -> slot ids changed since last read
+
+def _on_slot_event(payload: Dict) -> None:
+    with _lock:
+        _dirty[payload["location_id"]].add(payload["slot_id"])
+
+SlotEventService.add_listener(_on_slot_event)
+
+def _active_intervals(slot_ids: List[int], origin: datetime):
+    return db.session.execute(
+        select(Reservation.slot_id, Reservation.start_ts, Reservation.end_ts)
+        .where(
+            Reservation.slot_id.in_(slot_ids),
+            Reservation.status.in_(
+                [ReservationStatus.booked, ReservationStatus.ongoing]
+            ),
+            Reservation.start_ts < origin + BUCKET * BUCKETS,
+            Reservation.end_ts   > origin,
+        )
+    ).all()
+
+def _build(location_id: int, origin: datetime, version: int) -> _Matrix:
+    slot_ids = list(db.session.scalars(
+        select(ParkingSlot.id).where(ParkingSlot.location_id == location_id).order_by(ParkingSlot.id)
+    ))
+    matrix = _Matrix(origin, slot_ids, version)
+    if slot_ids:
+        matrix.fill(slot_ids, _active_intervals(slot_ids, origin))
+    return matrix
+
+class OccupancyService:
+    # ---------- INDEX ----------
+    # The horizon starts at today's UTC midnight and rolls over once per day
+    @staticmethod
+    def horizon() -> Tuple[datetime, datetime]:
+        origin = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        return origin, origin + BUCKET * BUCKETS
+
+    @staticmethod
+    def matrix(location_id: int) -> _Matrix:
+        SlotEventService.start_listener()
+        origin, _ = OccupancyService.horizon()
+        version   = CollectionVersionService.get_version(CollectionVersionService.SLOTS)
+
+        with _lock:
+            matrix = _matrices.get(location_id)
+            stale  = (
+                matrix is None
+                or matrix.origin != origin
+                or matrix.version != version
+                or time.monotonic() - matrix.built_at > REBUILD_AFTER
+            )
+            dirty = _dirty.pop(location_id, set())
+
+        if stale:
+            matrix = _build(location_id, origin, version)
+        elif dirty:
+            slot_ids = [sid for sid in dirty if sid in matrix.row_of]
+            if slot_ids:
+                matrix.fill(slot_ids, _active_intervals(slot_ids, origin))
+
+        with _lock:
+            _matrices[location_id] = matrix
+        return matrix
+
+    # ---------- QUERY ----------
+    # Slots with no booking in any bucket touched by [start_ts, end_ts)
+    @staticmethod
+    def free_slots(location_id: int, start_ts: datetime, end_ts: datetime) -> List[int]:
+        matrix = OccupancyService.matrix(location_id)
+        b0, b1 = matrix.span(start_ts, end_ts)
+        busy   = (matrix.bits & matrix.mask(b0, b1)).any(axis=1)
+        return [matrix.slot_ids[i] for i in np.flatnonzero(~busy)]
+
+    @staticmethod
+    def grid(location_id: int, start_ts: datetime, end_ts: datetime) -> OccupancyGrid:
+        matrix = OccupancyService.matrix(location_id)
+        b0, b1 = matrix.span(start_ts, end_ts)
+        cells  = np.unpackbits(matrix.bits, axis=1, count=BUCKETS)[:, b0:b1]
+
+        return OccupancyGrid(
+            start_ts=matrix.origin + BUCKET * b0,
+            buckets=b1 - b0,
+            slot_ids=matrix.slot_ids,
+            busy=[(row + ord("0")).tobytes().decode() for row in cells],
+            free_counts=(len(matrix.slot_ids) - cells.sum(axis=0, dtype=np.int64)).tolist(),
+        )
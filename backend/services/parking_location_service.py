@@ -8,6 +8,10 @@ from sqlalchemy.exc import IntegrityError, NoResultFound
 from extensions import db
 from models.parking_location import ParkingLocation
 from models.parking_slot import ParkingSlot
+from models.reservation import Reservation
+from services.collection_version_service import CollectionVersionService
+from services.reservation_change_service import ReservationChangeService
+from services.reservation_service import ReservationService
 
 class ParkingLocationService:
     # ---------- CREATE ----------
@@ -28,11 +32,11 @@ class ParkingLocationService:
 
         loc = ParkingLocation(**attrs)
         db.session.add(loc)
+        CollectionVersionService.bump(CollectionVersionService.LOCATIONS)
         try:
-            db.session.commit()
+            db.session.flush()
             return loc
         except IntegrityError as exc:
-            db.session.rollback()
             raise ValueError("location already exists") from exc
 
     # ---------- READ ----------
@@ -56,17 +60,26 @@ class ParkingLocationService:
     def update_location(loc: ParkingLocation, **patch) -> ParkingLocation:
         for field, value in patch.items():
             setattr(loc, field, value)
-        db.session.commit()
+        CollectionVersionService.bump(CollectionVersionService.LOCATIONS)
+        db.session.flush()
         return loc
 
     # ---------- DELETE ----------
     @staticmethod
     def delete_location(loc: ParkingLocation) -> None:
+        # Refuse while bookings are still live; one EXISTS probe on the location_id index
+        if ReservationService.has_active(Reservation.location_id == loc.id):
+            raise ValueError("Location has active reservations")
 
-        # TO DO: guard if active reservations exist.
-
+        # Slots and reservations are removed by ON DELETE CASCADE; leave tombstones for delta sync
+        ReservationChangeService.record_deleted(Reservation.location_id == loc.id)
         db.session.delete(loc)
-        db.session.commit()
+
+        CollectionVersionService.bump(
+            CollectionVersionService.LOCATIONS,
+            CollectionVersionService.SLOTS,
+        )
+        db.session.flush()
 
     # ---------- UTILITY ----------
     @staticmethod
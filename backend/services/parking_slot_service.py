@@ -4,12 +4,21 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import exists, and_
+from sqlalchemy import exists, update
 from sqlalchemy.exc import NoResultFound
 from extensions import db
 from models.parking_slot import ParkingSlot
-from models.reservation import Reservation
 from models.reservation import Reservation, ReservationStatus
+from services.collection_version_service import CollectionVersionService
+from services.reservation_change_service import ReservationChangeService
+from services.reservation_service import ReservationService
+
+# Slot writes also change the per-location slot counts in the location catalog
+def _bump_catalog() -> None:
+    CollectionVersionService.bump(
+        CollectionVersionService.SLOTS,
+        CollectionVersionService.LOCATIONS,
+    )
 
 class ParkingSlotService:
     # ---------- CREATE ----------
@@ -17,7 +26,8 @@ class ParkingSlotService:
     def create_slot(**slot_dict) -> ParkingSlot:
         slot = ParkingSlot(**slot_dict)
         db.session.add(slot)
-        db.session.commit()
+        _bump_catalog()
+        db.session.flush()
         return slot
 
     # ---------- READ ----------
@@ -52,18 +62,16 @@ class ParkingSlotService:
         end_ts: datetime,
     ) -> List[ParkingSlot]:
 
-        # conflicting reservations (booked OR ongoing only)
-        conflicting_q = (
-            db.session.query(Reservation.slot_id)
-            .filter(
-                Reservation.location_id == location_id,
-                Reservation.status.in_(
-                    [ReservationStatus.booked, ReservationStatus.ongoing]
-                ),
-                Reservation.start_ts < end_ts,
-                Reservation.end_ts   > start_ts,
-            )
-        ).subquery()
+        # conflicting reservations (booked OR ongoing only), found on the location index alone
+        conflicting = exists().where(
+            Reservation.location_id == location_id,
+            Reservation.slot_id == ParkingSlot.id,
+            Reservation.status.in_(
+                [ReservationStatus.booked, ReservationStatus.ongoing]
+            ),
+            Reservation.start_ts < end_ts,
+            Reservation.end_ts   > start_ts,
+        )
 
         # every slot not conflicting
         return (
@@ -71,7 +79,7 @@ class ParkingSlotService:
             .query(ParkingSlot)
             .filter(
                 ParkingSlot.location_id == location_id,
-                ~exists(conflicting_q.where(conflicting_q.c.slot_id == ParkingSlot.id)),
+                ~conflicting,
             )
             .order_by(ParkingSlot.id)
             .all()
@@ -80,13 +88,35 @@ class ParkingSlotService:
     # ---------- UPDATE ----------
     @staticmethod
     def update_slot(slot: ParkingSlot, **changes) -> ParkingSlot:
+        moved = "location_id" in changes and changes["location_id"] != slot.location_id
         for field, value in changes.items():
             setattr(slot, field, value)
-        db.session.commit()
+
+        # Postgres cascades the move through the (slot_id, location_id) foreign key; do it explicitly
+        # as well so databases without FK enforcement stay consistent
+        if moved:
+            db.session.flush()
+            rewritten = db.session.scalars(
+                update(Reservation)
+                .where(Reservation.slot_id == slot.id)
+                .values(location_id=slot.location_id, version=Reservation.version + 1)
+                .returning(Reservation)
+                .execution_options(synchronize_session="fetch")
+            ).all()
+            # Delta-sync clients must pick up the new location_id
+            ReservationChangeService.record(rewritten)
+        _bump_catalog()
+        db.session.flush()
         return slot
 
     # ---------- DELETE ----------
     @staticmethod
     def delete_slot(slot: ParkingSlot) -> None:
+        if ReservationService.has_active(Reservation.slot_id == slot.id):
+            raise ValueError("Slot has active reservations")
+
+        # Reservations are removed by ON DELETE CASCADE; leave tombstones for delta sync
+        ReservationChangeService.record_deleted(Reservation.slot_id == slot.id)
         db.session.delete(slot)
-        db.session.commit()
+        _bump_catalog()
+        db.session.flush()
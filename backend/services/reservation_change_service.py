@@ -0,0 +1,119 @@
+# This file defines the ReservationChangeService class, which maintains the reservation change log used for delta sync.
+# Writers record touched reservations inside their own transaction; readers fetch everything changed after a cursor.
+# Recording also publishes the live slot events streamed over SSE.
+# The cursor is a position that only ever grows in commit order: the change id on SQLite (writers are serialized),
+# the writer's transaction id on Postgres, returned only below the oldest transaction still in flight so a change
+# committed late can never land behind a cursor a client already holds. A page never splits one transaction.
+
+from typing import Iterable, List, NamedTuple, Optional
+from sqlalchemy import delete, func, insert, literal, null, select
+from extensions import db
+from models.reservation import Reservation, ReservationStatus
+from models.reservation_change import ReservationChange
+from read_models.reservation import ReservationReadModel, ReservationRow
+from services.slot_event_service import SlotEventService
+
+class ChangeSet(NamedTuple):
+    reservations: List[ReservationRow]
+    deleted:      List[int]
+    next_cursor:  int
+    has_more:     bool
+
+def _on_postgres() -> bool:
+    return db.engine.dialect.name == "postgresql"
+
+# Column clients page by, and the txid value writers stamp (NULL where ids already follow commit order)
+def _position():
+    return ReservationChange.txid if _on_postgres() else ReservationChange.id
+
+def _txid():
+    return func.txid_current() if _on_postgres() else null()
+
+class ReservationChangeService:
+    # ---------- WRITE ----------
+    # Does not commit; reservations must already have ids (flush new ones first). Rows returned by an
+    # UPDATE ... RETURNING id, user_id, slot_id, status, start_ts, end_ts work as well.
+    @staticmethod
+    def record(reservations: Iterable[Reservation], deleted: bool = False) -> None:
+        reservations = list(reservations)
+        rows = {r.id: r.user_id for r in reservations}
+        if not rows:
+            return
+
+        # Re-insert so each reservation moves to the head of the sequence
+        db.session.execute(
+            delete(ReservationChange).where(ReservationChange.reservation_id.in_(rows))
+        )
+        db.session.execute(
+            insert(ReservationChange).values(txid=_txid()),
+            [
+                {"reservation_id": res_id, "user_id": user_id, "deleted": deleted}
+                for res_id, user_id in rows.items()
+            ],
+        )
+        SlotEventService.publish(reservations, status="deleted" if deleted else None)
+
+    # Tombstones for every reservation matching `criteria`, written with one INSERT ... SELECT before a bulk or
+    # cascading delete removes them. Only booked / ongoing ones are loaded, to publish their slot events.
+    @staticmethod
+    def record_deleted(*criteria) -> None:
+        matching = select(Reservation.id).where(*criteria)
+        db.session.execute(
+            delete(ReservationChange).where(ReservationChange.reservation_id.in_(matching))
+        )
+        db.session.execute(
+            insert(ReservationChange).from_select(
+                ["reservation_id", "user_id", "deleted", "txid"],
+                select(Reservation.id, Reservation.user_id, literal(True), _txid())
+                .where(*criteria).order_by(Reservation.id),
+            )
+        )
+        active = db.session.scalars(
+            select(Reservation).where(
+                *criteria,
+                Reservation.status.in_([ReservationStatus.booked, ReservationStatus.ongoing]),
+            )
+        ).all()
+        SlotEventService.publish(active, status="deleted")
+
+    # ---------- READ ----------
+    @staticmethod
+    def changes_since(
+        cursor: int,
+        user_id: Optional[int] = None,
+        limit: int = 500,
+    ) -> ChangeSet:
+        position = _position()
+        stmt = (
+            select(
+                position.label("position"),
+                ReservationChange.reservation_id,
+                ReservationChange.deleted,
+            )
+            .where(position > cursor)
+            .order_by(position, ReservationChange.id)
+        )
+        if user_id is not None:
+            stmt = stmt.where(ReservationChange.user_id == user_id)
+        if _on_postgres():
+            # Transactions from the snapshot's xmin on may still commit changes; leave them for the next poll
+            stmt = stmt.where(position < select(func.txid_snapshot_xmin(func.txid_current_snapshot())).scalar_subquery())
+
+        changes  = db.session.execute(stmt.limit(limit + 1)).all()
+        has_more = len(changes) > limit
+        if has_more:
+            boundary = changes[limit].position
+            changes  = [c for c in changes[:limit] if c.position != boundary]
+            if not changes:
+                # One transaction larger than a page is returned whole
+                changes = db.session.execute(stmt.where(position == boundary)).all()
+
+        deleted = [c.reservation_id for c in changes if c.deleted]
+        live    = [c.reservation_id for c in changes if not c.deleted]
+
+        return ChangeSet(
+            reservations=ReservationReadModel.list_by_ids(live) if live else [],
+            deleted=deleted,
+            next_cursor=changes[-1].position if changes else cursor,
+            has_more=has_more,
+        )
@@ -0,0 +1,133 @@
+# This file defines the ReservationPartitionService class, which manages the monthly range partitions of the
+# reservations table on Postgres (partitioned by start_ts, see migration c5e2a7b9d014).
+# Future months are created ahead of time; months past the retention window are detached so hot queries
+# and indexes only cover recent data. Rows that landed in the default partition are moved into a new month
+# partition before it is attached. A month is copied into reservations_archive (and tombstoned in the change log)
+# in the same transaction that detaches it, so history reads keep seeing it. Maintenance runs in one process at a
+# time. On other databases (SQLite/tests) the table is plain and this is a no-op.
+
+import logging
+from datetime import date, datetime, time, timezone
+from typing import List, Tuple
+from sqlalchemy import text
+from extensions import db
+from models.reservation import Reservation
+from services.reservation_archive_service import ARCHIVE_COLUMNS
+from services.reservation_change_service import ReservationChangeService
+from utils.advisory_lock import try_advisory_lock
+from utils.transaction import transaction
+
+log = logging.getLogger(__name__)
+
+PARENT  = "reservations"
+DEFAULT = "reservations_default"
+
+def _add_months(d: date, months: int) -> date:
+    y, m = divmod(d.month - 1 + months, 12)
+    return date(d.year + y, m + 1, 1)
+
+def _partition_name(month: date) -> str:
+    return f"reservations_y{month.year:04d}m{month.month:02d}"
+
+# Partition bounds, pinned to UTC so they don't depend on the session time zone
+def _bounds(month: date) -> Tuple[str, str]:
+    return f"{month.isoformat()} 00:00:00+00", f"{_add_months(month, 1).isoformat()} 00:00:00+00"
+
+class ReservationPartitionService:
+    # ---------- HELPER ----------
+    @staticmethod
+    def is_partitioned() -> bool:
+        if db.engine.dialect.name != "postgresql":
+            return False
+        return bool(db.session.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :parent)"
+        ), {"parent": PARENT}))
+
+    # Month partitions currently attached, as (name, first day of month), oldest first
+    @staticmethod
+    def partitions() -> List[Tuple[str, date]]:
+        rows = db.session.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent AND c.relname <> :default"
+        ), {"parent": PARENT, "default": DEFAULT}).scalars()
+
+        months = []
+        for name in rows:
+            try:
+                months.append((name, date(int(name[-7:-3]), int(name[-2:]), 1)))
+            except ValueError:
+                continue  # not one of ours
+        return sorted(months, key=lambda p: p[1])
+
+    # ---------- CREATE ----------
+    # Creates (and attaches) the partition for `month`, moving any rows the default partition holds for it
+    @staticmethod
+    def create_partition(month: date) -> None:
+        name   = _partition_name(month)
+        lo, hi = _bounds(month)
+
+        db.session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        db.session.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT} WHERE start_ts >= :lo AND start_ts < :hi RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ), {"lo": lo, "hi": hi})
+        db.session.execute(text(
+            f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ('{lo}') TO ('{hi}')"
+        ))
+
+    @staticmethod
+    def ensure_future(months_ahead: int) -> List[str]:
+        existing = {m for _, m in ReservationPartitionService.partitions()}
+        current  = datetime.now(timezone.utc).date().replace(day=1)
+
+        created = []
+        for offset in range(months_ahead + 1):
+            month = _add_months(current, offset)
+            if month not in existing:
+                with transaction():
+                    ReservationPartitionService.create_partition(month)
+                created.append(_partition_name(month))
+        return created
+
+    # ---------- DETACH ----------
+    # The month's rows move to reservations_archive first; the detached table stays behind as a standalone copy
+    @staticmethod
+    def detach_older_than(retention_months: int) -> List[str]:
+        cutoff  = _add_months(datetime.now(timezone.utc).date().replace(day=1), -retention_months)
+        columns = ", ".join(ARCHIVE_COLUMNS)
+
+        detached = []
+        for name, month in ReservationPartitionService.partitions():
+            if _add_months(month, 1) > cutoff:
+                break
+            with transaction():
+                db.session.execute(text(
+                    f"INSERT INTO reservations_archive ({columns}) SELECT {columns} FROM {name} "
+                    f"ON CONFLICT (id) DO NOTHING"
+                ))
+                first = datetime.combine(month, time(), tzinfo=timezone.utc)
+                last  = datetime.combine(_add_months(month, 1), time(), tzinfo=timezone.utc)
+                ReservationChangeService.record_deleted(Reservation.start_ts >= first, Reservation.start_ts < last)
+                db.session.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+            detached.append(name)
+        return detached
+
+    # ---------- MAINTENANCE ----------
+    # Every worker's scheduler calls this; only the one holding the advisory lock does the work
+    @staticmethod
+    def maintain(months_ahead: int, retention_months: int) -> None:
+        if not ReservationPartitionService.is_partitioned():
+            return
+
+        with try_advisory_lock("reservation_partition_maintenance") as acquired:
+            if not acquired:
+                return
+            created  = ReservationPartitionService.ensure_future(months_ahead)
+            detached = ReservationPartitionService.detach_older_than(retention_months) if retention_months else []
+        if created or detached:
+            log.info("reservation partitions: created %s, detached %s", created, detached)
@@ -0,0 +1,265 @@
+# This file defines the ReservationSeriesService class, which manages recurring (weekly) reservations.
+# A series only materializes its occurrences as reservations up to a rolling horizon; a scheduler job keeps
+# extending it. Conflicts for a whole run of occurrences are found in one merge pass over the slot's sorted
+# busy intervals. Editing or cancelling a series only touches occurrences that have not started yet.
+
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Set, Tuple
+from zoneinfo import ZoneInfo
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.exc import NoResultFound
+from extensions import db
+from models.parking_slot import ParkingSlot
+from models.reservation import Reservation, ReservationStatus
+from models.reservation_series import ReservationSeries
+from services.reservation_change_service import ReservationChangeService
+from services.reservation_service import ReservationService
+from services.slot_lock_service import SlotLockService
+from utils.transaction import transaction
+
+HORIZON_DAYS = 28   # occurrences are materialized this many days ahead
+
+Interval = Tuple[datetime, datetime]
+
+# Occurrence windows (UTC, sorted) of a series for the dates first..last inclusive
+def _occurrences(series: ReservationSeries, first: date, last: date) -> List[Interval]:
+    first = max(first, series.starts_on)
+    if series.until:
+        last = min(last, series.until)
+
+    tz       = ZoneInfo(series.timezone)
+    duration = timedelta(minutes=series.duration_minutes)
+    windows: List[Interval] = []
+    day = first
+    while day <= last:
+        if series.weekdays >> day.weekday() & 1:
+            start = datetime.combine(day, series.start_time, tzinfo=tz).astimezone(timezone.utc)
+            windows.append((start, start + duration))
+        day += timedelta(days=1)
+    return windows
+
+# Indices of occurrences overlapping a busy interval. Both inputs are sorted by start and busy intervals
+# never overlap each other, so one forward pass over each list is enough.
+def _conflicts(occurrences: Sequence[Interval], busy: Sequence[Interval]) -> List[int]:
+    hits: List[int] = []
+    j = 0
+    for i, (start, end) in enumerate(occurrences):
+        while j < len(busy) and busy[j][1] <= start:
+            j += 1
+        if j < len(busy) and busy[j][0] < end:
+            hits.append(i)
+    return hits
+
+# Booked / ongoing intervals on the slot within [lo, hi), sorted by start
+def _busy(slot_id: int, lo: datetime, hi: datetime) -> List[Interval]:
+    rows = db.session.execute(
+        select(Reservation.start_ts, Reservation.end_ts)
+        .where(
+            Reservation.slot_id == slot_id,
+            Reservation.status.in_(
+                [ReservationStatus.booked, ReservationStatus.ongoing]
+            ),
+            Reservation.start_ts < hi,
+            Reservation.end_ts   > lo,
+        )
+        .order_by(Reservation.start_ts)
+    ).all()
+    # SQLite hands back naive datetimes
+    return [
+        (s if s.tzinfo else s.replace(tzinfo=timezone.utc), e if e.tzinfo else e.replace(tzinfo=timezone.utc))
+        for s, e in rows
+    ]
+
+# Local dates (in the series' timezone) within [lo, hi) that already hold an occurrence of the series, whatever
+# its status: a day whose occurrence the user cancelled must not be booked again by a re-plan
+def _occupied_days(series: ReservationSeries, lo: datetime, hi: datetime) -> Set[date]:
+    tz     = ZoneInfo(series.timezone)
+    starts = db.session.scalars(
+        select(Reservation.start_ts).where(
+            Reservation.series_id == series.id,
+            # a day of slack each side: the existing occurrences may sit at another time of day
+            Reservation.start_ts >= lo - timedelta(days=1),
+            Reservation.start_ts <  hi + timedelta(days=1),
+        )
+    ).all()
+    return {(s if s.tzinfo else s.replace(tzinfo=timezone.utc)).astimezone(tz).date() for s in starts}
+
+class ReservationSeriesService:
+
+    # ---------- HELPER ----------
+
+    # Books the series' occurrences from the day after `materialized_until` through `through`.
+    # strict=True raises on any conflict; otherwise conflicting occurrences are skipped. Does not commit.
+    @staticmethod
+    def materialize(series: ReservationSeries, through: date, strict: bool) -> List[Reservation]:
+        now   = datetime.now(timezone.utc)
+        first = series.materialized_until + timedelta(days=1) if series.materialized_until else series.starts_on
+        # Days before yesterday only hold past occurrences (in any timezone); never walk them
+        first = max(first, now.date() - timedelta(days=1))
+        windows = [w for w in _occurrences(series, first, through) if w[0] > now]
+        series.materialized_until = max(through, series.materialized_until or through)
+        if windows:
+            tz       = ZoneInfo(series.timezone)
+            occupied = _occupied_days(series, windows[0][0], windows[-1][1])
+            windows  = [w for w in windows if w[0].astimezone(tz).date() not in occupied]
+        if not windows:
+            return []
+
+        SlotLockService.lock([series.slot_id])
+        clashes = set(_conflicts(windows, _busy(series.slot_id, windows[0][0], windows[-1][1])))
+        if clashes and strict:
+            days = ", ".join(sorted({windows[i][0].date().isoformat() for i in clashes}))
+            raise ValueError(f"Slot already booked on {days}")
+
+        location_id = series.slot.location_id
+        rows = [
+            {
+                "user_id":   series.user_id,
+                "slot_id":   series.slot_id,
+                "location_id": location_id,
+                "series_id": series.id,
+                "start_ts":  start,
+                "end_ts":    end,
+            }
+            for i, (start, end) in enumerate(windows)
+            if i not in clashes
+        ]
+        if not rows:
+            return []
+
+        created = db.session.scalars(
+            insert(Reservation).returning(Reservation, sort_by_parameter_order=True), rows
+        ).all()
+        ReservationChangeService.record(created)
+        return created
+
+    # Occurrences of the series that have not started yet and are still booked
+    @staticmethod
+    def upcoming(series: ReservationSeries) -> List[Reservation]:
+        return (
+            Reservation.query
+            .filter(
+                Reservation.series_id == series.id,
+                Reservation.status == ReservationStatus.booked,
+                Reservation.start_ts > datetime.now(timezone.utc),
+            )
+            .order_by(Reservation.start_ts)
+            .all()
+        )
+
+    @staticmethod
+    def _horizon() -> date:
+        return datetime.now(timezone.utc).date() + timedelta(days=HORIZON_DAYS)
+
+    @staticmethod
+    def _validate(series: ReservationSeries) -> None:
+        if not series.weekdays:
+            raise ValueError("At least one weekday is required")
+        if not 0 < series.duration_minutes <= 24 * 60:
+            raise ValueError("Duration must be between 1 minute and 24 hours")
+        if series.until and series.until < series.starts_on:
+            raise ValueError("until must not be before starts_on")
+
+    # ---------- CREATE ----------
+    @staticmethod
+    def create(user_id: int, **data) -> Tuple[ReservationSeries, List[Reservation]]:
+        if not db.session.get(ParkingSlot, data["slot_id"]):
+            raise ValueError("Slot not found")
+
+        # Make sure previous reservations are up‑to‑date
+        ReservationService.refresh_slot_statuses(data["slot_id"])
+
+        series = ReservationSeries(user_id=user_id, **data)
+        ReservationSeriesService._validate(series)
+        db.session.add(series)
+        db.session.flush()
+
+        created = ReservationSeriesService.materialize(series, ReservationSeriesService._horizon(), strict=True)
+        db.session.flush()
+        return series, created
+
+    # ---------- READ ----------
+    @staticmethod
+    def get(series_id: int) -> ReservationSeries:
+        series = db.session.get(ReservationSeries, series_id)
+        if not series:
+            raise NoResultFound("Reservation series not found")
+        return series
+
+    @staticmethod
+    def list_all(user_id: Optional[int] = None) -> List[ReservationSeries]:
+        query = ReservationSeries.query.order_by(ReservationSeries.id)
+        if user_id is not None:
+            query = query.filter_by(user_id=user_id)
+        return query.all()
+
+    # ---------- UPDATE ----------
+    # Re-plans the series from now on: future booked occurrences are replaced, past and running ones stay,
+    # and days whose occurrence was cancelled on its own stay cancelled
+    @staticmethod
+    def update(series: ReservationSeries, **changes) -> ReservationSeries:
+        if not series.active:
+            raise ValueError("Series is cancelled")
+
+        ReservationService.refresh_slot_statuses(series.slot_id)
+        SlotLockService.lock([series.slot_id])
+
+        future = ReservationSeriesService.upcoming(series)
+        ReservationChangeService.record(future, deleted=True)
+        for res in future:
+            db.session.delete(res)
+        db.session.flush()
+
+        for k, v in changes.items():
+            setattr(series, k, v)
+
+        ReservationSeriesService._validate(series)
+        # Yesterday covers timezones ahead of UTC; anything already started is filtered out
+        series.materialized_until = datetime.now(timezone.utc).date() - timedelta(days=2)
+        ReservationSeriesService.materialize(series, ReservationSeriesService._horizon(), strict=True)
+        db.session.flush()
+        return series
+
+    # ---------- CANCEL ----------
+    @staticmethod
+    def cancel(series: ReservationSeries) -> ReservationSeries:
+        if not series.active:
+            raise ValueError("Series is already cancelled")
+
+        future = ReservationSeriesService.upcoming(series)
+        for res in future:
+            res.status = ReservationStatus.cancelled
+        series.active = False
+        ReservationChangeService.record(future)
+        db.session.flush()
+        return series
+
+    # ---------- EXTEND ----------
+    # Rolls every active series forward to the horizon (scheduler job). Occurrences that collide with
+    # bookings made since the series was created are skipped rather than failing the series.
+    @staticmethod
+    def extend_all() -> int:
+        horizon = ReservationSeriesService._horizon()
+        series_ids = db.session.scalars(
+            select(ReservationSeries.id).where(
+                ReservationSeries.active.is_(True),
+                or_(
+                    ReservationSeries.materialized_until.is_(None),
+                    and_(
+                        ReservationSeries.materialized_until < horizon,
+                        or_(
+                            ReservationSeries.until.is_(None),
+                            ReservationSeries.until > ReservationSeries.materialized_until,
+                        ),
+                    ),
+                ),
+            )
+        ).all()
+
+        # One transaction per series, so a failure only loses that series' run
+        booked = 0
+        for series_id in series_ids:
+            with transaction():
+                series = db.session.get(ReservationSeries, series_id)
+                booked += len(ReservationSeriesService.materialize(series, horizon, strict=False))
+        return booked
@@ -1,14 +1,79 @@
 # This file defines the ReservationService class, which provides methods for managing reservations.
 # It includes methods for creating, reading, updating, and deleting reservations.
 
+from bisect import bisect_left, insort
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import List
+from typing import Dict, Iterable, List, NamedTuple, Optional
 from extensions import db
 from models.reservation import Reservation, ReservationStatus
+from models.parking_location import ParkingLocation
 from models.parking_slot import ParkingSlot
+from services.reservation_change_service import ReservationChangeService
+from services.slot_event_service import SlotEventService
+from services.slot_lock_service import SlotLockService
+from sqlalchemy import exists, func, insert, select, update
 from sqlalchemy.orm import load_only
 from sqlalchemy.exc import NoResultFound
 
+# SQLite hands back naive datetimes; compare everything as aware UTC
+def _utc(ts: datetime) -> datetime:
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+# Slot picking policies for auto-assigned bookings
+AUTO_ASSIGN_POLICIES = ("lowest_label", "least_used", "best_fit")
+AUTO_ASSIGN_ATTEMPTS = 5
+
+class SlotUnavailableError(ValueError):
+    pass
+
+# Booked / ongoing reservations on the outer query's slot overlapping [start_ts, end_ts)
+def _blocking(start_ts: datetime, end_ts: datetime):
+    return exists().where(
+        Reservation.slot_id == ParkingSlot.id,
+        Reservation.status.in_(
+            [ReservationStatus.booked, ReservationStatus.ongoing]
+        ),
+        Reservation.start_ts < end_ts,
+        Reservation.end_ts   > start_ts,
+    )
+
+# ORDER BY clauses for each picking policy (slot id breaks ties so the pick is deterministic)
+def _policy_order(policy: str, start_ts: datetime, end_ts: datetime) -> list:
+    if policy == "least_used":
+        uses = (
+            select(func.count(Reservation.id))
+            .where(
+                Reservation.slot_id == ParkingSlot.id,
+                Reservation.status != ReservationStatus.cancelled,
+            )
+            .scalar_subquery()
+        )
+        return [uses.asc(), ParkingSlot.id]
+
+    if policy == "best_fit":
+        # Prefer the slot whose neighbouring bookings end closest before / start closest after the window,
+        # so free time is packed together instead of being cut into unusable gaps
+        active   = Reservation.status.in_([ReservationStatus.booked, ReservationStatus.ongoing])
+        prev_end = (
+            select(func.max(Reservation.end_ts))
+            .where(Reservation.slot_id == ParkingSlot.id, active, Reservation.end_ts <= start_ts)
+            .scalar_subquery()
+        )
+        next_start = (
+            select(func.min(Reservation.start_ts))
+            .where(Reservation.slot_id == ParkingSlot.id, active, Reservation.start_ts >= end_ts)
+            .scalar_subquery()
+        )
+        return [prev_end.desc().nulls_last(), next_start.asc().nulls_last(), ParkingSlot.id]
+
+    return [ParkingSlot.slot_label, ParkingSlot.id]
+
+class BatchItemResult(NamedTuple):
+    index:       int
+    reservation: Optional[Reservation]
+    error:       Optional[str]
+
 class ReservationService:
 
     # ---------- HELPER ----------
@@ -16,34 +81,55 @@ class ReservationService:
     # Update slot status when called (same functionality with .utls.status_scheduler.py)
     @staticmethod
     def refresh_slot_statuses(slot_id: int) -> None:
-        now = datetime.now(timezone.utc)
+        ReservationService.refresh_statuses_for_slots([slot_id])
 
-        booked   = (
-            Reservation.query
-            .filter(
-                Reservation.slot_id == slot_id,
-                Reservation.status == ReservationStatus.booked,
-                Reservation.start_ts <= now,
-            )
-            .all()
-        )
-        finished = (
-            Reservation.query
-            .filter(
-                Reservation.slot_id == slot_id,
-                Reservation.status == ReservationStatus.ongoing,
-                Reservation.end_ts <= now,
-            )
-            .all()
+    # Same as above for several slots at once (two UPDATE statements regardless of slot count)
+    @staticmethod
+    def refresh_statuses_for_slots(slot_ids: Iterable[int]) -> None:
+        ReservationService.advance_statuses(Reservation.slot_id.in_(set(slot_ids)))
+
+    # Moves due reservations matching `criteria` from booked to ongoing and from ongoing to finished.
+    # Each step is one UPDATE ... WHERE status = <old> RETURNING, so every booking path and every worker's
+    # scheduler can run it on the same rows at once: a row another transaction already moved simply no longer
+    # matches, instead of failing a version check. Returns the number of reservations moved.
+    @staticmethod
+    def advance_statuses(*criteria) -> int:
+        now   = datetime.now(timezone.utc)
+        steps = (
+            (ReservationStatus.booked,  ReservationStatus.ongoing,  Reservation.start_ts <= now),
+            (ReservationStatus.ongoing, ReservationStatus.finished, Reservation.end_ts   <= now),
         )
+        moved = {}
+        for old, new, due in steps:
+            rows = db.session.execute(
+                update(Reservation)
+                .where(*criteria, Reservation.status == old, due)
+                .values(status=new, version=Reservation.version + 1)
+                .returning(
+                    Reservation.id, Reservation.user_id, Reservation.slot_id,
+                    Reservation.status, Reservation.start_ts, Reservation.end_ts,
+                )
+                .execution_options(synchronize_session="fetch")
+            ).all()
+            moved.update((r.id, r) for r in rows)
 
-        for r in booked:
-            r.status = ReservationStatus.ongoing
-        for r in finished:
-            r.status = ReservationStatus.finished
+        ReservationChangeService.record(moved.values())
+        return len(moved)
 
-        if booked or finished:
-            db.session.commit()
+    # Whether any booked / ongoing reservation that has not ended yet matches `criteria` (one EXISTS query)
+    @staticmethod
+    def has_active(*criteria) -> bool:
+        return bool(db.session.scalar(
+            select(
+                exists().where(
+                    *criteria,
+                    Reservation.status.in_(
+                        [ReservationStatus.booked, ReservationStatus.ongoing]
+                    ),
+                    Reservation.end_ts > datetime.now(timezone.utc),
+                )
+            )
+        ))
 
     # ---------- CREATE ----------
     @staticmethod
@@ -51,16 +137,20 @@ class ReservationService:
         # Slot must exist and be free
         slot = (
             ParkingSlot.query
-            .options(load_only(ParkingSlot.id))
+            .options(load_only(ParkingSlot.id, ParkingSlot.location_id))
             .filter_by(id=data["slot_id"])
             .first()
         )
         if not slot:
             raise ValueError("Slot not found")
+        location_id = slot.location_id
 
         # Make sure previous reservations are up‑to‑date
         ReservationService.refresh_slot_statuses(data["slot_id"])
 
+        # Hold the slot until commit so a concurrent booking can't slip in between check and insert
+        SlotLockService.lock([data["slot_id"]])
+
         # No overlap with existing booked / ongoing
         overlap = (
             Reservation.query
@@ -78,11 +168,172 @@ class ReservationService:
             raise ValueError("Slot already booked for this time")
 
         # Write to DB
-        res = Reservation(**data)
+        res = Reservation(**data, location_id=location_id)
         db.session.add(res)
-        db.session.commit()
+        db.session.flush()
+        ReservationChangeService.record([res])
         return res
 
+    # ---------- CREATE (BATCH) ----------
+    # Books many reservations with one slot lookup, one overlap query and one multi-row INSERT.
+    # atomic=True inserts nothing if any item fails; otherwise the valid items are booked.
+    @staticmethod
+    def create_batch(user_id: int, items: List[Dict], atomic: bool = True) -> List[BatchItemResult]:
+        errors: Dict[int, str] = {}
+
+        for i, item in enumerate(items):
+            if item["start_ts"] >= item["end_ts"]:
+                errors[i] = "Start time must be before end time"
+
+        # Slots must exist
+        slot_ids = {item["slot_id"] for item in items}
+        existing = dict(db.session.execute(
+            select(ParkingSlot.id, ParkingSlot.location_id).where(ParkingSlot.id.in_(slot_ids))
+        ).all())
+        for i, item in enumerate(items):
+            if item["slot_id"] not in existing:
+                errors.setdefault(i, "Slot not found")
+
+        # Make sure previous reservations are up‑to‑date
+        if existing:
+            ReservationService.refresh_statuses_for_slots(existing)
+
+        candidates = [i for i in range(len(items)) if i not in errors]
+        if candidates:
+            SlotLockService.lock(items[i]["slot_id"] for i in candidates)
+
+            lo = min(_utc(items[i]["start_ts"]) for i in candidates)
+            hi = max(_utc(items[i]["end_ts"]) for i in candidates)
+
+            # Every booked / ongoing interval the batch could collide with, in one query
+            rows = db.session.execute(
+                select(Reservation.slot_id, Reservation.start_ts, Reservation.end_ts)
+                .where(
+                    Reservation.slot_id.in_({items[i]["slot_id"] for i in candidates}),
+                    Reservation.status.in_(
+                        [ReservationStatus.booked, ReservationStatus.ongoing]
+                    ),
+                    Reservation.start_ts < hi,
+                    Reservation.end_ts   > lo,
+                )
+            ).all()
+
+            # Per-slot sorted, non-overlapping intervals; accepted batch items are added as we go
+            busy = defaultdict(list)
+            for slot_id, start, end in rows:
+                busy[slot_id].append((_utc(start), _utc(end)))
+            for intervals in busy.values():
+                intervals.sort()
+
+            for i in candidates:
+                start, end = _utc(items[i]["start_ts"]), _utc(items[i]["end_ts"])
+                intervals  = busy[items[i]["slot_id"]]
+
+                # Only the last interval starting before `end` can reach past `start`
+                pos = bisect_left(intervals, (end,))
+                if pos and intervals[pos - 1][1] > start:
+                    errors[i] = "Slot already booked for this time"
+                else:
+                    insort(intervals, (start, end))
+
+        accepted = [i for i in range(len(items)) if i not in errors]
+        if not accepted or (atomic and errors):
+            return [BatchItemResult(i, None, errors.get(i)) for i in range(len(items))]
+
+        # Write to DB (single multi-row INSERT ... RETURNING)
+        created = db.session.scalars(
+            insert(Reservation).returning(Reservation, sort_by_parameter_order=True),
+            [
+                {
+                    "user_id":  user_id,
+                    "slot_id":  items[i]["slot_id"],
+                    "location_id": existing[items[i]["slot_id"]],
+                    "start_ts": items[i]["start_ts"],
+                    "end_ts":   items[i]["end_ts"],
+                }
+                for i in accepted
+            ],
+        ).all()
+        ReservationChangeService.record(created)
+
+        by_index = dict(zip(accepted, created))
+        return [BatchItemResult(i, by_index.get(i), errors.get(i)) for i in range(len(items))]
+
+    # ---------- CREATE (AUTO-ASSIGN) ----------
+    # Picks and books a free slot at the location. The candidate slot row is locked with
+    # FOR NO KEY UPDATE SKIP LOCKED, so concurrent requests each take a different slot instead of
+    # queueing on (or failing over) the same one. NO KEY keeps it compatible with the KEY SHARE lock
+    # a plain booking's foreign-key insert takes while holding the slot's advisory lock.
+    @staticmethod
+    def create_auto(
+        user_id: int,
+        location_id: int,
+        start_ts: datetime,
+        end_ts: datetime,
+        policy: str = "lowest_label",
+    ) -> Reservation:
+        if start_ts >= end_ts:
+            raise ValueError("Start time must be before end time")
+        if policy not in AUTO_ASSIGN_POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(AUTO_ASSIGN_POLICIES)}")
+
+        if not db.session.get(ParkingLocation, location_id):
+            raise ValueError("Location not found")
+
+        # Make sure previous reservations are up‑to‑date
+        slot_ids = db.session.scalars(
+            select(ParkingSlot.id).where(ParkingSlot.location_id == location_id)
+        ).all()
+        if slot_ids:
+            ReservationService.refresh_statuses_for_slots(slot_ids)
+
+        # On Postgres each attempt runs in a savepoint, so a candidate that turns out to be taken gives its row lock
+        # back before the next one is locked. (pysqlite would commit the whole request on RELEASE; SQLite has no
+        # row or advisory locks to give back anyway.)
+        savepoints = db.engine.dialect.name == "postgresql"
+        skipped: List[int] = []
+        for _ in range(AUTO_ASSIGN_ATTEMPTS):
+            attempt = db.session.begin_nested() if savepoints else None
+            stmt = (
+                select(ParkingSlot.id)
+                .where(
+                    ParkingSlot.location_id == location_id,
+                    ~_blocking(start_ts, end_ts),
+                )
+                .order_by(*_policy_order(policy, start_ts, end_ts))
+                .limit(1)
+                .with_for_update(skip_locked=True, key_share=True, of=ParkingSlot)
+            )
+            if skipped:
+                stmt = stmt.where(ParkingSlot.id.not_in(skipped))
+            slot_id = db.session.scalar(stmt)
+
+            # The slot row is ours now; also take the slot lock plain bookings use, without waiting (a held
+            # transaction-scoped lock outlives the savepoint, so blocking here could deadlock with a batch),
+            # then re-check in case a booking committed after the candidate scan
+            if (
+                slot_id is not None
+                and SlotLockService.try_lock(slot_id)
+                and not db.session.scalar(select(_blocking(start_ts, end_ts)).where(ParkingSlot.id == slot_id))
+            ):
+                res = Reservation(
+                    user_id=user_id, slot_id=slot_id, location_id=location_id, start_ts=start_ts, end_ts=end_ts
+                )
+                db.session.add(res)
+                db.session.flush()
+                ReservationChangeService.record([res])
+                if attempt is not None:
+                    attempt.commit()
+                return res
+
+            if attempt is not None:
+                attempt.rollback()
+            if slot_id is None:
+                break
+            skipped.append(slot_id)
+
+        raise SlotUnavailableError("No free slot at this location for this time")
+
     # ---------- READ ----------
     @staticmethod
     def list_all() -> List[Reservation]:
@@ -111,16 +362,26 @@ class ReservationService:
     # ---------- UPDATE ----------
     @staticmethod
     def update(res: Reservation, **changes) -> Reservation:
-        new_start = changes.get("start_ts", res.start_ts)
-        new_end   = changes.get("end_ts",   res.end_ts)
+        new_start = _utc(changes.get("start_ts", res.start_ts))
+        new_end   = _utc(changes.get("end_ts",   res.end_ts))
         new_slot  = changes.get("slot_id",  res.slot_id)
 
         if new_start >= new_end:
             raise ValueError("Start time must be before end time")
 
+        # Moving slots carries the denormalized location along
+        if new_slot != res.slot_id:
+            location_id = db.session.scalar(select(ParkingSlot.location_id).where(ParkingSlot.id == new_slot))
+            if location_id is None:
+                raise ValueError("Slot not found")
+            changes["location_id"] = location_id
+
         # Make sure reservations are in the right state
         ReservationService.refresh_slot_statuses(new_slot)
 
+        # Lock the current and target slot (ordered, so crossing reschedules can't deadlock)
+        SlotLockService.lock({res.slot_id, new_slot})
+
         overlap = (
             Reservation.query
             .filter(
@@ -137,17 +398,23 @@ class ReservationService:
         if overlap:
             raise ValueError("Slot already booked for this time")
 
+        # Moving to another slot frees the old one for live subscribers
+        if new_slot != res.slot_id:
+            SlotEventService.publish([res], status="released")
+
         # Apply changes
         for k, v in changes.items():
             setattr(res, k, v)
-        db.session.commit()
+        ReservationChangeService.record([res])
+        db.session.flush()
         return res
 
     # ---------- DELETE ----------
     @staticmethod
     def delete(res: Reservation) -> None:
+        ReservationChangeService.record([res], deleted=True)
         db.session.delete(res)
-        db.session.commit()
+        db.session.flush()
 
     # ---------- CANCEL ----------
     @staticmethod
@@ -156,7 +423,8 @@ class ReservationService:
             raise ValueError("Only booked reservations can be cancelled")
 
         res.status = ReservationStatus.cancelled
-        db.session.commit()
+        ReservationChangeService.record([res])
+        db.session.flush()
         return res
 
     # ---------- FINISH ----------
@@ -171,5 +439,6 @@ class ReservationService:
 
         res.status = ReservationStatus.finished
         res.end_ts = datetime.now(timezone.utc)
-        db.session.commit()
+        ReservationChangeService.record([res])
+        db.session.flush()
         return res
@@ -0,0 +1,171 @@
+# This file defines the SlotEventService class, which fans out live slot occupancy events to SSE subscribers.
+# On Postgres events travel through LISTEN/NOTIFY (pg_notify is transactional, so only committed changes are sent and
+# every worker receives them). On other databases (SQLite/tests) events are staged on the session and dispatched
+# in-process after commit.
+
+import json
+import queue
+import select
+import threading
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from sqlalchemy import event, func, select as sa_select
+from sqlalchemy.orm import Session
+from extensions import db
+from models.parking_slot import ParkingSlot
+from models.reservation import Reservation
+
+log = logging.getLogger(__name__)
+
+CHANNEL = "slot_events"
+
+# ---------- IN-PROCESS BUS ----------
+class _Bus:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subs: Dict[int, Set[queue.Queue]] = defaultdict(set)
+        self._listeners: List[Callable[[Dict], None]] = []
+
+    def subscribe(self, location_id: int) -> queue.Queue:
+        q: queue.Queue = queue.Queue(maxsize=256)
+        with self._lock:
+            self._subs[location_id].add(q)
+        return q
+
+    def unsubscribe(self, location_id: int, q: queue.Queue) -> None:
+        with self._lock:
+            self._subs[location_id].discard(q)
+            if not self._subs[location_id]:
+                del self._subs[location_id]
+
+    def add_listener(self, fn: Callable[[Dict], None]) -> None:
+        with self._lock:
+            if fn not in self._listeners:
+                self._listeners.append(fn)
+
+    def dispatch(self, payload: Dict) -> None:
+        with self._lock:
+            targets   = list(self._subs.get(payload["location_id"], ()))
+            listeners = list(self._listeners)
+        for fn in listeners:
+            try:
+                fn(payload)
+            except Exception:
+                log.exception("slot event listener failed")
+        for q in targets:
+            try:
+                q.put_nowait(payload)
+            except queue.Full:
+                pass  # slow consumer; it will resync from the REST endpoints
+
+_bus = _Bus()
+
+# ---------- POSTGRES LISTENER ----------
+# One LISTEN connection per process, started on the first subscription (i.e. after the gunicorn fork)
+_listener_lock    = threading.Lock()
+_listener_started = False
+
+def _listen_forever(engine) -> None:
+    while True:
+        try:
+            conn = engine.raw_connection()
+            try:
+                dbapi_conn = conn.driver_connection
+                dbapi_conn.autocommit = True
+                with dbapi_conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CHANNEL}")
+
+                while True:
+                    if select.select([dbapi_conn], [], [], 30) == ([], [], []):
+                        continue
+                    dbapi_conn.poll()
+                    while dbapi_conn.notifies:
+                        note = dbapi_conn.notifies.pop(0)
+                        _bus.dispatch(json.loads(note.payload))
+            finally:
+                conn.close()
+        except Exception:
+            log.exception("slot event listener crashed; reconnecting")
+            threading.Event().wait(5)
+
+def _ensure_listener(engine) -> None:
+    global _listener_started
+    with _listener_lock:
+        if _listener_started:
+            return
+        threading.Thread(
+            target=_listen_forever, args=(engine,), name="slot-event-listener", daemon=True
+        ).start()
+        _listener_started = True
+
+def _uses_notify() -> bool:
+    return db.engine.dialect.name == "postgresql"
+
+# ---------- COMMIT HOOKS (in-process backend) ----------
+@event.listens_for(Session, "after_commit")
+def _dispatch_staged(session: Session) -> None:
+    for payload in session.info.pop("slot_events", []):
+        _bus.dispatch(payload)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_staged(session: Session, previous_transaction) -> None:
+    session.info.pop("slot_events", None)
+
+class SlotEventService:
+    # ---------- PUBLISH ----------
+    # Called at reservation commit points, before commit; nothing is delivered unless the transaction commits.
+    # `status` overrides the reservation's own status (e.g. "deleted", or "released" for the slot a reservation left)
+    @staticmethod
+    def publish(reservations: Iterable[Reservation], status: Optional[str] = None) -> None:
+        reservations = list(reservations)
+        if not reservations:
+            return
+
+        # Resolve every slot's location in one query
+        slot_ids  = {r.slot_id for r in reservations}
+        locations = dict(
+            db.session.execute(
+                sa_select(ParkingSlot.id, ParkingSlot.location_id)
+                .where(ParkingSlot.id.in_(slot_ids))
+            ).all()
+        )
+
+        payloads: List[Dict] = [
+            {
+                "location_id":    locations.get(r.slot_id),
+                "slot_id":        r.slot_id,
+                "reservation_id": r.id,
+                "status":         status or r.status.value,
+                "start_ts":       r.start_ts.isoformat(),
+                "end_ts":         r.end_ts.isoformat(),
+            }
+            for r in reservations
+            if r.slot_id in locations
+        ]
+
+        if _uses_notify():
+            for payload in payloads:
+                db.session.execute(sa_select(func.pg_notify(CHANNEL, json.dumps(payload))))
+        else:
+            db.session.info.setdefault("slot_events", []).extend(payloads)
+
+    # ---------- SUBSCRIBE ----------
+    # Needs an app context; call from the view before streaming
+    @staticmethod
+    def start_listener() -> None:
+        if _uses_notify():
+            _ensure_listener(db.engine)
+
+    @staticmethod
+    def subscribe(location_id: int) -> queue.Queue:
+        return _bus.subscribe(location_id)
+
+    @staticmethod
+    def unsubscribe(location_id: int, q: queue.Queue) -> None:
+        _bus.unsubscribe(location_id, q)
+
+    # Process-wide callback for every committed event (any location); must be cheap and not touch the DB
+    @staticmethod
+    def add_listener(fn: Callable[[Dict], None]) -> None:
+        _bus.add_listener(fn)
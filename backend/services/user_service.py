@@ -4,7 +4,10 @@
 from typing import List, Optional
 from sqlalchemy.exc import IntegrityError
 from extensions import db
+from models.reservation import Reservation
 from models.user import User
+from services.reservation_change_service import ReservationChangeService
+from services.reservation_service import ReservationService
 from utils.security import hash_password, verify_password
 
 class UserService:
@@ -22,10 +25,9 @@ class UserService:
         user = User(**attrs)
         db.session.add(user)
         try:
-            db.session.commit()
+            db.session.flush()
             return user
         except IntegrityError:
-            db.session.rollback()
             raise ValueError("email already registered")
 
     # ---------- READ ----------
@@ -56,20 +58,26 @@ class UserService:
         for field, value in patch.items():
             setattr(user, field, value)
 
-        db.session.commit()
+        db.session.flush()
         return user
 
     # ---------- DELETE ----------
     @staticmethod
     def delete_user(user: User) -> None:
+        # Refuse while the user still holds upcoming or running bookings; cancel those first
+        if ReservationService.has_active(Reservation.user_id == user.id):
+            raise ValueError("User has active reservations")
+
+        # Reservations are removed by ON DELETE CASCADE; leave tombstones for delta sync
+        ReservationChangeService.record_deleted(Reservation.user_id == user.id)
         db.session.delete(user)
-        db.session.commit()
+        db.session.flush()
 
     # ---------- DEACTIVATE ----------
     @staticmethod
     def deactivate_user(user: User) -> User:
         user.active = False
-        db.session.commit()
+        db.session.flush()
         return user
 
     # ---------- CHANGE PASSWORD ----------
@@ -82,4 +90,4 @@ class UserService:
             raise ValueError("Incorrect old password")
 
         user.password_hash = hash_password(new_pw)
-        db.session.commit()
+        db.session.flush()
@@ -0,0 +1,28 @@
+# tasks/job_worker.py
+# `flask jobs work` – runs queued background jobs in its own process (app-context provided by the Flask CLI).
+# Start one or more next to Gunicorn; each claims one job at a time.
+
+import os
+import socket
+import click
+from flask import current_app as app
+from flask.cli import AppGroup
+from services.job_service import JobService
+from tasks.jobs import JOB_HANDLERS
+
+jobs_cli = AppGroup("jobs", help="Background job queue.")
+
+@jobs_cli.command("work")
+@click.option("--once", is_flag=True, help="Exit once no job is due instead of polling.")
+@click.option("--poll", type=float, default=None, help="Seconds between polls while idle.")
+def work(once: bool, poll) -> None:
+    worker    = f"{socket.gethostname()}:{os.getpid()}"
+    processed = JobService.work(
+        worker,
+        JOB_HANDLERS,
+        poll_s=poll if poll is not None else app.config["JOB_POLL_SECONDS"],
+        stale_after_s=app.config["JOB_STALE_AFTER_SECONDS"],
+        backoff_s=app.config["JOB_RETRY_BACKOFF_SECONDS"],
+        once=once,
+    )
+    click.echo(f"{worker} ran {processed} jobs")
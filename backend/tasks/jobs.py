@@ -0,0 +1,127 @@
+# tasks/jobs.py
+# Handlers for the background job queue, keyed by job kind. Each runs inside the worker's app-context,
+# works in short batches (one transaction each) and reports progress between them, so a cancelled job
+# stops at the next batch boundary. Batches already committed stay done.
+
+import csv
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from flask import current_app as app
+from sqlalchemy import func, select
+from extensions import db
+from models.reservation import Reservation, ReservationStatus
+from read_models.reservation import ReservationReadModel, RESERVATION_COLUMNS
+from services.job_service import JobContext
+from services.reservation_archive_service import ARCHIVED_STATUSES, ReservationArchiveService
+from services.reservation_service import ReservationService
+from utils.transaction import transaction
+
+CANCEL_BATCH_SIZE = 200
+EXPORT_BATCH_SIZE = 1000
+
+def _timestamp(payload: Dict[str, Any], key: str) -> Optional[datetime]:
+    raw = payload.get(key)
+    if raw is None:
+        return None
+    try:
+        ts = datetime.fromisoformat(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be an ISO 8601 timestamp")
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+# Cancels every booked reservation of a location or slot, optionally limited to start_ts in [from, to)
+def cancel_reservations(ctx: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    criteria = [Reservation.status == ReservationStatus.booked]
+    if payload.get("location_id") is not None:
+        criteria.append(Reservation.location_id == int(payload["location_id"]))
+    if payload.get("slot_id") is not None:
+        criteria.append(Reservation.slot_id == int(payload["slot_id"]))
+    if len(criteria) == 1:
+        raise ValueError("location_id or slot_id is required")
+
+    start, end = _timestamp(payload, "from"), _timestamp(payload, "to")
+    if start is not None:
+        criteria.append(Reservation.start_ts >= start)
+    if end is not None:
+        criteria.append(Reservation.start_ts < end)
+
+    ids       = db.session.scalars(select(Reservation.id).where(*criteria).order_by(Reservation.id)).all()
+    cancelled = 0
+    for offset in range(0, len(ids), CANCEL_BATCH_SIZE):
+        batch = ids[offset:offset + CANCEL_BATCH_SIZE]
+        with transaction():
+            # Re-checked per batch: reservations may have started or been cancelled meanwhile
+            for res in db.session.scalars(select(Reservation).where(Reservation.id.in_(batch), *criteria)):
+                ReservationService.cancel(res)
+                cancelled += 1
+        ctx.progress(offset + len(batch), len(ids))
+    return {"cancelled": cancelled}
+
+# Path of an export job's CSV under JOB_EXPORT_DIR (also used by the download route)
+def export_path(file_name: str) -> str:
+    return os.path.join(app.config["JOB_EXPORT_DIR"], file_name)
+
+# CSV of reservations (archive included when the range reaches it) with start_ts in [from, to).
+# Rows are read in keyset pages and written straight to a file under JOB_EXPORT_DIR; the job result only
+# names the file, so large exports never pass through the jobs table.
+def export_reservations(ctx: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    start, end = _timestamp(payload, "from"), _timestamp(payload, "to")
+    archive    = ReservationArchiveService.reaches(start)
+    total      = ReservationReadModel.count_all(start, end, archive)
+
+    file_name = f"reservations-{ctx.job_id}.csv"
+    path      = export_path(file_name)
+    partial   = f"{path}.{os.getpid()}.part"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        written, after = 0, None
+        with open(partial, "w", newline="", encoding="utf-8") as out:
+            writer = csv.writer(out)
+            writer.writerow(RESERVATION_COLUMNS)
+            while True:
+                rows = ReservationReadModel.page_all(start, end, archive, after, EXPORT_BATCH_SIZE)
+                for row in rows:
+                    writer.writerow(row._replace(status=getattr(row.status, "value", row.status)))
+                written += len(rows)
+                ctx.progress(written, total)
+                if len(rows) < EXPORT_BATCH_SIZE:
+                    break
+                after = (rows[-1].start_ts, rows[-1].id)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return {"rows": written, "file": file_name}
+
+# On-demand run of the reservation archival, optionally with a different retention age
+def archive_reservations(ctx: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    retention_days = int(payload.get("retention_days", app.config["RESERVATION_ARCHIVE_AFTER_DAYS"]))
+    if retention_days < 1:
+        raise ValueError("retention_days must be at least 1")
+
+    batch_size = app.config["RESERVATION_ARCHIVE_BATCH_SIZE"]
+    pause_s    = app.config["RESERVATION_ARCHIVE_PAUSE_MS"] / 1000
+    cutoff     = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    total      = db.session.scalar(
+        select(func.count()).select_from(Reservation)
+        .where(Reservation.status.in_(ARCHIVED_STATUSES), Reservation.end_ts < cutoff)
+    )
+
+    moved, after_id = 0, 0
+    while True:
+        ids = ReservationArchiveService.archive_batch(cutoff, batch_size, after_id)
+        moved += len(ids)
+        ctx.progress(moved, total)
+        if len(ids) < batch_size:
+            break
+        after_id = ids[-1]
+        time.sleep(pause_s)
+    return {"moved": moved}
+
+JOB_HANDLERS = {
+    "cancel_reservations":  cancel_reservations,
+    "export_reservations":  export_reservations,
+    "archive_reservations": archive_reservations,
+}
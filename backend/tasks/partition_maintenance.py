@@ -0,0 +1,12 @@
+# tasks/partition_maintenance.py
+# Runs inside an app‑context (provided by app.py’s scheduler wrapper).
+
+from flask import current_app as app
+from services.reservation_partition_service import ReservationPartitionService
+
+# Create upcoming monthly reservation partitions and detach expired ones
+def maintain_reservation_partitions() -> None:
+    ReservationPartitionService.maintain(
+        months_ahead=app.config["RESERVATION_PARTITION_MONTHS_AHEAD"],
+        retention_months=app.config["RESERVATION_PARTITION_RETENTION_MONTHS"],
+    )
@@ -0,0 +1,16 @@
+# tasks/reservation_archival.py
+# Runs inside an app‑context (provided by app.py’s scheduler wrapper).
+
+from flask import current_app as app
+from services.reservation_archive_service import ReservationArchiveService
+
+# Move finished / cancelled reservations past the retention age into the archive table
+def archive_old_reservations() -> None:
+    retention_days = app.config["RESERVATION_ARCHIVE_AFTER_DAYS"]
+    if not retention_days:
+        return
+    ReservationArchiveService.run(
+        retention_days=retention_days,
+        batch_size=app.config["RESERVATION_ARCHIVE_BATCH_SIZE"],
+        pause_s=app.config["RESERVATION_ARCHIVE_PAUSE_MS"] / 1000,
+    )
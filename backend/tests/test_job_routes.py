@@ -0,0 +1,151 @@
+# ══════════════════════════════════════════════════════════════════════════════
+# JOB ROUTES TESTS
+# ══════════════════════════════════════════════════════════════════════════════
+
+from datetime import datetime, timedelta, timezone
+
+
+class TestJobRoutes:
+    def test_bulk_cancel_job_runs_and_reports_progress(self, app, client, admin_token, user_token, make_location):
+        from services.job_service import JobService
+        from tasks.jobs import JOB_HANDLERS
+
+        admin = {"Authorization": f"Bearer {admin_token}"}
+        loc   = make_location(total_slots=2)
+        slots = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"]
+        start = datetime.now(timezone.utc) + timedelta(days=2)
+        for slot in slots:
+            res = client.post(
+                "/api/reservation/reservations",
+                json={"slot_id": slot["id"], "start_ts": start.isoformat(),
+                      "end_ts": (start + timedelta(hours=1)).isoformat()},
+                headers={"Authorization": f"Bearer {user_token}"},
+            )
+            assert res.status_code == 201
+
+        res = client.post("/api/jobs", json={"kind": "cancel_reservations", "payload": {"location_id": loc["id"]}},
+                          headers=admin)
+        assert res.status_code == 202
+        job = res.get_json()["job"]
+        assert job["status"] == "queued"
+        assert res.headers["Location"].endswith(f"/api/jobs/{job['id']}")
+
+        assert client.get(f"/api/jobs/{job['id']}", headers={"Authorization": f"Bearer {user_token}"}).status_code == 403
+
+        with app.app_context():
+            while JobService.run_next("test-worker", JOB_HANDLERS):
+                pass
+
+        job = client.get(f"/api/jobs/{job['id']}", headers=admin).get_json()["job"]
+        assert job["status"] == "succeeded"
+        assert job["progress"] == 100
+        assert job["attempts"] == 1
+        assert job["result"] == {"cancelled": 2}
+
+        res = client.post(f"/api/jobs/{job['id']}/cancel", headers=admin)
+        assert res.status_code == 409
+
+    def test_failed_jobs_retry_and_queued_jobs_cancel(self, app, client, admin_token):
+        from services.job_service import JobService
+
+        admin = {"Authorization": f"Bearer {admin_token}"}
+        calls = []
+        def flaky(ctx, payload):
+            calls.append(payload)
+            if len(calls) == 1:
+                raise RuntimeError("database went away")
+            ctx.progress(1, 2)
+            return {"ok": True}
+
+        res = client.post("/api/jobs", json={"kind": "export_reservations", "max_attempts": 2}, headers=admin)
+        job_id = res.get_json()["job"]["id"]
+        with app.app_context():
+            assert JobService.run_next("test-worker", {"export_reservations": flaky}, backoff_s=0)
+            job = client.get(f"/api/jobs/{job_id}", headers=admin).get_json()["job"]
+            assert job["status"] == "queued"
+            assert "database went away" in job["error"]
+
+            assert JobService.run_next("test-worker", {"export_reservations": flaky}, backoff_s=0)
+        job = client.get(f"/api/jobs/{job_id}", headers=admin).get_json()["job"]
+        assert (job["status"], job["attempts"], job["result"]) == ("succeeded", 2, {"ok": True})
+
+        res = client.post("/api/jobs", json={"kind": "export_reservations"}, headers=admin)
+        job_id = res.get_json()["job"]["id"]
+        res = client.post(f"/api/jobs/{job_id}/cancel", headers=admin)
+        assert res.status_code == 200
+        assert res.get_json()["job"]["status"] == "cancelled"
+        with app.app_context():
+            assert not JobService.run_next("test-worker", {"export_reservations": flaky})
+
+        res = client.post("/api/jobs", json={"kind": "drop_tables"}, headers=admin)
+        assert res.status_code == 400
+
+    def test_export_writes_a_file_and_heartbeats(self, app, client, admin_token, reservation_factory, monkeypatch,
+                                                 tmp_path):
+        import tasks.jobs
+        from services.job_service import JobContext, JobService
+        from tasks.jobs import JOB_HANDLERS
+
+        admin = {"Authorization": f"Bearer {admin_token}"}
+        for hours in (30, 31, 32):
+            reservation_factory(hours_from_now=hours)
+        monkeypatch.setitem(app.config, "JOB_EXPORT_DIR", str(tmp_path))
+        monkeypatch.setattr(tasks.jobs, "EXPORT_BATCH_SIZE", 2)
+        beats    = []
+        progress = JobContext.progress
+        def record(ctx, done, total):
+            beats.append(done)
+            progress(ctx, done, total)
+        monkeypatch.setattr(JobContext, "progress", record)
+
+        res    = client.post("/api/jobs", json={"kind": "export_reservations"}, headers=admin)
+        job_id = res.get_json()["job"]["id"]
+        with app.app_context():
+            assert JobService.run_next("test-worker", JOB_HANDLERS)
+
+        job = client.get(f"/api/jobs/{job_id}", headers=admin).get_json()["job"]
+        assert job["status"] == "succeeded"
+        assert job["result"] == {"rows": job["result"]["rows"], "file": f"reservations-{job_id}.csv"}
+        assert job["result"]["rows"] >= 3
+        assert len(beats) > 1 and beats[-1] == job["result"]["rows"]
+
+        res = client.get(f"/api/jobs/{job_id}/download", headers=admin)
+        assert res.status_code == 200
+        lines = res.get_data(as_text=True).splitlines()
+        assert lines[0].startswith("id,user_id,slot_id")
+        assert len(lines) == job["result"]["rows"] + 1
+        assert [p.name for p in tmp_path.iterdir()] == [f"reservations-{job_id}.csv"]
+
+    def test_requeued_job_ignores_its_old_worker(self, app, client, admin_token):
+        from services.job_service import JobService
+
+        admin = {"Authorization": f"Bearer {admin_token}"}
+        def presumed_dead(ctx, payload):
+            # Heartbeats stopped long enough for the job to be handed to another worker
+            JobService.requeue_stale(timeout_s=-1)
+            return {"late": True}
+
+        res    = client.post("/api/jobs", json={"kind": "export_reservations"}, headers=admin)
+        job_id = res.get_json()["job"]["id"]
+        with app.app_context():
+            assert JobService.run_next("worker-a", {"export_reservations": presumed_dead})
+            job = client.get(f"/api/jobs/{job_id}", headers=admin).get_json()["job"]
+            assert (job["status"], job["result"]) == ("queued", None)
+
+            assert JobService.run_next("worker-b", {"export_reservations": lambda ctx, payload: {"rows": 0}})
+        job = client.get(f"/api/jobs/{job_id}", headers=admin).get_json()["job"]
+        assert (job["status"], job["attempts"], job["result"]) == ("succeeded", 2, {"rows": 0})
+
+    def test_cancel_after_a_worker_claimed_the_job(self, app, client, admin_token):
+        from services.job_service import JobService
+
+        admin  = {"Authorization": f"Bearer {admin_token}"}
+        job_id = client.post("/api/jobs", json={"kind": "export_reservations"}, headers=admin).get_json()["job"]["id"]
+        with app.app_context():
+            job = JobService.get(job_id)        # the admin's request reads it while queued …
+            with app.app_context():                # … and a worker starts it before the write
+                while (claimed := JobService.claim("worker-a")) not in (job_id, None):
+                    pass
+                assert claimed == job_id
+            JobService.cancel(job)
+            assert (job.status.value, job.cancel_requested, job.locked_by) == ("running", True, "worker-a")
@@ -1,3 +1,6 @@
+import json
+from datetime import datetime, timedelta, timezone
+
 class TestParkingLocationRoutes:
     def test_admin_create_location(self, make_location):
         loc = make_location(total_slots=10, prefix="TestGarage")
@@ -40,6 +43,169 @@ class TestParkingLocationRoutes:
         assert data["location"]["id"] == loc["id"]
         assert data["location"]["available_slots"] == 3
     
+    def test_list_locations_sparse_fields(self, client, make_location):
+        loc = make_location(total_slots=2)
+
+        res = client.get("/api/parking_location/locations?fields=id,name,available_slots")
+        assert res.status_code == 200
+        created_loc = next(l for l in res.get_json()["locations"] if l["id"] == loc["id"])
+        assert created_loc == {"id": loc["id"], "name": loc["name"], "available_slots": 2}
+
+    def test_get_location_sparse_fields(self, client, make_location):
+        loc = make_location(total_slots=1)
+
+        res = client.get(f"/api/parking_location/locations/{loc['id']}?fields=lat,lng")
+        assert res.status_code == 200
+        assert set(res.get_json()["location"]) == {"lat", "lng"}
+
+    def test_unknown_sparse_field_rejected(self, client):
+        res = client.get("/api/parking_location/locations?fields=id,secret")
+        assert res.status_code == 400
+        assert "secret" in res.get_json()["error"]
+    
+    def test_list_locations_conditional_get(self, client, admin_token, make_location):
+        loc = make_location(total_slots=1)
+
+        res = client.get("/api/parking_location/locations")
+        etag = res.headers["ETag"]
+        assert res.status_code == 200
+        assert not etag.startswith("W/")
+        assert "must-revalidate" in res.headers["Cache-Control"]
+
+        res = client.get("/api/parking_location/locations", headers={"If-None-Match": etag})
+        assert res.status_code == 304
+        assert res.headers["ETag"] == etag
+
+        # A write bumps the collection version, so the old ETag no longer matches
+        client.put(f"/api/parking_location/locations/{loc['id']}",
+                   json={"name": "Renamed Garage"},
+                   headers={"Authorization": f"Bearer {admin_token}"})
+        res = client.get("/api/parking_location/locations", headers={"If-None-Match": etag})
+        assert res.status_code == 200
+        assert res.headers["ETag"] != etag
+    
+    def test_location_events_stream(self, client, make_location, reservation_factory):
+        loc = make_location(total_slots=1)
+        slots_res = client.get(f"/api/parking_slot/slots?location_id={loc['id']}")
+        slot_id = slots_res.get_json()["slots"][0]["id"]
+
+        res = client.get(f"/api/parking_location/locations/{loc['id']}/events", buffered=False)
+        assert res.status_code == 200
+        assert res.mimetype == "text/event-stream"
+
+        chunks = (c.decode() for c in res.response)
+        assert next(chunks).startswith("retry:")   # subscribed
+
+        booked = reservation_factory(slot_id=slot_id)
+        chunk = next(chunks)
+        assert chunk.startswith("event: slot")
+        payload = json.loads(chunk.split("data: ", 1)[1])
+        assert payload["reservation_id"] == booked["id"]
+        assert payload["slot_id"] == slot_id
+        assert payload["status"] == "booked"
+        res.close()
+
+    def test_location_events_unknown_location(self, client):
+        res = client.get("/api/parking_location/locations/99999/events")
+        assert res.status_code == 404
+    
+    def test_nearby_locations_ordered_and_filtered(self, client, admin_token, reservation_factory):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        def _create(name, lat, lng):
+            res = client.post("/api/parking_location/locations",
+                              json={"name": name, "address": "Nearby St", "lat": lat, "lng": lng},
+                              headers=headers)
+            loc_id = res.get_json()["location"]["id"]
+            slot = client.post("/api/parking_slot/slots",
+                               json={"slot_label": "N1", "location_id": loc_id},
+                               headers=headers)
+            return loc_id, slot.get_json()["slot"]["id"]
+
+        near, _           = _create("Near", -33.0000, 151.0000)
+        far, _            = _create("Far", -33.0300, 151.0000)
+        booked, booked_sl = _create("Booked", -33.0010, 151.0000)
+        _create("Outside", -34.0000, 151.0000)
+
+        res_data = reservation_factory(slot_id=booked_sl)
+        res = client.get("/api/parking_location/locations/nearby",
+                         query_string={
+                             "lat": -33.0, "lng": 151.0, "radius_km": 5,
+                             "start_ts": res_data["start_ts"], "end_ts": res_data["end_ts"],
+                         })
+        assert res.status_code == 200
+        locs = res.get_json()["locations"]
+        assert [l["id"] for l in locs] == [near, far]   # fully booked one dropped, outside excluded
+        assert locs[0]["distance_km"] < locs[1]["distance_km"]
+        assert locs[0]["free_slots"] == 1
+
+    def test_nearby_locations_requires_coordinates(self, client):
+        res = client.get("/api/parking_location/locations/nearby?lat=7.0")
+        assert res.status_code == 400
+    
+    def test_location_clusters_by_zoom(self, client, admin_token):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        ids = []
+        for lat, lng in [(48.0001, 2.0001), (48.0002, 2.0002), (48.3, 2.3)]:
+            res = client.post("/api/parking_location/locations",
+                              json={"name": f"Cluster {lat}", "address": "Map St", "lat": lat, "lng": lng},
+                              headers=headers)
+            ids.append(res.get_json()["location"]["id"])
+        client.post("/api/parking_slot/slots",
+                    json={"slot_label": "C1", "location_id": ids[0]}, headers=headers)
+
+        bbox = {"south": 47.9, "west": 1.9, "north": 48.5, "east": 2.5}
+
+        # Zoomed out: everything collapses into one cluster
+        res = client.get("/api/parking_location/locations/clusters", query_string={**bbox, "zoom": 5})
+        assert res.status_code == 200
+        clusters = res.get_json()["clusters"]
+        assert len(clusters) == 1
+        assert clusters[0]["count"] == 3
+        assert clusters[0]["total_slots"] == 1
+        assert clusters[0]["free_slots"] == 1
+
+        # Zoomed in: the far location splits off as its own marker
+        res = client.get("/api/parking_location/locations/clusters", query_string={**bbox, "zoom": 12})
+        counts = sorted(c["count"] for c in res.get_json()["clusters"])
+        assert counts == [1, 2]
+        single = next(c for c in res.get_json()["clusters"] if c["count"] == 1)
+        assert single["location_id"] == ids[2]
+
+    def test_location_clusters_invalid_bbox(self, client):
+        res = client.get("/api/parking_location/locations/clusters",
+                         query_string={"south": 10, "west": 0, "north": 5, "east": 1, "zoom": 3})
+        assert res.status_code == 400
+    
+    def test_location_occupancy_grid_tracks_writes(self, client, make_location, reservation_factory):
+        loc = make_location(total_slots=2)
+        slots = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"]
+        first = reservation_factory(slot_id=slots[0]["id"], hours_from_now=3, duration_hours=1)
+        window = {"start_ts": first["start_ts"], "end_ts": first["end_ts"]}
+
+        # Build the bitmap, then book the second slot: the write must show up without a rebuild
+        grid = client.get(f"/api/parking_location/locations/{loc['id']}/occupancy", query_string=window).get_json()
+        assert grid["bucket_minutes"] == 15
+        assert [s["slot_id"] for s in grid["slots"]] == [s["id"] for s in slots]
+        assert set(grid["slots"][0]["busy"]) == {"1"}
+        assert set(grid["slots"][1]["busy"]) == {"0"}
+        assert set(grid["free_counts"]) == {1}
+
+        free = client.get(f"/api/parking_location/locations/{loc['id']}/occupancy/free", query_string=window)
+        assert free.get_json()["slot_ids"] == [slots[1]["id"]]
+
+        reservation_factory(slot_id=slots[1]["id"], hours_from_now=3, duration_hours=1)
+        free = client.get(f"/api/parking_location/locations/{loc['id']}/occupancy/free", query_string=window)
+        assert free.get_json()["slot_ids"] == []
+
+    def test_location_occupancy_window_outside_horizon(self, client, make_location):
+        loc = make_location(total_slots=1)
+        start = datetime.now(timezone.utc) + timedelta(days=30)
+        res = client.get(f"/api/parking_location/locations/{loc['id']}/occupancy",
+                         query_string={"start_ts": start.isoformat(),
+                                       "end_ts": (start + timedelta(hours=1)).isoformat()})
+        assert res.status_code == 400
+
     def test_get_nonexistent_location(self, client):
         res = client.get("/api/parking_location/locations/99999")
         assert res.status_code == 404
@@ -60,6 +226,26 @@ class TestParkingLocationRoutes:
         assert data["location"]["name"] == "Updated Garage"
         assert data["location"]["address"] == "456 New St"
     
+    def test_get_location_etag_round_trips_to_if_match(self, client, admin_token, make_location):
+        loc     = make_location(total_slots=1)
+        url     = f"/api/parking_location/locations/{loc['id']}"
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        res     = client.get(url)
+        etag    = res.headers["ETag"]
+        version = res.get_json()["location"]["version"]
+        assert etag == f'"v{version}"'
+
+        res = client.put(url, json={"name": "Round Trip Garage"}, headers={**headers, "If-Match": etag})
+        assert res.status_code == 200
+        assert res.headers["ETag"] == f'"v{version + 1}"'
+
+        # Without the derived slot count the row's version covers the body, so it revalidates
+        sparse = f"{url}?fields=id,name"
+        etag   = client.get(sparse).headers["ETag"]
+        assert client.get(sparse, headers={"If-None-Match": etag}).status_code == 304
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
     def test_admin_delete_location(self, client, admin_token, make_location):
         loc = make_location(total_slots=2)
         
@@ -70,3 +256,26 @@ class TestParkingLocationRoutes:
         # Verify deletion
         res = client.get(f"/api/parking_location/locations/{loc['id']}")
         assert res.status_code == 404
+
+    def test_delete_location_guards_active_reservations(self, client, admin_token, user_token, make_location,
+                                                       reservation_factory):
+        admin = {"Authorization": f"Bearer {admin_token}"}
+        user  = {"Authorization": f"Bearer {user_token}"}
+        loc     = make_location(total_slots=2)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+        booked  = reservation_factory(slot_id=slot_id)
+        cursor  = client.get("/api/reservation/changes", headers=user).get_json()["next_cursor"]
+
+        res = client.delete(f"/api/parking_location/locations/{loc['id']}", headers=admin)
+        assert res.status_code == 409
+
+        client.post(f"/api/reservation/reservations/{booked['id']}/cancel", headers=user)
+        cursor = client.get(f"/api/reservation/changes?since={cursor}", headers=user).get_json()["next_cursor"]
+        res = client.delete(f"/api/parking_location/locations/{loc['id']}", headers=admin)
+        assert res.status_code == 204
+
+        # Slots and reservations went with the location, and delta sync sees the tombstone
+        assert client.get(f"/api/parking_slot/slots/{slot_id}").status_code == 404
+        assert client.get(f"/api/reservation/reservations/{booked['id']}", headers=user).status_code == 404
+        changes = client.get(f"/api/reservation/changes?since={cursor}", headers=user).get_json()
+        assert changes["deleted"] == [booked["id"]]
@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta, timezone
 
 # PARKING SLOT ROUTES TESTS
 class TestParkingSlotRoutes:
@@ -38,6 +39,17 @@ class TestParkingSlotRoutes:
         assert "slots" in data
         assert len(data["slots"]) >= 3
     
+    def test_list_slots_etag_varies_by_query(self, client, make_location):
+        loc = make_location(total_slots=1)
+
+        all_res = client.get("/api/parking_slot/slots")
+        loc_res = client.get(f"/api/parking_slot/slots?location_id={loc['id']}")
+        assert all_res.headers["ETag"] != loc_res.headers["ETag"]
+
+        res = client.get(f"/api/parking_slot/slots?location_id={loc['id']}",
+                         headers={"If-None-Match": loc_res.headers["ETag"]})
+        assert res.status_code == 304
+    
     def test_list_slots_by_location(self, client, make_location):
         loc1 = make_location(total_slots=2, prefix="Garage1")
         loc2 = make_location(total_slots=3, prefix="Garage2")
@@ -52,6 +64,131 @@ class TestParkingSlotRoutes:
         for slot in data["slots"]:
             assert slot["location_id"] == loc1["id"]
     
+    def test_list_available_slots_in_window(self, client, make_location, reservation_factory):
+        loc = make_location(total_slots=2)
+
+        slots_res = client.get(f"/api/parking_slot/slots?location_id={loc['id']}")
+        booked_id = slots_res.get_json()["slots"][0]["id"]
+        booked = reservation_factory(slot_id=booked_id, hours_from_now=1, duration_hours=2)
+
+        res = client.get("/api/parking_slot/slots",
+                         query_string={
+                             "location_id": loc["id"],
+                             "start_ts": booked["start_ts"],
+                             "end_ts": booked["end_ts"],
+                         })
+        assert res.status_code == 200
+        ids = [s["id"] for s in res.get_json()["slots"]]
+        assert booked_id not in ids
+        assert len(ids) == 1
+    
+    def test_next_available_finds_earliest_gaps(self, client, user_token, make_location):
+        loc = make_location(total_slots=2)
+        slot_a, slot_b = [s["id"] for s in client.get(
+            f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"]]
+        base = (datetime.now(timezone.utc) + timedelta(hours=1)).replace(microsecond=0)
+
+        for slot_id, start_h, end_h in [(slot_a, 1, 3), (slot_a, 3.5, 6), (slot_b, 0, 5)]:
+            res = client.post("/api/reservation/reservations", json={
+                "slot_id": slot_id,
+                "start_ts": (base + timedelta(hours=start_h)).isoformat(),
+                "end_ts": (base + timedelta(hours=end_h)).isoformat(),
+            }, headers={"Authorization": f"Bearer {user_token}"})
+            assert res.status_code == 201
+
+        res = client.get("/api/parking_slot/next-available", query_string={
+            "location_id": loc["id"], "duration": 120,
+            "after": base.isoformat(), "before": (base + timedelta(days=1)).isoformat(),
+        })
+        assert res.status_code == 200
+        windows = res.get_json()["windows"]
+        assert [(w["slot_id"], datetime.fromisoformat(w["start_ts"])) for w in windows] == [
+            (slot_b, base + timedelta(hours=5)),
+            (slot_a, base + timedelta(hours=6)),
+        ]
+
+        # Every gap long enough counts, several per slot when they fit
+        res = client.get("/api/parking_slot/next-available", query_string={
+            "location_id": loc["id"], "duration": 60,
+            "after": base.isoformat(), "before": (base + timedelta(days=1)).isoformat(),
+        })
+        assert [(w["slot_id"], datetime.fromisoformat(w["start_ts"])) for w in res.get_json()["windows"]] == [
+            (slot_a, base),
+            (slot_b, base + timedelta(hours=5)),
+            (slot_a, base + timedelta(hours=6)),
+        ]
+
+        # A short stay fits before slot A's first booking
+        res = client.get("/api/parking_slot/next-available", query_string={
+            "location_id": loc["id"], "duration": 60, "after": base.isoformat(), "limit": 1,
+        })
+        assert [w["slot_id"] for w in res.get_json()["windows"]] == [slot_a]
+
+    def test_next_available_requires_location(self, client):
+        res = client.get("/api/parking_slot/next-available")
+        assert res.status_code == 400
+
+    def test_batch_availability_matrix(self, client, make_location, reservation_factory):
+        loc1 = make_location(total_slots=2)
+        loc2 = make_location(total_slots=0)
+        booked_id = client.get(f"/api/parking_slot/slots?location_id={loc1['id']}").get_json()["slots"][0]["id"]
+        booked = reservation_factory(slot_id=booked_id, hours_from_now=2, duration_hours=1)
+        later  = datetime.fromisoformat(booked["end_ts"]) + timedelta(hours=1)
+
+        res = client.post("/api/parking_slot/availability", json={
+            "location_ids": [loc2["id"], loc1["id"]],
+            "windows": [
+                {"start_ts": booked["start_ts"], "end_ts": booked["end_ts"]},
+                {"start_ts": later.isoformat(), "end_ts": (later + timedelta(hours=1)).isoformat()},
+            ],
+            "include_slot_ids": True,
+        })
+        assert res.status_code == 200
+        data = res.get_json()
+        assert data["location_ids"] == [loc1["id"], loc2["id"]]
+        assert data["free"] == [[1, 2], [0, 0]]
+        assert booked_id not in data["slot_ids"][0][0]
+        assert booked_id in data["slot_ids"][0][1]
+
+        # Counts only: same matrix from the grouped query
+        res = client.post("/api/parking_slot/availability", json={
+            "location_ids": [loc1["id"], loc2["id"]], "windows": data["windows"],
+        })
+        assert res.get_json()["free"] == [[1, 2], [0, 0]]
+        assert "slot_ids" not in res.get_json()
+
+    def test_batch_availability_rejects_bad_windows(self, client):
+        res = client.post("/api/parking_slot/availability", json={"location_ids": "all", "windows": [{"start_ts": "x"}]})
+        assert res.status_code == 400
+
+    def test_slot_calendar_merges_runs(self, client, user_token, admin_token, make_location):
+        loc = make_location(total_slots=2)
+        slot_a, slot_b = [s["id"] for s in client.get(
+            f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"]]
+        base = (datetime.now(timezone.utc) + timedelta(hours=1)).replace(microsecond=0)
+
+        # Two touching bookings merge; the third stands alone
+        for start_h, end_h in [(1, 2), (2, 3), (5, 6)]:
+            res = client.post("/api/reservation/reservations", json={
+                "slot_id": slot_a,
+                "start_ts": (base + timedelta(hours=start_h)).isoformat(),
+                "end_ts": (base + timedelta(hours=end_h)).isoformat(),
+            }, headers={"Authorization": f"Bearer {user_token}"})
+            assert res.status_code == 201
+
+        window = {"location_id": loc["id"], "from": base.isoformat(), "to": (base + timedelta(hours=12)).isoformat()}
+        res = client.get("/api/parking_slot/calendar", query_string=window)
+        assert res.status_code == 200
+        slots = res.get_json()["slots"]
+        assert slots == [
+            {"slot_id": slot_a, "runs": [3600, 7200, 7200, 3600]},
+            {"slot_id": slot_b, "runs": []},
+        ]
+
+        res = client.get("/api/parking_slot/calendar", query_string=window,
+                         headers={"Authorization": f"Bearer {admin_token}"})
+        assert len(res.get_json()["slots"][0]["user_ids"]) == 2
+
     def test_get_slot_by_id(self, client, make_location):
         loc = make_location(total_slots=1)
         
@@ -81,6 +218,45 @@ class TestParkingSlotRoutes:
         data = res.get_json()
         assert data["slot"]["slot_label"] == "Updated-A1"
     
+    def test_get_slot_etag_round_trips_to_if_match(self, client, admin_token, make_location):
+        loc     = make_location(total_slots=1)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+        url     = f"/api/parking_slot/slots/{slot_id}"
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        res  = client.get(url)
+        etag = res.headers["ETag"]
+        assert etag == f'"v{res.get_json()["slot"]["version"]}"'
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        res = client.put(url, json={"slot_label": "RT-1"}, headers={**headers, "If-Match": etag})
+        assert res.status_code == 200
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+        # The tag from before the edit is stale now
+        assert client.put(url, json={"slot_label": "RT-2"}, headers={**headers, "If-Match": etag}).status_code == 412
+
+    def test_moving_a_slot_reaches_delta_sync(self, client, admin_token, user_token, make_location,
+                                              reservation_factory):
+        loc1    = make_location(total_slots=1)
+        loc2    = make_location(total_slots=0)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc1['id']}").get_json()["slots"][0]["id"]
+        booked  = reservation_factory(slot_id=slot_id)
+        user    = {"Authorization": f"Bearer {user_token}"}
+
+        head = client.get("/api/reservation/changes?limit=1000", headers=user).get_json()
+        while head["has_more"]:
+            head = client.get(f"/api/reservation/changes?limit=1000&since={head['next_cursor']}", headers=user).get_json()
+
+        res = client.put(f"/api/parking_slot/slots/{slot_id}", json={"location_id": loc2["id"]},
+                         headers={"Authorization": f"Bearer {admin_token}"})
+        assert res.status_code == 200
+
+        delta = client.get(f"/api/reservation/changes?since={head['next_cursor']}", headers=user).get_json()
+        moved = {r["id"]: r for r in delta["reservations"]}
+        assert moved[booked["id"]]["location_id"] == loc2["id"]
+        assert moved[booked["id"]]["version"] == booked["version"] + 1
+
     def test_admin_delete_slot(self, client, admin_token, make_location):
         loc = make_location(total_slots=1)
         
@@ -2,6 +2,8 @@
 # REPORTS ROUTES TESTS
 # ══════════════════════════════════════════════════════════════════════════════
 
+from datetime import datetime, timedelta, timezone
+
 class TestReportsRoutes:
     def test_reservations_per_day_admin(self, client, admin_token):
         res = client.get("/api/reports/reservations-per-day",
@@ -9,5 +11,80 @@ class TestReportsRoutes:
         assert res.status_code == 200
         data = res.get_json()
         assert "data" in data
+
+    def test_slot_lock_waits_admin_only(self, client, admin_token, user_token):
+        res = client.get("/api/reports/slot-lock-waits",
+                        headers={"Authorization": f"Bearer {admin_token}"})
+        assert res.status_code == 200
+        assert {"acquired", "contended", "avg_wait_ms", "max_wait_ms"} <= set(res.get_json()["data"])
+
+        res = client.get("/api/reports/slot-lock-waits",
+                        headers={"Authorization": f"Bearer {user_token}"})
+        assert res.status_code == 403
+
+
+    def test_identical_report_requests_share_one_computation(self, app, admin_token, monkeypatch):
+        import threading
+        import time
+        from services.analytics_service import AnalyticsService
+
+        calls = []
+        def slow_report(days=7):
+            calls.append(days)
+            time.sleep(0.3)
+            return [{"day": "2026-01-01", "count": days}]
+        monkeypatch.setattr(AnalyticsService, "reservations_per_day", staticmethod(slow_report))
+
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        before  = app.test_client().get("/api/reports/single-flight", headers=headers).get_json()["data"]
+        results = []
+        def fetch():
+            res = app.test_client().get("/api/reports/reservations-per-day?days=13", headers=headers)
+            results.append((res.status_code, res.get_json()))
+
+        threads = [threading.Thread(target=fetch) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert calls == [13]
+        assert results == [(200, {"data": [{"day": "2026-01-01", "count": 13}]})] * 5
+        after = app.test_client().get("/api/reports/single-flight", headers=headers).get_json()["data"]
+        assert after["saved"] - before["saved"] == 4
+
+    def test_reports_are_shed_before_bookings(self, app, client, admin_token, user_token, make_location, monkeypatch):
+        from utils.admission import _admission
+
+        loc     = make_location(total_slots=1)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+        monkeypatch.setitem(app.config, "ADMISSION_CAPACITY", 4)
+        monkeypatch.setitem(app.config, "ADMISSION_BOOKING_RESERVE", 1)
+        monkeypatch.setitem(app.config, "ADMISSION_REPORTS_RESERVE", 2)
+        for _ in range(2):   # requests already in flight on this worker
+            assert _admission.try_acquire("catalog", 4, 0, 0)
+        try:
+            res = client.get("/api/reports/slot-summary", headers={"Authorization": f"Bearer {admin_token}"})
+            assert res.status_code == 503
+            assert res.headers["Retry-After"] == str(app.config["ADMISSION_RETRY_AFTER"])
+
+            res = client.get(f"/api/parking_slot/slots/{slot_id}")
+            assert res.status_code != 503
+
+            start = datetime.now(timezone.utc) + timedelta(hours=1)
+            res = client.post(
+                "/api/reservation/reservations",
+                json={"slot_id": slot_id, "start_ts": start.isoformat(),
+                      "end_ts": (start + timedelta(hours=1)).isoformat()},
+                headers={"Authorization": f"Bearer {user_token}"},
+            )
+            assert res.status_code == 201
+        finally:
+            for _ in range(2):
+                _admission.release("catalog")
+
+        stats = client.get("/api/reports/admission", headers={"Authorization": f"Bearer {admin_token}"}).get_json()["data"]
+        assert stats["in_flight"] == 0
+        assert stats["classes"]["reports"]["shed"] >= 1
     
     # def test_reservations_per_day_with_days_param(self, client, admin_token):
\ No newline at end of file
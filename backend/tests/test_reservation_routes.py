@@ -210,4 +210,435 @@ class TestReservationRoutes:
         # Regular user tries to access admin's reservation
         res = client.get(f"/api/reservation/reservations/{reservation_id}",
                         headers={"Authorization": f"Bearer {user_token}"})
-        assert res.status_code == 403
\ No newline at end of file
+        assert res.status_code == 403
+
+    def test_reservation_changes_since_cursor(self, client, user_token, reservation_factory):
+        headers = {"Authorization": f"Bearer {user_token}"}
+
+        # Start from the current head so earlier tests don't matter
+        cursor = client.get("/api/reservation/changes", headers=headers).get_json()
+        while cursor["has_more"]:
+            cursor = client.get(f"/api/reservation/changes?since={cursor['next_cursor']}",
+                                headers=headers).get_json()
+        head = cursor["next_cursor"]
+
+        kept    = reservation_factory()
+        dropped = reservation_factory()
+        client.delete(f"/api/reservation/reservations/{dropped['id']}", headers=headers)
+
+        res = client.get(f"/api/reservation/changes?since={head}", headers=headers)
+        assert res.status_code == 200
+        data = res.get_json()
+        assert [r["id"] for r in data["reservations"]] == [kept["id"]]
+        assert data["deleted"] == [dropped["id"]]
+        assert data["next_cursor"] > head
+
+        # Nothing new after the returned cursor
+        res = client.get(f"/api/reservation/changes?since={data['next_cursor']}", headers=headers)
+        assert res.get_json()["reservations"] == []
+        assert res.get_json()["deleted"] == []
+
+    def test_reservation_changes_rejects_bad_cursor(self, client, user_token):
+        res = client.get("/api/reservation/changes?since=abc",
+                         headers={"Authorization": f"Bearer {user_token}"})
+        assert res.status_code == 400
+
+    def _batch_payload(self, slot_ids, start, hours=1):
+        return [
+            {
+                "slot_id": sid,
+                "start_ts": start.isoformat(),
+                "end_ts": (start + timedelta(hours=hours)).isoformat(),
+            }
+            for sid in slot_ids
+        ]
+
+    def test_batch_reservations_all_created(self, client, user_token, make_location):
+        loc = make_location(total_slots=3)
+        slots = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"]
+        start = datetime.now(timezone.utc) + timedelta(hours=2)
+
+        res = client.post("/api/reservation/reservations/batch",
+                          json={"reservations": self._batch_payload([s["id"] for s in slots], start)},
+                          headers={"Authorization": f"Bearer {user_token}"})
+        assert res.status_code == 201
+        data = res.get_json()
+        assert data["created"] == 3
+        assert [r["reservation"]["slot_id"] for r in data["results"]] == [s["id"] for s in slots]
+
+    def test_batch_all_or_nothing_rejects_intra_batch_conflict(self, client, user_token, make_location):
+        loc = make_location(total_slots=2)
+        slots = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"]
+        start = datetime.now(timezone.utc) + timedelta(hours=2)
+        items = self._batch_payload([slots[0]["id"], slots[1]["id"], slots[0]["id"]], start)
+
+        res = client.post("/api/reservation/reservations/batch",
+                          json={"reservations": items},
+                          headers={"Authorization": f"Bearer {user_token}"})
+        assert res.status_code == 409
+        statuses = [r["status"] for r in res.get_json()["results"]]
+        assert statuses == ["skipped", "skipped", "failed"]
+
+        # Nothing was written
+        free = client.get("/api/parking_slot/slots", query_string={
+            "location_id": loc["id"], "start_ts": items[0]["start_ts"], "end_ts": items[0]["end_ts"],
+        }).get_json()["slots"]
+        assert len(free) == 2
+
+    def test_batch_best_effort_books_what_it_can(self, client, user_token, make_location, reservation_factory):
+        loc = make_location(total_slots=2)
+        slots = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"]
+        taken = reservation_factory(slot_id=slots[0]["id"], hours_from_now=2, duration_hours=1)
+        start = datetime.fromisoformat(taken["start_ts"])
+
+        res = client.post("/api/reservation/reservations/batch",
+                          json={"mode": "best_effort",
+                                "reservations": self._batch_payload([slots[0]["id"], slots[1]["id"]], start)},
+                          headers={"Authorization": f"Bearer {user_token}"})
+        assert res.status_code == 207
+        results = res.get_json()["results"]
+        assert results[0]["status"] == "failed"
+        assert "already booked" in results[0]["error"]
+        assert results[1]["status"] == "created"
+
+    def test_auto_reservation_fills_slots_then_conflicts(self, client, user_token, make_location):
+        loc = make_location(total_slots=2)
+        start = datetime.now(timezone.utc) + timedelta(hours=2)
+        payload = {
+            "location_id": loc["id"],
+            "start_ts": start.isoformat(),
+            "end_ts": (start + timedelta(hours=1)).isoformat(),
+        }
+        headers = {"Authorization": f"Bearer {user_token}"}
+
+        first  = client.post("/api/reservation/reservations/auto", json=payload, headers=headers)
+        second = client.post("/api/reservation/reservations/auto", json=payload, headers=headers)
+        third  = client.post("/api/reservation/reservations/auto", json=payload, headers=headers)
+
+        assert first.status_code == 201 and second.status_code == 201
+        assert first.get_json()["reservation"]["slot_id"] != second.get_json()["reservation"]["slot_id"]
+        assert third.status_code == 409
+
+    def test_auto_reservation_best_fit_packs_next_to_bookings(self, client, user_token, make_location,
+                                                            reservation_factory):
+        loc = make_location(total_slots=3)
+        slots = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"]
+        before = reservation_factory(slot_id=slots[2]["id"], hours_from_now=2, duration_hours=1)
+        start  = datetime.fromisoformat(before["end_ts"])
+
+        res = client.post("/api/reservation/reservations/auto",
+                          json={"location_id": loc["id"], "policy": "best_fit",
+                                "start_ts": start.isoformat(),
+                                "end_ts": (start + timedelta(hours=1)).isoformat()},
+                          headers={"Authorization": f"Bearer {user_token}"})
+        assert res.status_code == 201
+        assert res.get_json()["reservation"]["slot_id"] == slots[2]["id"]
+
+    def test_auto_reservation_rejects_unknown_policy(self, client, user_token, make_location):
+        loc = make_location(total_slots=1)
+        start = datetime.now(timezone.utc) + timedelta(hours=2)
+        res = client.post("/api/reservation/reservations/auto",
+                          json={"location_id": loc["id"], "policy": "random",
+                                "start_ts": start.isoformat(),
+                                "end_ts": (start + timedelta(hours=1)).isoformat()},
+                          headers={"Authorization": f"Bearer {user_token}"})
+        assert res.status_code == 400
+
+    def _series_payload(self, slot_id, **overrides):
+        tomorrow = (datetime.now(timezone.utc) + timedelta(days=1)).date()
+        return {
+            "slot_id": slot_id,
+            "weekdays": [0, 1, 2, 3, 4],
+            "start_time": "08:00:00",
+            "duration_minutes": 540,
+            "starts_on": tomorrow.isoformat(),
+            "until": (tomorrow + timedelta(days=13)).isoformat(),
+            **overrides,
+        }
+
+    def test_series_materializes_weekday_occurrences(self, client, user_token, make_location):
+        loc = make_location(total_slots=1)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+
+        res = client.post("/api/reservation/series", json=self._series_payload(slot_id),
+                          headers={"Authorization": f"Bearer {user_token}"})
+        assert res.status_code == 201, res.get_json()
+        data = res.get_json()
+        assert data["series"]["weekdays"] == [0, 1, 2, 3, 4]
+
+        # Two weeks of weekdays, every occurrence on a weekday and tagged with the series
+        occurrences = data["reservations"]
+        assert len(occurrences) == 10
+        assert all(datetime.fromisoformat(r["start_ts"]).weekday() < 5 for r in occurrences)
+        assert {r["series_id"] for r in occurrences} == {data["series"]["id"]}
+
+    def test_series_rejects_conflicting_occurrence(self, client, user_token, make_location, reservation_factory):
+        loc = make_location(total_slots=1)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+        taken = reservation_factory(slot_id=slot_id, hours_from_now=48, duration_hours=2)
+        taken_start = datetime.fromisoformat(taken["start_ts"])
+
+        payload = self._series_payload(
+            slot_id,
+            weekdays=list(range(7)),
+            start_time=taken_start.time().replace(microsecond=0).isoformat(),
+            duration_minutes=60,
+        )
+        res = client.post("/api/reservation/series", json=payload,
+                          headers={"Authorization": f"Bearer {user_token}"})
+        assert res.status_code == 400
+        assert taken_start.date().isoformat() in res.get_json()["error"]
+
+    def test_series_start_date_is_bounded(self, client, user_token, make_location):
+        loc = make_location(total_slots=1)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+        headers = {"Authorization": f"Bearer {user_token}"}
+
+        far = (datetime.now(timezone.utc) + timedelta(days=400)).date()
+        res = client.post("/api/reservation/series", json=self._series_payload(slot_id, starts_on=far.isoformat(), until=None),
+                          headers=headers)
+        assert res.status_code == 400
+        assert "starts_on" in res.get_json()["errors"]
+
+        # A start date long in the past only books upcoming occurrences
+        res = client.post("/api/reservation/series",
+                          json=self._series_payload(slot_id, starts_on="0001-01-01", weekdays=[0]),
+                          headers=headers)
+        assert res.status_code == 201
+        starts = [datetime.fromisoformat(r["start_ts"]) for r in res.get_json()["reservations"]]
+        assert starts and all(s.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc) for s in starts)
+
+    def test_series_update_and_cancel_touch_future_only(self, client, user_token, make_location):
+        loc = make_location(total_slots=1)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+        headers = {"Authorization": f"Bearer {user_token}"}
+        series_id = client.post("/api/reservation/series", json=self._series_payload(slot_id),
+                                headers=headers).get_json()["series"]["id"]
+
+        # Slot and start date are fixed; sending them is an error rather than silently ignored
+        res = client.put(f"/api/reservation/series/{series_id}", json={"weekdays": [0], "slot_id": 999},
+                         headers=headers)
+        assert res.status_code == 400
+        assert "slot_id" in res.get_json()["errors"]
+
+        # The user drops one Monday on its own; re-planning the series must not book it again
+        occurrences = client.get(f"/api/reservation/series/{series_id}", headers=headers).get_json()["reservations"]
+        monday = next(r for r in occurrences if datetime.fromisoformat(r["start_ts"]).weekday() == 0)
+        assert client.post(f"/api/reservation/reservations/{monday['id']}/cancel", headers=headers).status_code == 200
+
+        res = client.put(f"/api/reservation/series/{series_id}", json={"weekdays": [0]}, headers=headers)
+        assert res.status_code == 200
+        data = res.get_json()
+        assert data["series"]["slot_id"] == slot_id
+        assert len(data["reservations"]) == 1
+        assert all(datetime.fromisoformat(r["start_ts"]).weekday() == 0 for r in data["reservations"])
+        assert monday["start_ts"] not in {r["start_ts"] for r in data["reservations"]}
+
+        res = client.post(f"/api/reservation/series/{series_id}/cancel", headers=headers)
+        assert res.status_code == 200
+        assert res.get_json()["series"]["active"] is False
+        assert client.get(f"/api/reservation/series/{series_id}", headers=headers).get_json()["reservations"] == []
+
+    def test_reservation_location_follows_slot_moves(self, client, user_token, make_location, reservation_factory):
+        loc1 = make_location(total_slots=1)
+        loc2 = make_location(total_slots=1)
+        slot1 = client.get(f"/api/parking_slot/slots?location_id={loc1['id']}").get_json()["slots"][0]["id"]
+        slot2 = client.get(f"/api/parking_slot/slots?location_id={loc2['id']}").get_json()["slots"][0]["id"]
+
+        booked = reservation_factory(slot_id=slot1)
+        assert booked["location_id"] == loc1["id"]
+
+        res = client.put(f"/api/reservation/reservations/{booked['id']}", json={"slot_id": slot2},
+                         headers={"Authorization": f"Bearer {user_token}"})
+        assert res.status_code == 200
+        assert res.get_json()["reservation"]["location_id"] == loc2["id"]
+
+    def test_archived_reservations_stay_in_history(self, client, app, user_token, admin_token, reservation_factory):
+        from extensions import db
+        from models.reservation import Reservation, ReservationStatus
+        from services.reservation_archive_service import ReservationArchiveService
+
+        headers = {"Authorization": f"Bearer {user_token}"}
+        old  = reservation_factory(hours_from_now=1)
+        kept = reservation_factory(hours_from_now=3)
+
+        head = client.get("/api/reservation/changes?limit=1000", headers=headers).get_json()
+        while head["has_more"]:
+            head = client.get(f"/api/reservation/changes?limit=1000&since={head['next_cursor']}", headers=headers).get_json()
+
+        # Age the first booking past the retention window
+        with app.app_context():
+            res = db.session.get(Reservation, old["id"])
+            res.start_ts = datetime.now(timezone.utc) - timedelta(days=40)
+            res.end_ts   = res.start_ts + timedelta(hours=2)
+            res.status   = ReservationStatus.finished
+            db.session.commit()
+            assert ReservationArchiveService.run(retention_days=30, batch_size=1, pause_s=0) >= 1
+            assert db.session.get(Reservation, old["id"]) is None
+            assert db.session.get(Reservation, kept["id"]) is not None
+
+        # Delta sync clients are told to drop the archived booking
+        changes = client.get(f"/api/reservation/changes?since={head['next_cursor']}", headers=headers).get_json()
+        assert changes["deleted"] == [old["id"]]
+
+        history = client.get("/api/reservation/reservations", headers=headers).get_json()["reservations"]
+        assert [r["id"] for r in history][-2:] == [kept["id"], old["id"]]
+        assert next(r for r in history if r["id"] == old["id"])["status"] == "ReservationStatus.finished"
+
+        since = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+        res = client.get("/api/reservation/reservations", query_string={"from": since, "fields": "id"}, headers=headers)
+        assert res.status_code == 200
+        assert [r["id"] for r in res.get_json()["reservations"]] == [kept["id"]]
+
+        # Reports reaching back past the archive horizon count archived bookings too
+        day = (datetime.now(timezone.utc) - timedelta(days=40)).date().isoformat()
+        report = client.get("/api/reports/reservations-per-day?days=60",
+                            headers={"Authorization": f"Bearer {admin_token}"}).get_json()["data"]
+        assert next(d for d in report if d["day"] == day)["count"] >= 1
+
+    def test_booking_request_commits_once(self, client, user_token, make_location):
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        loc     = make_location(total_slots=1)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+        start   = datetime.now(timezone.utc) + timedelta(hours=1)
+        payload = {"slot_id": slot_id, "start_ts": start.isoformat(), "end_ts": (start + timedelta(hours=1)).isoformat()}
+        headers = {"Authorization": f"Bearer {user_token}"}
+
+        commits = []
+        def count(session):
+            commits.append(session)
+        event.listen(Session, "after_commit", count)
+        try:
+            assert client.post("/api/reservation/reservations", json=payload, headers=headers).status_code == 201
+            assert len(commits) == 1
+
+            # A rejected booking commits nothing
+            assert client.post("/api/reservation/reservations", json=payload, headers=headers).status_code == 400
+            assert len(commits) == 1
+        finally:
+            event.remove(Session, "after_commit", count)
+
+    def test_idempotency_key_replays_booking(self, client, user_token, make_location):
+        loc     = make_location(total_slots=1)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+        start   = datetime.now(timezone.utc) + timedelta(hours=2)
+        payload = {"slot_id": slot_id, "start_ts": start.isoformat(), "end_ts": (start + timedelta(hours=1)).isoformat()}
+        headers = {"Authorization": f"Bearer {user_token}", "Idempotency-Key": "retry-me-1"}
+
+        first = client.post("/api/reservation/reservations", json=payload, headers=headers)
+        assert first.status_code == 201
+
+        # The retry gets the original booking back instead of an overlap error
+        retry = client.post("/api/reservation/reservations", json=payload, headers=headers)
+        assert retry.status_code == 201
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert retry.get_json() == first.get_json()
+
+        # Same key, different request
+        payload["end_ts"] = (start + timedelta(hours=2)).isoformat()
+        assert client.post("/api/reservation/reservations", json=payload, headers=headers).status_code == 422
+
+    def test_create_conflict_on_stale_row(self, client, user_token, make_location, monkeypatch):
+        from sqlalchemy.orm.exc import StaleDataError
+        from services.reservation_service import ReservationService
+
+        loc     = make_location(total_slots=1)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+        start   = datetime.now(timezone.utc) + timedelta(hours=2)
+        payload = {"slot_id": slot_id, "start_ts": start.isoformat(), "end_ts": (start + timedelta(hours=1)).isoformat()}
+
+        def stale(**data):
+            raise StaleDataError("slot changed")
+        monkeypatch.setattr(ReservationService, "create", staticmethod(stale))
+        res = client.post("/api/reservation/reservations", json=payload,
+                          headers={"Authorization": f"Bearer {user_token}"})
+        assert res.status_code == 409
+
+    def test_idempotency_key_duplicate_while_first_runs(self, app, client, user_token, make_location, monkeypatch):
+        import threading
+        from services.reservation_service import ReservationService
+
+        loc     = make_location(total_slots=1)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+        start   = datetime.now(timezone.utc) + timedelta(hours=2)
+        payload = {"slot_id": slot_id, "start_ts": start.isoformat(), "end_ts": (start + timedelta(hours=1)).isoformat()}
+        headers = {"Authorization": f"Bearer {user_token}", "Idempotency-Key": "slow-retry-1"}
+
+        entered, release = threading.Event(), threading.Event()
+        create = ReservationService.create
+        def slow_create(**data):
+            entered.set()
+            release.wait(5)
+            return create(**data)
+        monkeypatch.setattr(ReservationService, "create", staticmethod(slow_create))
+
+        results = []
+        first   = threading.Thread(target=lambda: results.append(
+            app.test_client().post("/api/reservation/reservations", json=payload, headers=headers)))
+        first.start()
+        assert entered.wait(5)
+
+        # The duplicate finds the claim instead of running the booking a second time
+        dup = app.test_client().post("/api/reservation/reservations", json=payload, headers=headers)
+        release.set()
+        first.join()
+        assert dup.status_code == 409
+        assert dup.headers["Retry-After"]
+        assert results[0].status_code == 201
+
+        retry = client.post("/api/reservation/reservations", json=payload, headers=headers)
+        assert retry.status_code == 201
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert retry.get_json() == results[0].get_json()
+
+    def test_status_refresh_is_conditional_and_versioned(self, app, client, user_token, reservation_factory):
+        from sqlalchemy import update
+        from extensions import db
+        from models.reservation import Reservation
+        from tasks.status_scheduler import update_reservation_statuses
+
+        headers = {"Authorization": f"Bearer {user_token}"}
+        booked  = reservation_factory(hours_from_now=5)
+        url     = f"/api/reservation/reservations/{booked['id']}"
+        etag    = client.get(url, headers=headers).headers["ETag"]
+
+        # The booking becomes due before any refresh ran
+        with app.app_context():
+            db.session.execute(
+                update(Reservation).where(Reservation.id == booked["id"])
+                .values(start_ts=datetime.now(timezone.utc) - timedelta(minutes=1))
+            )
+            db.session.commit()
+
+        # The edit's own status refresh moves and re-versions the row; the matched If-Match still wins
+        new_end = (datetime.fromisoformat(booked["end_ts"]) + timedelta(hours=1)).isoformat()
+        res = client.put(url, json={"end_ts": new_end}, headers={**headers, "If-Match": etag})
+        assert res.status_code == 200
+        assert res.get_json()["reservation"]["status"] == "ReservationStatus.ongoing"
+        assert res.headers["ETag"] == f'"v{booked["version"] + 2}"'
+
+        # Running the tick again (as every worker does) finds nothing left to move
+        with app.app_context():
+            update_reservation_statuses()
+            update_reservation_statuses()
+        assert client.get(url, headers=headers).headers["ETag"] == res.headers["ETag"]
+
+    def test_update_requires_matching_version(self, client, user_token, reservation_factory):
+        headers = {"Authorization": f"Bearer {user_token}"}
+        booked  = reservation_factory(hours_from_now=5)
+        url     = f"/api/reservation/reservations/{booked['id']}"
+
+        etag = client.get(url, headers=headers).headers["ETag"]
+        assert etag == f'"v{booked["version"]}"'
+
+        new_end = (datetime.fromisoformat(booked["end_ts"]) + timedelta(hours=1)).isoformat()
+        res = client.put(url, json={"end_ts": new_end}, headers={**headers, "If-Match": etag})
+        assert res.status_code == 200
+        assert res.headers["ETag"] == f'"v{booked["version"] + 1}"'
+
+        # A second editor still holding the old ETag loses
+        res = client.put(url, json={"end_ts": booked["end_ts"]}, headers={**headers, "If-Match": etag})
+        assert res.status_code == 412
+        assert client.get(url, headers=headers).get_json()["reservation"]["end_ts"].startswith(new_end[:19])
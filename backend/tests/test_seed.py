@@ -0,0 +1,30 @@
+# ══════════════════════════════════════════════════════════════════════════════
+# SEED SCRIPT TESTS
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+class TestSeed:
+    def test_seed_commits_its_rows(self, app):
+        from extensions import db
+        from models.parking_location import ParkingLocation
+        from models.parking_slot import ParkingSlot
+        from models.reservation import Reservation
+        from models.user import User
+        from seed import ADMIN_USERS, DAVAO_LOCS, SLOTS_PER_LOCATION, seed_all
+
+        with app.app_context():
+            seed_all()
+            db.session.remove()   # anything left uncommitted is rolled back here
+
+            names = [loc["name"] for loc in DAVAO_LOCS]
+            assert User.query.filter(User.email.in_([a["email"] for a in ADMIN_USERS])).count() == len(ADMIN_USERS)
+            assert ParkingLocation.query.filter(ParkingLocation.name.in_(names)).count() == len(DAVAO_LOCS)
+            assert (
+                ParkingSlot.query.join(ParkingLocation).filter(ParkingLocation.name.in_(names)).count()
+                == len(DAVAO_LOCS) * SLOTS_PER_LOCATION
+            )
+            assert Reservation.query.count() > 0
+
+            # Running it again adds nothing
+            seed_all()
+            assert ParkingLocation.query.filter(ParkingLocation.name.in_(names)).count() == len(DAVAO_LOCS)
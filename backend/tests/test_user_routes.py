@@ -2,6 +2,7 @@
 # USER ROUTES TESTS
 # ══════════════════════════════════════════════════════════════════════════════
 
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 
@@ -41,6 +42,17 @@ class TestUserRoutes:
         assert "users" in data
         assert len(data["users"]) >= 2  # At least admin and regular user
     
+    def test_admin_list_users_sparse_fields(self, client, admin_token):
+        res = client.get("/api/users/?fields=id,email",
+                        headers={"Authorization": f"Bearer {admin_token}"})
+        assert res.status_code == 200
+        assert all(set(u) == {"id", "email"} for u in res.get_json()["users"])
+
+        # write-only fields are not selectable
+        res = client.get("/api/users/?fields=password",
+                        headers={"Authorization": f"Bearer {admin_token}"})
+        assert res.status_code == 400
+    
     def test_user_cannot_list_users(self, client, user_token):
         res = client.get("/api/users/",
                         headers={"Authorization": f"Bearer {user_token}"})
@@ -89,10 +101,37 @@ class TestUserRoutes:
 #        data = res.get_json()
 #        assert data["user"]["first_name"] == "Updated"
     
-    def test_admin_delete_user(self, client, admin_token, registered_user):
-        res = client.delete(f"/api/users/{registered_user.id}",
+    def _driver(self, client, admin_token):
+        email = f"driver-{uuid4()}@test.dev"
+        res = client.post("/api/users/", json={
+            "email": email, "password": "drive1234", "first_name": "Drive", "last_name": "R", "role": "user",
+        }, headers={"Authorization": f"Bearer {admin_token}"})
+        assert res.status_code == 201
+        token = client.post("/api/auth/login", json={"email": email, "password": "drive1234"}).get_json()
+        return res.get_json()["user"]["id"], token["access_token"]
+
+    def test_admin_delete_user(self, client, admin_token):
+        user_id, _ = self._driver(client, admin_token)
+        res = client.delete(f"/api/users/{user_id}",
                            headers={"Authorization": f"Bearer {admin_token}"})
         assert res.status_code == 204
+
+    def test_delete_user_guards_upcoming_bookings(self, client, admin_token, make_location):
+        user_id, token = self._driver(client, admin_token)
+        loc     = make_location(total_slots=1)
+        slot_id = client.get(f"/api/parking_slot/slots?location_id={loc['id']}").get_json()["slots"][0]["id"]
+        start   = datetime.now(timezone.utc) + timedelta(hours=2)
+        booked  = client.post("/api/reservation/reservations", json={
+            "slot_id": slot_id, "start_ts": start.isoformat(), "end_ts": (start + timedelta(hours=1)).isoformat(),
+        }, headers={"Authorization": f"Bearer {token}"}).get_json()["reservation"]
+
+        admin = {"Authorization": f"Bearer {admin_token}"}
+        res = client.delete(f"/api/users/{user_id}", headers=admin)
+        assert res.status_code == 409
+        assert client.get(f"/api/reservation/reservations/{booked['id']}", headers=admin).status_code == 200
+
+        client.post(f"/api/reservation/reservations/{booked['id']}/cancel", headers=admin)
+        assert client.delete(f"/api/users/{user_id}", headers=admin).status_code == 204
     
     def test_admin_deactivate_user(self, client, admin_token, registered_user):
         res = client.post(f"/api/users/{registered_user.id}/deactivate",
@@ -0,0 +1,113 @@
+# This file contains the admission control layer installed by `create_app`.
+# Every request that can touch the database is counted against a per-worker capacity (sized like the DB pool) and
+# a limit for its endpoint class. When either is full the request is answered at once with 503 + Retry-After
+# instead of queueing on a pool checkout. Booking writes may use the whole capacity; the other classes leave
+# ADMISSION_BOOKING_RESERVE slots free for them, and reports leave ADMISSION_REPORTS_RESERVE, so they are shed first.
+
+import threading
+from typing import Dict, Optional
+from flask import Flask, current_app, g, jsonify, request
+
+CLASSES = ("auth", "booking", "reports", "catalog", "other")
+
+# Long-lived or database-free endpoints never count against the capacity
+EXEMPT_ENDPOINTS = {
+    "health",
+    "static",
+    "parking_location_bp.location_events",
+    "reports_bp.admission_counters",
+}
+
+# POST reads that belong to the catalog class
+CATALOG_ENDPOINTS = {"parking_slot_bp.batch_availability"}
+
+class _Admission:
+    def __init__(self) -> None:
+        self._lock    = threading.Lock()
+        self.total    = 0
+        self.inflight = {c: 0 for c in CLASSES}
+        self.admitted = {c: 0 for c in CLASSES}
+        self.shed     = {c: 0 for c in CLASSES}
+
+    def try_acquire(self, cls: str, capacity: int, limit: int, headroom: int) -> bool:
+        with self._lock:
+            full = (limit and self.inflight[cls] >= limit) or self.total + headroom >= capacity
+            if full:
+                self.shed[cls] += 1
+                return False
+            self.total         += 1
+            self.inflight[cls] += 1
+            self.admitted[cls] += 1
+            return True
+
+    def release(self, cls: str) -> None:
+        with self._lock:
+            self.total         -= 1
+            self.inflight[cls] -= 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "in_flight": self.total,
+                "classes": {
+                    c: {"in_flight": self.inflight[c], "admitted": self.admitted[c], "shed": self.shed[c]}
+                    for c in CLASSES
+                },
+            }
+
+_admission = _Admission()
+
+# ---------- CLASSIFICATION ----------
+def classify() -> Optional[str]:
+    endpoint = request.endpoint
+    if endpoint is None or endpoint in EXEMPT_ENDPOINTS or request.method == "OPTIONS":
+        return None
+
+    blueprint = request.blueprint
+    reading   = request.method in ("GET", "HEAD")
+    if blueprint == "auth_bp":
+        return "auth"
+    if blueprint == "reservation_bp" and not reading:
+        return "booking"
+    if blueprint == "reports_bp":
+        return "reports"
+    if endpoint in CATALOG_ENDPOINTS or (reading and blueprint in ("parking_location_bp", "parking_slot_bp")):
+        return "catalog"
+    return "other"
+
+def _headroom(cls: str) -> int:
+    config = current_app.config
+    if cls == "booking":
+        return 0
+    if cls == "reports":
+        return max(config["ADMISSION_REPORTS_RESERVE"], config["ADMISSION_BOOKING_RESERVE"])
+    return config["ADMISSION_BOOKING_RESERVE"]
+
+# ---------- HOOKS ----------
+def _admit():
+    capacity = current_app.config["ADMISSION_CAPACITY"]
+    cls      = classify()
+    if not capacity or cls is None:
+        return None
+
+    limit = current_app.config[f"ADMISSION_LIMIT_{cls.upper()}"]
+    if not _admission.try_acquire(cls, capacity, limit, _headroom(cls)):
+        resp = jsonify({"error": "Server is busy, please retry shortly"})
+        resp.status_code = 503
+        resp.headers["Retry-After"] = str(current_app.config["ADMISSION_RETRY_AFTER"])
+        return resp
+
+    g.admission_class = cls
+    return None
+
+def _release(exc: Optional[BaseException] = None) -> None:
+    cls = g.pop("admission_class", None)
+    if cls is not None:
+        _admission.release(cls)
+
+def init_admission(app: Flask) -> None:
+    app.before_request(_admit)
+    app.teardown_request(_release)
+
+def admission_stats() -> Dict:
+    return _admission.snapshot()
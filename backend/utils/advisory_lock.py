@@ -0,0 +1,27 @@
+# This file contains `try_advisory_lock`, which keeps periodic maintenance to one process at a time.
+# Every Gunicorn worker runs its own scheduler, so jobs that must not overlap take a Postgres session-level advisory
+# lock on a dedicated connection (held across the job's own short transactions) and skip the run when another
+# process holds it. Other databases have a single writer anyway, so the lock is always granted there.
+
+import zlib
+from contextlib import contextmanager
+from typing import Iterator
+from sqlalchemy import text
+from extensions import db
+
+@contextmanager
+def try_advisory_lock(name: str) -> Iterator[bool]:
+    if db.engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    key = zlib.crc32(name.encode())
+    with db.engine.connect() as conn:
+        acquired = conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})
+        conn.commit()   # the lock belongs to the session; don't sit idle in a transaction while holding it
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                conn.commit()
@@ -0,0 +1,74 @@
+# This file contains the conditional-GET decorator used by the public catalog routes.
+# Responses carry a strong ETag derived from the collection's version counter; a matching If-None-Match gets a 304 before the view runs.
+# It also holds the per-row helpers for optimistic concurrency: the row's version is its ETag, and PUTs honour If-Match.
+# Single catalog rows are revalidated against that same row ETag, so a GET's tag can go straight back in If-Match.
+
+import hashlib
+from functools import wraps
+from typing import Tuple
+from flask import current_app, jsonify, make_response, request
+from services.collection_version_service import CollectionVersionService
+
+def _public_cache(resp) -> None:
+    max_age = current_app.config.get("CATALOG_CACHE_MAX_AGE", 0)
+    resp.headers["Cache-Control"] = f"public, max-age={max_age}, must-revalidate"
+
+# ETag = collection + version + digest of path/query (responses differ per ?location_id, ?fields, ...)
+def _etag(collection: str, version: int) -> str:
+    query  = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    digest = hashlib.blake2s(f"{request.path}?{query}".encode("utf-8"), digest_size=8).hexdigest()
+    return f"{collection}-{version}-{digest}"
+
+# Decorator for catalog GETs; `unless_args` bypasses caching for query params the version does not cover
+def conditional_get(collection: str, unless_args: Tuple[str, ...] = ()):
+    def wrapper(fn):
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            if any(arg in request.args for arg in unless_args):
+                return fn(*args, **kwargs)
+
+            etag = _etag(collection, CollectionVersionService.get_version(collection))
+
+            if request.if_none_match.contains(etag):
+                resp = make_response("", 304)
+            else:
+                resp = make_response(fn(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+
+            resp.set_etag(etag)
+            _public_cache(resp)
+            return resp
+        return inner
+    return wrapper
+
+# ---------- ROW VERSIONS ----------
+def row_etag(version: int) -> str:
+    return f"v{version}"
+
+# True when the request sent If-Match and none of its tags is the row's current version (-> 412)
+def precondition_failed(version: int) -> bool:
+    if not request.if_match:
+        return False
+    return not request.if_match.contains(row_etag(version))
+
+def stale_response():
+    return jsonify({"error": "Resource was modified by another request; reload and retry"}), 412
+
+# JSON body plus the row's version as ETag
+def versioned(body: dict, version: int, status: int = 200):
+    resp = make_response(jsonify(body), status)
+    resp.set_etag(row_etag(version))
+    return resp
+
+# Single catalog row: cacheable like the collections, with the row's version as ETag. `revalidate=False` for bodies
+# holding data the version does not cover (they are always sent in full).
+def catalog_row(body: dict, version: int, revalidate: bool = True):
+    etag = row_etag(version)
+    if revalidate and request.if_none_match.contains(etag):
+        resp = make_response("", 304)
+    else:
+        resp = make_response(jsonify(body), 200)
+    resp.set_etag(etag)
+    _public_cache(resp)
+    return resp
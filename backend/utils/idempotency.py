@@ -0,0 +1,86 @@
+# This file contains the `idempotent` view decorator for mutating endpoints.
+# A request carrying an Idempotency-Key header runs once: the key is claimed before the view runs, its successful
+# response is stored (in the same transaction as the write) and replayed for any retry with the same key and the
+# same request. A duplicate arriving while the first request still runs gets 409 + Retry-After. Reusing a key for
+# a different request is rejected with 422. Error responses release the claim, so a failed attempt can be retried.
+
+import hashlib
+from datetime import timedelta
+from functools import wraps
+from flask import current_app, jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from services.idempotency_service import IdempotencyService, StoredResponse
+from utils.transaction import transaction
+
+HEADER     = "Idempotency-Key"
+MAX_LENGTH = 255
+
+class _Rejected(Exception):
+    def __init__(self, response, release: bool = True) -> None:
+        self.response = response
+        self.release  = release
+
+def _request_hash() -> str:
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(request.path.encode())
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+def _in_progress():
+    response = jsonify({"error": f"A request with this {HEADER} is still in progress"})
+    response.status_code = 409
+    response.headers["Retry-After"] = "1"
+    return response
+
+def _replay(stored: StoredResponse, request_hash: str):
+    if stored.request_hash != request_hash:
+        return jsonify({"error": f"{HEADER} was already used for a different request"}), 422
+    if stored.pending:
+        return _in_progress()
+    response = current_app.response_class(stored.body, status=stored.status_code, mimetype="application/json")
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+def idempotent(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > MAX_LENGTH:
+            return jsonify({"error": f"{HEADER} must be at most {MAX_LENGTH} characters"}), 400
+
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+        user_id  = int(identity) if identity is not None else 0
+        req_hash = _request_hash()
+
+        stored = IdempotencyService.lookup(user_id, key)
+        if stored is None:
+            timeout = timedelta(seconds=current_app.config["IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS"])
+            stored  = IdempotencyService.claim(user_id, key, req_hash, timeout)
+        if stored:
+            return _replay(stored, req_hash)
+
+        ttl = timedelta(hours=current_app.config["IDEMPOTENCY_KEY_TTL_HOURS"])
+        try:
+            with transaction():
+                response = make_response(view(*args, **kwargs))
+                if response.status_code >= 400:
+                    raise _Rejected(response)
+                stored = StoredResponse(req_hash, response.status_code, response.get_data(as_text=True))
+                if not IdempotencyService.complete(user_id, key, stored, ttl):
+                    # The claim expired and another request took the key over; roll back instead of writing twice
+                    raise _Rejected(_in_progress(), release=False)
+        except _Rejected as err:
+            if err.release:
+                IdempotencyService.release(user_id, key, req_hash)
+            return err.response
+        except Exception:
+            IdempotencyService.release(user_id, key, req_hash)
+            raise
+
+        IdempotencyService.remember(user_id, key, stored)
+        return response
+    return wrapper
@@ -0,0 +1,94 @@
+# This file contains the `single_flight` view decorator used by the admin report routes.
+# Identical requests (same endpoint and query parameters) arriving while one is being computed wait for that
+# computation and share its response instead of running the same aggregate queries again. A successful response
+# is also reused for a short TTL afterwards. Counters show how many computations were saved (per worker).
+
+import threading
+import time
+from functools import wraps
+from typing import Dict, Optional, Tuple
+from flask import current_app, make_response, request
+
+WAIT_TIMEOUT = 30.0   # seconds a follower waits before computing on its own
+
+Key    = Tuple[str, Tuple[Tuple[str, str], ...]]
+Result = Tuple[int, bytes, str]   # status, body, mimetype
+
+class _Call:
+    def __init__(self) -> None:
+        self.done   = threading.Event()
+        self.result: Optional[Result] = None
+
+class _Stats:
+    def __init__(self) -> None:
+        self._lock     = threading.Lock()
+        self.computed  = 0
+        self.coalesced = 0
+        self.cached    = 0
+
+    def count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "computed":  self.computed,
+                "coalesced": self.coalesced,
+                "cached":    self.cached,
+                "saved":     self.coalesced + self.cached,
+            }
+
+_lock     = threading.Lock()
+_inflight: Dict[Key, _Call] = {}
+_recent:   Dict[Key, Tuple[float, Result]] = {}
+_stats    = _Stats()
+
+def _key() -> Key:
+    return request.endpoint, tuple(sorted(request.args.items(multi=True)))
+
+def _respond(result: Result):
+    status, body, mimetype = result
+    return current_app.response_class(body, status=status, mimetype=mimetype)
+
+def single_flight(ttl: float = 2.0):
+    def wrapper(fn):
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            key = _key()
+            with _lock:
+                recent = _recent.get(key)
+                if recent and recent[0] > time.monotonic():
+                    _stats.count("cached")
+                    return _respond(recent[1])
+                call   = _inflight.get(key)
+                leader = call is None
+                if leader:
+                    call = _inflight[key] = _Call()
+
+            if not leader:
+                if call.done.wait(WAIT_TIMEOUT) and call.result is not None:
+                    _stats.count("coalesced")
+                    return _respond(call.result)
+                return fn(*args, **kwargs)   # the leader failed or is stuck; compute our own
+
+            try:
+                resp = make_response(fn(*args, **kwargs))
+                _stats.count("computed")
+                if resp.status_code == 200:
+                    call.result = (resp.status_code, resp.get_data(), resp.mimetype)
+                return resp
+            finally:
+                with _lock:
+                    del _inflight[key]
+                    if call.result is not None and ttl > 0:
+                        now = time.monotonic()
+                        for stale in [k for k, (expires, _) in _recent.items() if expires <= now]:
+                            del _recent[stale]
+                        _recent[key] = (now + ttl, call.result)
+                call.done.set()
+        return inner
+    return wrapper
+
+def single_flight_stats() -> Dict:
+    return _stats.snapshot()
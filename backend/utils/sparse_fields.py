@@ -0,0 +1,30 @@
+# This file contains helpers for sparse fieldsets (`?fields=id,name,...`) on GET routes.
+# The requested set limits the marshmallow `only=` dump and is passed to the read models so unused columns are never selected.
+
+from functools import lru_cache
+from typing import Optional, Tuple
+from flask import request
+from marshmallow import Schema
+
+# Parse `?fields=` against the schema's dumpable fields (raises ValueError on unknown names)
+def requested_fields(schema: Schema) -> Optional[Tuple[str, ...]]:
+    raw = request.args.get("fields")
+    if raw is None:
+        return None
+
+    names = tuple(dict.fromkeys(n.strip() for n in raw.split(",") if n.strip()))
+    if not names:
+        raise ValueError("fields must list at least one field")
+
+    allowed = {name for name, field in schema.fields.items() if not field.load_only}
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return names
+
+# Same schema restricted to `only`; instances are cached per field set
+@lru_cache(maxsize=128)
+def sparse_schema(schema: Schema, only: Optional[Tuple[str, ...]]) -> Schema:
+    if not only:
+        return schema
+    return type(schema)(only=only, many=schema.many)
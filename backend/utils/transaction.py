@@ -0,0 +1,44 @@
+# This file contains the unit of work shared by routes and background jobs.
+# Services only flush; the outermost `transaction()` scope commits once when it succeeds and rolls back when it
+# raises. Inner scopes just join the outer one, so nested service calls never commit part of a request.
+# `transactional` wraps a view in one scope and also rolls back when the view answers with an error status.
+
+from contextlib import contextmanager
+from functools import wraps
+from typing import Iterator
+from flask import make_response
+from extensions import db
+
+class _ErrorResponse(Exception):
+    def __init__(self, response) -> None:
+        self.response = response
+
+@contextmanager
+def transaction() -> Iterator[None]:
+    info  = db.session.info
+    depth = info.get("uow_depth", 0)
+    info["uow_depth"] = depth + 1
+    try:
+        yield
+        if depth == 0:
+            db.session.commit()
+    except BaseException:
+        if depth == 0:
+            db.session.rollback()
+        raise
+    finally:
+        info["uow_depth"] = depth
+
+# Decorator for views that write: one commit per request, none on 4xx / 5xx
+def transactional(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            with transaction():
+                response = make_response(view(*args, **kwargs))
+                if response.status_code >= 400:
+                    raise _ErrorResponse(response)
+        except _ErrorResponse as err:
+            return err.response
+        return response
+    return wrapper
@@ -58,7 +58,7 @@ export default function AdminLocations() {
 
   /* fetch & sort */
   const fetchLocations = () =>
-    api.get('/parking_location/locations')
+    api.get('/parking_location/locations?fields=id,name,address,lat,lng,available_slots')
        .then((r) => {
          r.locations.sort((a, b) => a.name.localeCompare(b.name));
          setLocs(r.locations);
@@ -39,7 +39,9 @@ export default function Locations() {
   useEffect(() => {
     (async () => {
       try {
-        const { locations } = await api.get('/parking_location/locations');
+        const { locations } = await api.get(
+          '/parking_location/locations?fields=id,name,address,lat,lng,available_slots'
+        );
         locations.sort((a, b) => a.name.localeCompare(b.name));
         setLocs(locations);
       } catch (e) {
@@ -54,12 +54,9 @@ export default function Slots() {
     return () => window.removeEventListener('resize', calcPageSize);
   }, []);
 
-  /* mark taken slots */
-  const markTaken = (slotArr, reservationsArr) => {
-    const active = reservationsArr.filter(
-      r => r.status === 'ReservationStatus.booked' || r.status === 'ReservationStatus.ongoing'
-    );
-    const takenIds = new Set(active.map(r => r.slot_id));
+  /* mark taken slots (any busy run inside the window) */
+  const markTaken = (slotArr, calendar) => {
+    const takenIds = new Set(calendar.filter(c => c.runs.length).map(c => c.slot_id));
     return slotArr.map(s => ({ ...s, taken: takenIds.has(s.id) }));
   };
 
@@ -70,14 +67,14 @@ export default function Slots() {
     [api, locationId],
   );
 
-  const fetchReservations = useCallback(
+  const fetchCalendar = useCallback(
     (startISO, endISO) =>
       api.get(
-        `/reservation/reservations`
+        `/parking_slot/calendar`
         + `?location_id=${locationId}`
-        + `&start_ts=${encodeURIComponent(startISO)}`
-        + `&end_ts=${encodeURIComponent(endISO)}`
-      ).then(r => r.reservations),
+        + `&from=${encodeURIComponent(startISO)}`
+        + `&to=${encodeURIComponent(endISO)}`
+      ).then(r => r.slots),
     [api, locationId],
   );
 
@@ -98,14 +95,14 @@ export default function Slots() {
     setLoading(true); setErr('');
 
     try {
-      const [rawSlots, reservations] = await Promise.all([
+      const [rawSlots, calendar] = await Promise.all([
         fetchSlots(),                                                // full list
-        fetchReservations(localInputToIso(fStart), localInputToIso(fEnd)),
+        fetchCalendar(localInputToIso(fStart), localInputToIso(fEnd)),
       ]);
-      setSlots(markTaken(rawSlots, reservations));
+      setSlots(markTaken(rawSlots, calendar));
     } catch (e) { setErr(e.message); }
     finally      { setLoading(false); }
-  }, [fStart, fEnd, fetchSlots, fetchReservations]);
+  }, [fStart, fEnd, fetchSlots, fetchCalendar]);
 
   /* ---------- clear filter ---------- */
   const clearFilter = () => {                                        // ★ CHANGED